@@ -1,37 +1,163 @@
 import boto3
+import hashlib
 import json
 import os
+from botocore.exceptions import BotoCoreError, ClientError
+from concurrent.futures import ThreadPoolExecutor
 
-def handler(event, context):
+lambda_client = boto3.client('lambda')
+dynamodb = boto3.resource('dynamodb')
 
-    print(event)
+def watcher_id(sk):
+
+    # Stable per user and domain, whichever partition the lunker item sits in.
+    return hashlib.sha256(sk.encode('utf-8')).hexdigest()[:16]
+
+def registry_key(sld):
+
+    return {
+        'pk': 'REGISTRY#',
+        'sk': 'REGISTRY#'+sld+'#'
+    }
+
+def inserted_slds(records):
 
-    for record in event.get('Records', []):
+    slds = {}
+
+    for record in records:
         if record.get('eventName') == 'INSERT':
             new_image = record.get('dynamodb', {}).get('NewImage', {})
-            if new_image and 'sld' in new_image:
+            # Copies made by the partition-key backfill are not new subscriptions.
+            if new_image and 'sld' in new_image and 'migrated' not in new_image:
+                sld = new_image['sld']['S']
+                slds.setdefault(sld, []).append(record['dynamodb']['SequenceNumber'])
+
+    return slds
+
+def watcher_changes(records):
+
+    changes = {}
+
+    for record in records:
+        event_name = record.get('eventName')
+        if event_name not in ('INSERT', 'REMOVE'):
+            continue
+
+        stream = record.get('dynamodb', {})
+        image = stream.get('NewImage' if event_name == 'INSERT' else 'OldImage', {})
+        sk = stream.get('Keys', {}).get('sk', {}).get('S')
+        if not sk or 'sld' not in image:
+            continue
+
+        # A legacy copy deleted by the partition-key prune still has its sharded twin.
+        if event_name == 'REMOVE' and 'pruned' in image:
+            continue
+
+        change = changes.setdefault(image['sld']['S'], {'watchers': {}, 'sequences': []})
+        change['watchers'][watcher_id(sk)] = event_name == 'INSERT'
+        change['sequences'].append(stream['SequenceNumber'])
+
+    return changes
+
+def update_registry(table, sld, watchers):
+
+    added = {watcher for watcher, present in watchers.items() if present}
+    removed = set(watchers) - added
+    attributes = {}
+
+    # ADD and DELETE on a string set are idempotent, so redelivered records never double-count.
+    if added:
+        attributes = table.update_item(
+            Key = registry_key(sld),
+            UpdateExpression = 'SET sld = :sld ADD watchers :added',
+            ExpressionAttributeValues = {':sld': sld, ':added': added},
+            ReturnValues = 'ALL_NEW'
+        )['Attributes']
+
+    if removed:
+        attributes = table.update_item(
+            Key = registry_key(sld),
+            UpdateExpression = 'DELETE watchers :removed',
+            ExpressionAttributeValues = {':removed': removed},
+            ReturnValues = 'ALL_NEW'
+        )['Attributes']
+
+    if attributes.get('watchers'):
+        return True
+
+    try:
+        table.delete_item(
+            Key = registry_key(sld),
+            ConditionExpression = 'attribute_not_exists(watchers)'
+        )
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            return True
+        raise
+
+    return False
+
+def invoke(function_name, payload):
+
+    lambda_client.invoke(
+        FunctionName = function_name,
+        InvocationType = 'Event',
+        Payload = json.dumps(payload)
+    )
+
+def handler(event, context):
+
+    print(event)
+
+    records = event.get('Records', [])
+    changes = watcher_changes(records)
+    slds = inserted_slds(records)
+
+    print('SLDs: '+str(sorted(slds)))
+
+    failures = []
+
+    if changes:
+
+        table = dynamodb.Table(os.environ['PERMUTATION_TABLE'])
+        failed = set()
+        retired = []
+
+        with ThreadPoolExecutor(max_workers = min(16, len(changes) + 1)) as executor:
+
+            # Registry updates land before any invocation, so a collection never outruns a new subscription.
+            updates = [(sld, executor.submit(update_registry, table, sld, change['watchers'])) for sld, change in changes.items()]
+            for sld, future in updates:
+                try:
+                    if not future.result():
+                        retired.append(sld)
+                except (BotoCoreError, ClientError) as e:
+                    print('Failed: '+sld+' - '+str(e))
+                    failed.add(sld)
 
-                print(new_image['sld']['S'])
+            print('Retired: '+str(sorted(retired)))
 
-                payload = {
-                    'Status': new_image['sld']['S']
-                }
+            futures = []
+            generate = sorted(set(slds) - failed - set(retired))
+            if generate:
+                # One coalesced permutation request covers every SLD in the batch.
+                futures.append((generate, executor.submit(invoke, os.environ['PERMUTATION_FUNCTION_NAME'], {'slds': generate})))
+            if retired:
+                futures.append((sorted(retired), executor.submit(invoke, os.environ['PERMUTATION_FUNCTION_NAME'], {'collect': sorted(retired)})))
+            for sld in sorted(set(slds) - failed):
+                futures.append(([sld], executor.submit(invoke, os.environ['FUNCTION_NAME'], {'Status': sld})))
 
-                lambda_client = boto3.client('lambda')
+            for targets, future in futures:
+                try:
+                    future.result()
+                except (BotoCoreError, ClientError) as e:
+                    print('Failed: '+', '.join(targets)+' - '+str(e))
+                    failed.update(targets)
 
-                lambda_client.invoke(
-                    FunctionName = os.environ['PERMUTATION_FUNCTION_NAME'],
-                    InvocationType = 'Event',
-                    Payload = json.dumps(payload)
-                )
-                
-                lambda_client.invoke(
-                    FunctionName = os.environ['FUNCTION_NAME'],
-                    InvocationType = 'Event',
-                    Payload = json.dumps(payload)
-                )
+        for sld in sorted(failed):
+            for sequence in changes[sld]['sequences']:
+                failures.append({'itemIdentifier': sequence})
 
     return {
-        'statusCode': 200,
-        'body': json.dumps('Action Completed!')
+        'batchItemFailures': failures
     }
@@ -2,29 +2,96 @@ import base64
 import binascii
 import boto3
 from boto3.dynamodb.conditions import Key
-from boto3.dynamodb.types import TypeDeserializer
 from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
+from concurrent.futures import ThreadPoolExecutor, wait
+import gzip
+import hashlib
+import hmac
 import html
 import json
+import math
 import os
+import re
+import threading
 import time
 import requests
+from lru_ttl_cache import LruTtlCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 
 API_ENDPOINT = ''
 LOGOUT_ENDPOINT = ''
 USER_INFO_ENDPOINT = ''
 
 HTTP_SESSION = requests.Session()
-IDENTITY_CACHE = {}
 IDENTITY_CACHE_TTL_SECONDS = 300
 IDENTITY_CACHE_MAX_ENTRIES = 256
-MATCHED_SLD_CACHE = {}
+IDENTITY_CACHE = LruTtlCache('identity', IDENTITY_CACHE_TTL_SECONDS, IDENTITY_CACHE_MAX_ENTRIES)
+# Access tokens carry no email, so the userInfo answer is kept per (issuer, sub) across token refreshes.
+# It expires with the identity cache, so a revoked session is refused by userInfo within the same window.
+SUBJECT_IDENTITY_CACHE = LruTtlCache('subjects', IDENTITY_CACHE_TTL_SECONDS, 1024)
+JWT_ISSUERS = {issuer.strip().rstrip('/') for issuer in os.getenv('JWT_ISSUERS', '').split(',') if issuer.strip()}
+JWT_AUDIENCES = {audience.strip() for audience in os.getenv('JWT_AUDIENCES', '').split(',') if audience.strip()}
+JWT_LEEWAY_SECONDS = 60
+JWKS_PATH = os.getenv('JWKS_PATH', '')
+JWKS_CACHE = {}
+JWKS_CACHE_TTL_SECONDS = 3600
+JWKS_REFRESH_MIN_SECONDS = 60
+JWKS_FETCH_TIMEOUT_SECONDS = 2
+# ASN.1 DigestInfo prefix of an RSASSA-PKCS1-v1_5 SHA-256 signature.
+SHA256_DIGEST_INFO = bytes.fromhex('3031300d060960864801650304020105000420')
 MATCHED_SLD_CACHE_TTL_SECONDS = 60
 MATCHED_SLD_CACHE_MAX_ENTRIES = 256
-SEARCH_FIELDS_CACHE = {}
+MATCHED_SLD_CACHE = LruTtlCache('matchedSlds', MATCHED_SLD_CACHE_TTL_SECONDS, MATCHED_SLD_CACHE_MAX_ENTRIES)
+# The home page waits this long for highlights; past it the page renders bare and the client calls GetMatchedSlds.
+MATCHED_SLD_RENDER_BUDGET_SECONDS = float(os.getenv('MATCHED_SLD_RENDER_BUDGET_SECONDS', '0.25'))
+MATCHED_SLD_IN_FLIGHT = {}
+MATCHED_SLD_IN_FLIGHT_LOCK = threading.Lock()
+# Scans wait on lookups they fan out to DOMAIN_LOOKUP_EXECUTOR, so they run on their own pool.
+MATCHED_SLD_MAX_WORKERS = 2
+MATCHED_SLD_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MATCHED_SLD_MAX_WORKERS,
+    thread_name_prefix='matched-slds',
+)
 SEARCH_FIELDS_CACHE_TTL_SECONDS = 60
 SEARCH_FIELDS_CACHE_MAX_ENTRIES = 32
+SEARCH_FIELDS_CACHE_MAX_BYTES = 64 * 1024 * 1024
+SEARCH_FIELDS_CACHE = LruTtlCache(
+    'searchFields',
+    SEARCH_FIELDS_CACHE_TTL_SECONDS,
+    SEARCH_FIELDS_CACHE_MAX_ENTRIES,
+    SEARCH_FIELDS_CACHE_MAX_BYTES,
+)
+SEARCH_FIELD_MEMBERSHIP_CACHE = LruTtlCache('searchFieldMembership', SEARCH_FIELDS_CACHE_TTL_SECONDS, 4096)
+SEARCH_FIELD_TABLE_ENV_KEYS = ('WM_DAILYUPDATE', 'WM_DAILYREMOVE', 'WM_MALWARE', 'WM_OSINT')
+# Highlighting picks keyed per-SLD queries or a full partition read, whichever is estimated cheaper.
+# A keyed lookup is at most two single-item queries (LUNKER#<sld># and LUNKER#<sld>.), each billed 0.5 RCU.
+SEARCH_FIELD_KEYED_LOOKUP_RCU = 1.0
+SEARCH_FIELD_DEFAULT_SCAN_RCU = float(os.getenv('SEARCH_FIELD_DEFAULT_SCAN_RCU', '50'))
+SEARCH_FIELD_SCAN_COSTS = {}
+# A scheduled job publishes one Bloom filter per table; containers reload it only when the version changes.
+SEARCH_FIELD_SNAPSHOT_FALSE_POSITIVE_RATE = float(os.getenv('SEARCH_FIELD_SNAPSHOT_FALSE_POSITIVE_RATE', '0.001'))
+SEARCH_FIELD_SNAPSHOT_MAX_BYTES = 350000
+SEARCH_FIELD_SNAPSHOT_CHECK_SECONDS = 60
+SEARCH_FIELD_SNAPSHOTS = {}
+TLD_CACHE = {}
+TLD_CACHE_TTL_SECONDS = 3600
+TLD_CACHE_REFRESHING = set()
+FORM_SHELL_CACHE = {}
+STATIC_ASSET_CACHE = {}
+STATIC_ASSET_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+STATIC_ASSET_CONTENT_TYPES = {
+    'css': 'text/css; charset=utf-8',
+    'js': 'text/javascript; charset=utf-8',
+}
+RESPONSE_COMPRESSION_ENABLED = os.getenv('RESPONSE_COMPRESSION', 'false').strip().lower() == 'true'
+RESPONSE_COMPRESSION_MIN_BYTES = 1024
+SHELL_SLOT_PATTERN = re.compile('\x00slot:(\\w+)\x00')
 
 DYNAMODB_CONFIG = Config(
     retries={
@@ -38,9 +105,62 @@ DYNAMODB_CONFIG = Config(
 )
 DYNAMODB_RESOURCE = boto3.resource('dynamodb', config=DYNAMODB_CONFIG)
 DYNAMODB_CLIENT = boto3.client('dynamodb', config=DYNAMODB_CONFIG)
-DYNAMODB_TYPE_DESERIALIZER = TypeDeserializer()
+# Attributes read from the webmonitor and possibilities tables; everything else is projected away.
+SECTION_DOMAIN_ATTRIBUTES = ('sk', 'domain', 'fqdn', 'host', 'name')
+SEARCH_FIELD_ATTRIBUTES = ('sk', 'search', 'searchField', 'searchfield', 'sld')
+POSSIBILITY_DOMAIN_ATTRIBUTES = ('domain', 'fqdn', 'host', 'name')
+POSSIBILITY_LIST_ATTRIBUTES = ('poss', 'possibilities', 'value', 'values', 'domains')
+POSSIBILITY_ATTRIBUTES = ('sk',) + POSSIBILITY_DOMAIN_ATTRIBUTES + POSSIBILITY_LIST_ATTRIBUTES
 TABLE_CACHE = {}
 
+# Domain-detail lookups fan out across the webmonitor tables on the pooled client.
+DOMAIN_LOOKUP_MAX_WORKERS = 16
+DOMAIN_LOOKUP_TIMEOUT_SECONDS = 10
+DOMAIN_LOOKUP_EXECUTOR = ThreadPoolExecutor(
+    max_workers=DOMAIN_LOOKUP_MAX_WORKERS,
+    thread_name_prefix='domain-lookup',
+)
+DOMAIN_SECTION_LOOKUPS = (
+    ('suspect', 'openSourceIntelligence', ('WM_OSINT',)),
+    ('suspect', 'domainsMonitorSubscription', ('WM_MALWARE',)),
+    ('newRegistrations', 'daily', ('WM_DAILYUPDATE',)),
+    ('newRegistrations', 'weekly', ('WM_WEEKLYUPDATE',)),
+    ('newRegistrations', 'monthly', ('WM_MONTHLY', 'WM_MONTHLYUPDATE')),
+    ('expiredRegistrations', 'daily', ('WM_DAILYREMOVE',)),
+    ('expiredRegistrations', 'weekly', ('WM_WEEKLYREMOVE',)),
+    ('expiredRegistrations', 'monthly', ('WM_MONTHLYREMOVE',)),
+)
+DOMAIN_SECTIONS_BATCH_MAX_SLDS = 100
+# The page prefetches details a few domains per request, so a click never waits behind the whole watchlist.
+DOMAIN_DETAILS_PREFETCH_CHUNK_SIZE = 10
+
+# GetDomainPossibilities pages by possibilities-table records when the client sends `limit` or `next`.
+POSSIBILITIES_PAGE_DEFAULT_LIMIT = 200
+POSSIBILITIES_PAGE_MAX_LIMIT = 1000
+
+# Lunker and permutation items move from the single LUNKER# partition to LUNKER#<n>; must match the permutation Lambda.
+LUNKER_KEY_SHARDS = int(os.getenv('LUNKER_KEY_SHARDS', '1'))
+LUNKER_KEY_MODE = os.getenv('LUNKER_KEY_MODE', 'legacy').strip().lower()
+LUNKER_LEGACY_PARTITION = 'LUNKER#'
+
+# Per-container LRU of (sld, table) lookups; TTLs follow each table's update cadence.
+SECTION_CACHE_MAX_ENTRIES = int(os.getenv('SECTION_CACHE_MAX_ENTRIES', '2048'))
+SECTION_CACHE_MAX_BYTES = int(os.getenv('SECTION_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+SECTION_CACHE_TTL_SECONDS = {
+    'suspect': int(os.getenv('SECTION_CACHE_TTL_SUSPECT', '300')),
+    'daily': int(os.getenv('SECTION_CACHE_TTL_DAILY', '3600')),
+    'weekly': int(os.getenv('SECTION_CACHE_TTL_WEEKLY', '21600')),
+    'monthly': int(os.getenv('SECTION_CACHE_TTL_MONTHLY', '86400')),
+    'permutations': int(os.getenv('SECTION_CACHE_TTL_PERMUTATIONS', '3600')),
+    'possibilities': int(os.getenv('SECTION_CACHE_TTL_POSSIBILITIES', '3600')),
+}
+SECTION_CACHE = LruTtlCache(
+    'sections',
+    SECTION_CACHE_TTL_SECONDS['daily'],
+    SECTION_CACHE_MAX_ENTRIES,
+    SECTION_CACHE_MAX_BYTES,
+)
+
 
 def _get_table(table_name):
     table = TABLE_CACHE.get(table_name)
@@ -56,31 +176,35 @@ def _get_env_table(env_key, default_name):
     return _get_table(_table_name_from_env(os.getenv(env_key, default_name)))
 
 
-def _deserialize_dynamodb_attribute(value):
-    if isinstance(value, dict) and len(value) == 1:
-        type_key = next(iter(value))
-        if type_key in {'S', 'N', 'B', 'BOOL', 'NULL', 'M', 'L', 'SS', 'NS', 'BS'}:
-            try:
-                return DYNAMODB_TYPE_DESERIALIZER.deserialize(value)
-            except (TypeError, ValueError):
-                pass
+def _decode_string_attributes(item, names):
+    # Reads S, SS and L-of-S straight from the low-level wire format; other types are skipped.
+    decoded = {}
+    for name in names:
+        value = item.get(name)
+        if type(value) is not dict:
+            continue
 
-    if isinstance(value, list):
-        return [_deserialize_dynamodb_attribute(entry) for entry in value]
+        string_value = value.get('S')
+        if string_value is not None:
+            decoded[name] = string_value
+            continue
 
-    if isinstance(value, dict):
-        return {key: _deserialize_dynamodb_attribute(entry) for key, entry in value.items()}
+        string_values = value.get('SS')
+        if string_values is None:
+            list_values = value.get('L')
+            if list_values is None:
+                continue
+            string_values = [entry['S'] for entry in list_values if type(entry) is dict and 'S' in entry]
 
-    return value
+        decoded[name] = string_values
 
+    return decoded
 
-def _deserialize_dynamodb_item(item):
-    if not isinstance(item, dict):
-        return {}
 
+def _attribute_projection(names):
     return {
-        key: _deserialize_dynamodb_attribute(value)
-        for key, value in item.items()
+        'ProjectionExpression': ', '.join(f'#{name}' for name in names),
+        'ExpressionAttributeNames': {f'#{name}': name for name in names},
     }
 
 
@@ -109,6 +233,57 @@ def _get_authorization(event):
     return headers.get('authorization') or headers.get('Authorization') or ''
 
 
+def _get_header(event, name):
+    headers = event.get('headers') or {}
+    lowered_name = name.lower()
+    for key, value in headers.items():
+        if isinstance(key, str) and key.lower() == lowered_name:
+            return value if isinstance(value, str) else ''
+
+    return ''
+
+
+def _accepted_encodings(event):
+    accepted = set()
+    for token in _get_header(event, 'accept-encoding').split(','):
+        encoding, _, params = token.partition(';')
+        encoding = encoding.strip().lower()
+        quality = params.strip().replace(' ', '').lower()
+        if not encoding or (quality.startswith('q=') and quality[2:].strip('0.') == ''):
+            continue
+        accepted.add(encoding)
+
+    return accepted
+
+
+def _compress_response(event, response):
+    body = response.get('body')
+    if not RESPONSE_COMPRESSION_ENABLED or not isinstance(body, str) or response.get('isBase64Encoded'):
+        return response
+
+    raw_body = body.encode('utf-8')
+    if len(raw_body) < RESPONSE_COMPRESSION_MIN_BYTES:
+        return response
+
+    accepted = _accepted_encodings(event)
+    if brotli is not None and 'br' in accepted:
+        encoding, compressed_body = 'br', brotli.compress(raw_body, quality=5)
+    elif 'gzip' in accepted:
+        encoding, compressed_body = 'gzip', gzip.compress(raw_body, compresslevel=6)
+    else:
+        return response
+
+    headers = dict(response.get('headers') or {})
+    headers['Content-Encoding'] = encoding
+    headers['Vary'] = 'Accept-Encoding'
+    return {
+        **response,
+        'body': base64.b64encode(compressed_body).decode('ascii'),
+        'isBase64Encoded': True,
+        'headers': headers,
+    }
+
+
 def _sanitize_event_for_logging(event):
     if not isinstance(event, dict):
         return event
@@ -182,13 +357,8 @@ def _build_identity(payload, default_region):
 
 
 def _get_cached_identity(normalized_authorization):
-    cached_entry = IDENTITY_CACHE.get(normalized_authorization)
-    if not cached_entry:
-        return None
-
-    cached_at, identity = cached_entry
-    if (time.time() - cached_at) > IDENTITY_CACHE_TTL_SECONDS:
-        IDENTITY_CACHE.pop(normalized_authorization, None)
+    identity = IDENTITY_CACHE.get(normalized_authorization)
+    if identity is None:
         return None
 
     return dict(identity)
@@ -198,11 +368,139 @@ def _cache_identity(normalized_authorization, identity):
     if not normalized_authorization or not identity or identity.get('email') == 'unknown':
         return
 
-    if len(IDENTITY_CACHE) >= IDENTITY_CACHE_MAX_ENTRIES:
-        oldest_key = min(IDENTITY_CACHE, key=lambda key: IDENTITY_CACHE[key][0])
-        IDENTITY_CACHE.pop(oldest_key, None)
+    IDENTITY_CACHE.set(normalized_authorization, dict(identity))
+
+
+def _b64url_decode(segment):
+    return base64.urlsafe_b64decode((segment + '=' * (-len(segment) % 4)).encode('ascii'))
+
+
+def _b64url_int(segment):
+    return int.from_bytes(_b64url_decode(segment), 'big')
+
+
+def _load_jwks(issuer, document, ttl_seconds=None):
+    keys = {}
+    for key in document.get('keys', []) if isinstance(document, dict) else []:
+        if not isinstance(key, dict) or key.get('kty') != 'RSA' or key.get('use', 'sig') != 'sig':
+            continue
+        if key.get('alg', 'RS256') != 'RS256' or not key.get('kid'):
+            continue
+        try:
+            keys[key['kid']] = (_b64url_int(key['n']), _b64url_int(key['e']))
+        except (KeyError, TypeError, ValueError, binascii.Error):
+            continue
+
+    now = time.monotonic()
+    JWKS_CACHE[issuer] = {
+        'keys': keys,
+        'fetched': now,
+        # Offline documents never expire and are never refetched.
+        'expires': now + ttl_seconds if ttl_seconds is not None else math.inf,
+    }
+    return keys
+
+
+def _load_jwks_file(path):
+    try:
+        with open(path, encoding='utf-8') as handle:
+            documents = json.load(handle)
+    except (OSError, ValueError) as exc:
+        print(f'JWKS file load failed: {exc}')
+        return
+
+    # The file is deployment configuration, so the issuers it names are trusted like JWT_ISSUERS.
+    for issuer, document in documents.items() if isinstance(documents, dict) else []:
+        _load_jwks(issuer.rstrip('/'), document)
+        JWT_ISSUERS.add(issuer.rstrip('/'))
+
+
+def _jwks_key(issuer, kid):
+    entry = JWKS_CACHE.get(issuer)
+    now = time.monotonic()
+    if entry and kid in entry['keys'] and entry['expires'] > now:
+        return entry['keys'][kid]
+
+    # An unknown kid usually means the keys rotated; refetch, but at most once per interval.
+    if entry and (entry['expires'] == math.inf or now - entry['fetched'] < JWKS_REFRESH_MIN_SECONDS):
+        return entry['keys'].get(kid)
+
+    try:
+        response = HTTP_SESSION.get(f'{issuer}/.well-known/jwks.json', timeout=JWKS_FETCH_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        keys = _load_jwks(issuer, response.json(), JWKS_CACHE_TTL_SECONDS)
+    except (requests.RequestException, ValueError) as exc:
+        print(f'JWKS fetch failed for {issuer}: {exc}')
+        return entry['keys'].get(kid) if entry else None
+
+    return keys.get(kid)
+
+
+def _rsa_verify(key, signing_input, signature):
+    modulus, exponent = key
+    size = (modulus.bit_length() + 7) // 8
+    if len(signature) != size or size < len(SHA256_DIGEST_INFO) + 32 + 11:
+        return False
+
+    recovered = pow(int.from_bytes(signature, 'big'), exponent, modulus).to_bytes(size, 'big')
+    digest = SHA256_DIGEST_INFO + hashlib.sha256(signing_input).digest()
+    expected = b'\x00\x01' + b'\xff' * (size - len(digest) - 3) + b'\x00' + digest
+    return hmac.compare_digest(recovered, expected)
+
+
+def _verify_jwt(token):
+    # Verified claims, or None when the token cannot be checked locally; raises ValueError when it is invalid.
+    if JWKS_PATH and not JWKS_CACHE:
+        _load_jwks_file(JWKS_PATH)
+
+    segments = token.split('.')
+    if len(segments) != 3:
+        return None
+
+    try:
+        header = json.loads(_b64url_decode(segments[0]))
+        claims = json.loads(_b64url_decode(segments[1]))
+        signature = _b64url_decode(segments[2])
+    except (ValueError, binascii.Error):
+        return None
+
+    if not isinstance(header, dict) or not isinstance(claims, dict):
+        return None
+
+    issuer = str(claims.get('iss', '')).rstrip('/')
+    if issuer not in JWT_ISSUERS:
+        return None
+
+    if header.get('alg') != 'RS256':
+        raise ValueError(f"unsupported algorithm {header.get('alg')}")
+
+    kid = header.get('kid')
+    if not isinstance(kid, str) or not kid:
+        raise ValueError('missing or malformed kid')
+
+    key = _jwks_key(issuer, kid)
+    if key is None:
+        return None
+
+    if not _rsa_verify(key, f'{segments[0]}.{segments[1]}'.encode('ascii'), signature):
+        raise ValueError('signature mismatch')
+
+    now = time.time()
+    if not isinstance(claims.get('exp'), (int, float)) or claims['exp'] + JWT_LEEWAY_SECONDS < now:
+        raise ValueError('token expired')
+
+    if isinstance(claims.get('nbf'), (int, float)) and claims['nbf'] - JWT_LEEWAY_SECONDS > now:
+        raise ValueError('token not yet valid')
+
+    token_use = claims.get('token_use')
+    if token_use not in ('id', 'access'):
+        raise ValueError(f'unexpected token_use {token_use}')
 
-    IDENTITY_CACHE[normalized_authorization] = (time.time(), dict(identity))
+    audience = claims.get('aud') if token_use == 'id' else claims.get('client_id')
+    if JWT_AUDIENCES and audience not in JWT_AUDIENCES:
+        raise ValueError(f'unexpected audience {audience}')
+
+    return claims
 
 
 def _fetch_user_identity(authorization_header):
@@ -219,6 +517,28 @@ def _fetch_user_identity(authorization_header):
     if cached_identity:
         return cached_identity
 
+    try:
+        claims = _verify_jwt(normalized_authorization.split(' ', 1)[1].strip())
+    except ValueError as exc:
+        print(f'Token rejected: {exc}')
+        payload = _decode_jwt_payload(authorization_header)
+        return {
+            'email': 'unknown',
+            'rejected': True,
+            'region': (
+                payload.get('region')
+                or payload.get('custom:region')
+                or payload.get('zoneinfo')
+                or default_region
+            ),
+        }
+
+    if claims is not None:
+        identity = _build_identity(claims, default_region) if claims.get('email') else SUBJECT_IDENTITY_CACHE.get((claims['iss'].rstrip('/'), claims.get('sub')))
+        if identity:
+            _cache_identity(normalized_authorization, identity)
+            return dict(identity)
+
     try:
         response = HTTP_SESSION.get(
             USER_INFO_ENDPOINT,
@@ -244,6 +564,13 @@ def _fetch_user_identity(authorization_header):
 
     identity = _build_identity(payload, default_region)
     _cache_identity(normalized_authorization, identity)
+
+    # Only configured issuers are verified locally, so only their subjects are worth remembering.
+    token_payload = _decode_jwt_payload(authorization_header)
+    issuer = str(token_payload.get('iss', '')).rstrip('/')
+    if identity['email'] != 'unknown' and issuer in JWT_ISSUERS and token_payload.get('sub'):
+        SUBJECT_IDENTITY_CACHE.set((issuer, token_payload['sub']), dict(identity))
+
     return identity
 
 
@@ -267,7 +594,76 @@ def _validate_domain(domain):
     return True, ''
 
 
+def _query_tld_set(table):
+    tlds = set()
+    query_kwargs = {
+        'KeyConditionExpression': Key('pk').eq('TLD#'),
+        'ProjectionExpression': 'sk',
+    }
+
+    while True:
+        response = table.query(**query_kwargs)
+        for item in response.get('Items', []):
+            sk_value = item.get('sk')
+            if isinstance(sk_value, str) and sk_value:
+                tlds.add(sk_value.lower())
+
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if not last_evaluated_key:
+            break
+        query_kwargs['ExclusiveStartKey'] = last_evaluated_key
+
+    return frozenset(tlds)
+
+
+def _refresh_tld_cache(table):
+    tlds = _query_tld_set(table)
+    if tlds:
+        TLD_CACHE[table.name] = (time.time(), tlds)
+    return tlds
+
+
+def _revalidate_tld_cache(table):
+    try:
+        _refresh_tld_cache(table)
+    except (BotoCoreError, ClientError, KeyError, TypeError) as exc:
+        print(f'TLD cache refresh failed, serving stale entries: {exc}')
+    finally:
+        TLD_CACHE_REFRESHING.discard(table.name)
+
+
+def _get_cached_tld_set(table):
+    cached_entry = TLD_CACHE.get(table.name)
+    if not cached_entry:
+        tlds = _refresh_tld_cache(table)
+        return tlds, bool(tlds)
+
+    cached_at, tlds = cached_entry
+    if (time.time() - cached_at) <= TLD_CACHE_TTL_SECONDS:
+        return tlds, True
+
+    # Serve the stale set while a single background refresh revalidates it.
+    if table.name not in TLD_CACHE_REFRESHING:
+        TLD_CACHE_REFRESHING.add(table.name)
+        DOMAIN_LOOKUP_EXECUTOR.submit(_revalidate_tld_cache, table)
+
+    return tlds, False
+
+
 def _tld_exists(table, tld):
+    try:
+        tlds, is_fresh = _get_cached_tld_set(table)
+    except (BotoCoreError, ClientError, KeyError, TypeError) as exc:
+        print(f'TLD cache load failed: {exc}')
+        tlds, is_fresh = frozenset(), False
+
+    if tld in tlds:
+        return True
+
+    if is_fresh:
+        return False
+
+    # A stale or missing set may predate a newly delegated TLD, so confirm misses directly.
     response = table.get_item(
         Key={
             'pk': 'TLD#',
@@ -283,11 +679,28 @@ def _split_domain(domain):
     return sld, tld
 
 
+def _lunker_partition(value):
+    # Lunker items are placed by email and permutation items by SLD.
+    if LUNKER_KEY_MODE not in ('dual', 'sharded'):
+        return LUNKER_LEGACY_PARTITION
+
+    digest = hashlib.sha256(value.encode('utf-8')).digest()
+    return f'LUNKER#{int.from_bytes(digest[:8], "big") % LUNKER_KEY_SHARDS}'
+
+
+def _lunker_partitions(value):
+    # Dual mode reads the sharded partition first and falls back to the legacy one.
+    partition = _lunker_partition(value)
+    if LUNKER_KEY_MODE == 'dual':
+        return [partition, LUNKER_LEGACY_PARTITION]
+    return [partition]
+
+
 def _put_lunker_domain(table, email, domain):
     sld, tld = _split_domain(domain)
     table.put_item(
         Item={
-            'pk': 'LUNKER#',
+            'pk': _lunker_partition(email),
             'sk': f'LUNKER#{email}#{domain}#',
             'tk': f'LUNKER#{sld}#{email}#{domain}#',
             'domain': domain,
@@ -299,12 +712,13 @@ def _put_lunker_domain(table, email, domain):
 
 
 def _delete_lunker_domain(table, email, domain):
-    table.delete_item(
-        Key={
-            'pk': 'LUNKER#',
-            'sk': f'LUNKER#{email}#{domain}#',
-        }
-    )
+    for partition in _lunker_partitions(email):
+        table.delete_item(
+            Key={
+                'pk': partition,
+                'sk': f'LUNKER#{email}#{domain}#',
+            }
+        )
 
 
 def _list_lunker_domains(table, email):
@@ -334,13 +748,14 @@ def _list_lunker_domains(table, email):
                 break
             query_kwargs['ExclusiveStartKey'] = last_evaluated_key
 
-    fallback_query_kwargs = {
-        'KeyConditionExpression': Key('pk').eq('LUNKER#') & Key('sk').begins_with(f'LUNKER#{email}#'),
-        'ProjectionExpression': '#domain',
-        'ExpressionAttributeNames': {
-            '#domain': 'domain',
-        },
-    }
+    def _fallback_query_kwargs(partition):
+        return {
+            'KeyConditionExpression': Key('pk').eq(partition) & Key('sk').begins_with(f'LUNKER#{email}#'),
+            'ProjectionExpression': '#domain',
+            'ExpressionAttributeNames': {
+                '#domain': 'domain',
+            },
+        }
 
     try:
         _collect_from_query(index_query_kwargs)
@@ -353,7 +768,8 @@ def _list_lunker_domains(table, email):
 
     if not domains:
         try:
-            _collect_from_query(fallback_query_kwargs)
+            for partition in _lunker_partitions(email):
+                _collect_from_query(_fallback_query_kwargs(partition))
         except (BotoCoreError, ClientError, KeyError, TypeError):
             return []
 
@@ -462,6 +878,11 @@ def _extract_domain_value(item, sld):
     return ''
 
 
+def _sld_sk_prefixes(sld):
+    # LUNKER#<sld># and LUNKER#<sld>.<tld> are disjoint and, unlike LUNKER#<sld>, never reach a longer SLD.
+    return (f'LUNKER#{sld}#', f'LUNKER#{sld}.')
+
+
 def _query_with_prefix(dynamodb_client, table_identifier, sld, sk_prefix):
     domains = []
     expression_values = {
@@ -472,23 +893,13 @@ def _query_with_prefix(dynamodb_client, table_identifier, sld, sk_prefix):
         'TableName': table_identifier,
         'KeyConditionExpression': 'pk = :pk AND begins_with(sk, :sk)',
         'ExpressionAttributeValues': expression_values,
-        'ProjectionExpression': '#sk, #domain, #fqdn, #host, #name',
-        'ExpressionAttributeNames': {
-            '#sk': 'sk',
-            '#domain': 'domain',
-            '#fqdn': 'fqdn',
-            '#host': 'host',
-            '#name': 'name',
-        },
+        **_attribute_projection(SECTION_DOMAIN_ATTRIBUTES),
     }
 
     while True:
         response = dynamodb_client.query(**query_kwargs)
         for item in response.get('Items', []):
-            normalized_item = {
-                key: next(iter(value.values())) if isinstance(value, dict) and value else value
-                for key, value in item.items()
-            }
+            normalized_item = _decode_string_attributes(item, SECTION_DOMAIN_ATTRIBUTES)
             normalized_domain = _extract_domain_value(normalized_item, sld)
             if normalized_domain:
                 domains.append(normalized_domain)
@@ -502,20 +913,11 @@ def _query_with_prefix(dynamodb_client, table_identifier, sld, sk_prefix):
 
 
 def _query_paginated_domains(dynamodb_client, table_identifier, sld):
-    prefixes = [
-        f'LUNKER#{sld}#',
-        f'LUNKER#{sld}',
-    ]
-    all_domains = []
-
-    for prefix in prefixes:
-        try:
-            all_domains.extend(_query_with_prefix(dynamodb_client, table_identifier, sld, prefix))
-        except (BotoCoreError, ClientError, KeyError, TypeError) as exc:
-            print(f'WM query failed for prefix {prefix} on table {table_identifier}: {exc}')
-            continue
+    domains = []
+    for prefix in _sld_sk_prefixes(sld):
+        domains.extend(_query_with_prefix(dynamodb_client, table_identifier, sld, prefix))
 
-    return sorted(set(all_domains))
+    return sorted(set(domains))
 
 
 def _load_section_domains(dynamodb_client, sld, *env_keys):
@@ -523,11 +925,22 @@ def _load_section_domains(dynamodb_client, sld, *env_keys):
     if not table_identifiers:
         return []
 
+    last_error = None
     for table_identifier in table_identifiers:
-        domains = _query_paginated_domains(dynamodb_client, table_identifier, sld)
+        try:
+            domains = _query_paginated_domains(dynamodb_client, table_identifier, sld)
+        except (BotoCoreError, ClientError, KeyError, TypeError) as exc:
+            print(f'WM query failed on table {table_identifier}: {exc}')
+            last_error = exc
+            continue
+
+        last_error = None
         if domains:
             return domains
 
+    if last_error is not None:
+        raise last_error
+
     return []
 
 
@@ -581,8 +994,13 @@ def _extract_search_field_value(item):
     return ''
 
 
+def _search_field_projection():
+    return _attribute_projection(SEARCH_FIELD_ATTRIBUTES)
+
+
 def _query_search_fields(dynamodb_client, table_identifier):
     search_fields = []
+    consumed_capacity = 0.0
     expression_values = {
         ':pk': {'S': 'LUNKER#'},
         ':sk': {'S': 'LUNKER#'},
@@ -591,23 +1009,15 @@ def _query_search_fields(dynamodb_client, table_identifier):
         'TableName': table_identifier,
         'KeyConditionExpression': 'pk = :pk AND begins_with(sk, :sk)',
         'ExpressionAttributeValues': expression_values,
-        'ProjectionExpression': '#sk, #search, #searchField, #searchfield, #sld',
-        'ExpressionAttributeNames': {
-            '#sk': 'sk',
-            '#search': 'search',
-            '#searchField': 'searchField',
-            '#searchfield': 'searchfield',
-            '#sld': 'sld',
-        },
+        'ReturnConsumedCapacity': 'TOTAL',
+        **_search_field_projection(),
     }
 
     while True:
         response = dynamodb_client.query(**query_kwargs)
+        consumed_capacity += float((response.get('ConsumedCapacity') or {}).get('CapacityUnits', 0) or 0)
         for item in response.get('Items', []):
-            normalized_item = {
-                key: next(iter(value.values())) if isinstance(value, dict) and value else value
-                for key, value in item.items()
-            }
+            normalized_item = _decode_string_attributes(item, SEARCH_FIELD_ATTRIBUTES)
             search_field = _extract_search_field_value(normalized_item)
             if search_field:
                 search_fields.append(search_field)
@@ -617,9 +1027,226 @@ def _query_search_fields(dynamodb_client, table_identifier):
             break
         query_kwargs['ExclusiveStartKey'] = last_evaluated_key
 
+    if consumed_capacity > 0:
+        SEARCH_FIELD_SCAN_COSTS[table_identifier] = consumed_capacity
+
     return sorted(set(search_fields))
 
 
+def _query_search_field_membership(dynamodb_client, table_identifier, sld):
+    # The exact prefixes hold only this SLD's rows, so the first row of either one answers the question.
+    for prefix in _sld_sk_prefixes(sld):
+        response = dynamodb_client.query(
+            TableName=table_identifier,
+            KeyConditionExpression='pk = :pk AND begins_with(sk, :sk)',
+            ExpressionAttributeValues={
+                ':pk': {'S': 'LUNKER#'},
+                ':sk': {'S': prefix},
+            },
+            Limit=1,
+            **_search_field_projection(),
+        )
+        for item in response.get('Items', []):
+            normalized_item = _decode_string_attributes(item, SEARCH_FIELD_ATTRIBUTES)
+            if _extract_search_field_value(normalized_item) == sld:
+                return True
+
+    return False
+
+
+def _match_search_fields(table_identifier, slds):
+    cached_search_fields = _get_cached_search_fields_entry(table_identifier)
+    if cached_search_fields is not None:
+        return slds.intersection(cached_search_fields)
+
+    matched_slds = set()
+    unresolved_slds = set()
+    for sld in slds:
+        is_member = SEARCH_FIELD_MEMBERSHIP_CACHE.get((table_identifier, sld))
+        if is_member is None:
+            unresolved_slds.add(sld)
+        elif is_member:
+            matched_slds.add(sld)
+
+    if not unresolved_slds:
+        return matched_slds
+
+    keyed_cost = len(unresolved_slds) * SEARCH_FIELD_KEYED_LOOKUP_RCU
+    scan_cost = SEARCH_FIELD_SCAN_COSTS.get(table_identifier, SEARCH_FIELD_DEFAULT_SCAN_RCU)
+    if keyed_cost >= scan_cost:
+        return slds.intersection(_get_cached_search_fields(DYNAMODB_CLIENT, table_identifier))
+
+    futures = {
+        sld: DOMAIN_LOOKUP_EXECUTOR.submit(_query_search_field_membership, DYNAMODB_CLIENT, table_identifier, sld)
+        for sld in unresolved_slds
+    }
+    failed = set()
+    results = _collect_lookups(futures, _lookup_deadline(), False, failed)
+    for sld, is_member in results.items():
+        if sld not in failed:
+            SEARCH_FIELD_MEMBERSHIP_CACHE.set((table_identifier, sld), is_member)
+        if is_member:
+            matched_slds.add(sld)
+
+    return matched_slds
+
+
+def _bloom_positions(value, bit_count, hash_count):
+    digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+    first = int.from_bytes(digest[:8], 'big')
+    second = int.from_bytes(digest[8:], 'big') | 1
+    return [(first + index * second) % bit_count for index in range(hash_count)]
+
+
+def _build_bloom_filter(values, false_positive_rate=SEARCH_FIELD_SNAPSHOT_FALSE_POSITIVE_RATE):
+    value_count = max(len(values), 1)
+    bit_count = math.ceil(-value_count * math.log(false_positive_rate) / (math.log(2) ** 2))
+    # Oversized tables trade a higher false-positive rate for a filter that still fits one item.
+    bit_count = min(max(bit_count, 64), SEARCH_FIELD_SNAPSHOT_MAX_BYTES * 8)
+    bit_count = (bit_count + 7) // 8 * 8
+    hash_count = max(1, min(16, round(bit_count / value_count * math.log(2))))
+
+    bits = bytearray(bit_count // 8)
+    for value in values:
+        for position in _bloom_positions(value, bit_count, hash_count):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    return bytes(bits), bit_count, hash_count
+
+
+def _bloom_contains(snapshot, value):
+    bits = snapshot['bits']
+    return all(
+        bits[position >> 3] & (1 << (position & 7))
+        for position in _bloom_positions(value, snapshot['bitCount'], snapshot['hashCount'])
+    )
+
+
+def _search_field_snapshot_table():
+    # Snapshots live in a regional table, so publishing one never costs a replicated write.
+    return _get_env_table('SEARCH_FIELD_SNAPSHOT_TABLE', 'searchfields')
+
+
+def _search_field_snapshot_key(env_key):
+    return {
+        'pk': 'SNAPSHOT#',
+        'sk': f'SEARCHFIELDS#{env_key}#',
+    }
+
+
+def _search_field_snapshot_version(search_fields):
+    return hashlib.sha256('\n'.join(sorted(search_fields)).encode('utf-8')).hexdigest()[:20]
+
+
+def _load_search_field_snapshot(env_key):
+    now = time.monotonic()
+    cached = SEARCH_FIELD_SNAPSHOTS.get(env_key)
+    if cached is not None and now < cached['checkedAt'] + SEARCH_FIELD_SNAPSHOT_CHECK_SECONDS:
+        return cached
+
+    table = _search_field_snapshot_table()
+    key = _search_field_snapshot_key(env_key)
+
+    try:
+        # A one-attribute read decides whether the filter itself needs downloading.
+        response = table.get_item(
+            Key=key,
+            ProjectionExpression='#version',
+            ExpressionAttributeNames={
+                '#version': 'version',
+            },
+        )
+        item = response.get('Item') or {}
+        if not item.get('version'):
+            SEARCH_FIELD_SNAPSHOTS.pop(env_key, None)
+            return None
+
+        if cached is not None and cached['version'] == item['version']:
+            cached['checkedAt'] = now
+            return cached
+
+        item = table.get_item(Key=key).get('Item') or {}
+        bits = item['bits']
+        snapshot = {
+            'version': item['version'],
+            'bits': bytes(getattr(bits, 'value', bits)),
+            'bitCount': int(item['size']),
+            'hashCount': int(item['hashes']),
+            'checkedAt': now,
+        }
+        if len(snapshot['bits']) * 8 != snapshot['bitCount'] or snapshot['hashCount'] < 1:
+            raise ValueError(f'malformed snapshot for {env_key}')
+    except (BotoCoreError, ClientError, KeyError, TypeError, ValueError) as exc:
+        print(f'Search-field snapshot load failed for {env_key}: {exc}')
+        SEARCH_FIELD_SNAPSHOTS.pop(env_key, None)
+        return None
+
+    SEARCH_FIELD_SNAPSHOTS[env_key] = snapshot
+    return snapshot
+
+
+def _publish_search_field_snapshot(table, env_key):
+    search_fields = None
+    for table_identifier in _resolve_table_identifiers(env_key):
+        try:
+            search_fields = _query_search_fields(DYNAMODB_CLIENT, table_identifier)
+            break
+        except (BotoCoreError, ClientError, KeyError, TypeError) as exc:
+            print(f'Search-field query failed on table {table_identifier}: {exc}')
+
+    if search_fields is None:
+        return 'failed'
+
+    key = _search_field_snapshot_key(env_key)
+    version = _search_field_snapshot_version(search_fields)
+    existing = table.get_item(
+        Key=key,
+        ProjectionExpression='#version',
+        ExpressionAttributeNames={'#version': 'version'},
+    ).get('Item') or {}
+
+    # An unchanged field set is not written at all, not even a build stamp.
+    if existing.get('version') == version:
+        return 'unchanged'
+
+    bits, bit_count, hash_count = _build_bloom_filter(search_fields)
+    table.put_item(
+        Item={
+            **key,
+            'bits': bits,
+            'size': bit_count,
+            'hashes': hash_count,
+            'count': len(search_fields),
+            'version': version,
+            'built': int(time.time()),
+        }
+    )
+    print(f'Search-field snapshot {env_key}: {len(search_fields)} fields, {len(bits)} bytes, version {version}')
+    return 'updated'
+
+
+def search_field_snapshot_handler(event, context):
+    table = _search_field_snapshot_table()
+    results = {}
+
+    for env_key in SEARCH_FIELD_TABLE_ENV_KEYS:
+        if not _resolve_table_identifiers(env_key):
+            continue
+
+        try:
+            results[env_key] = _publish_search_field_snapshot(table, env_key)
+        except (BotoCoreError, ClientError, KeyError, TypeError) as exc:
+            print(f'Search-field snapshot write failed for {env_key}: {exc}')
+            results[env_key] = 'failed'
+
+    print(f'Search-field snapshots: {json.dumps(results, sort_keys=True)}')
+
+    return {
+        'statusCode': 200,
+        'body': json.dumps(results, sort_keys=True)
+    }
+
+
 def _get_search_field_matches(domains):
     normalized_slds = set()
     for domain in domains or []:
@@ -634,16 +1261,25 @@ def _get_search_field_matches(domains):
     if not normalized_slds:
         return set()
 
-    search_fields = set()
+    matched_slds = set()
+
+    for env_key in SEARCH_FIELD_TABLE_ENV_KEYS:
+        table_identifiers = _resolve_table_identifiers(env_key)
+        if not table_identifiers:
+            continue
+
+        snapshot = _load_search_field_snapshot(env_key)
+        if snapshot is not None:
+            matched_slds.update(sld for sld in normalized_slds if _bloom_contains(snapshot, sld))
+            continue
 
-    for env_key in ('WM_DAILYUPDATE', 'WM_DAILYREMOVE', 'WM_MALWARE', 'WM_OSINT'):
-        for table_identifier in _resolve_table_identifiers(env_key):
+        for table_identifier in table_identifiers:
             try:
-                search_fields.update(_get_cached_search_fields(DYNAMODB_CLIENT, table_identifier))
+                matched_slds.update(_match_search_fields(table_identifier, normalized_slds))
             except (BotoCoreError, ClientError, KeyError, TypeError) as exc:
                 print(f'Search-field query failed on table {table_identifier}: {exc}')
 
-    return normalized_slds.intersection(search_fields)
+    return matched_slds
 
 
 def _normalize_domain_list(domains):
@@ -657,45 +1293,30 @@ def _normalize_domain_list(domains):
 
 
 def _get_cached_matched_slds(cache_key):
-    cached_entry = MATCHED_SLD_CACHE.get(cache_key)
-    if not cached_entry:
-        return None
-
-    cached_at, matched_slds = cached_entry
-    if (time.time() - cached_at) > MATCHED_SLD_CACHE_TTL_SECONDS:
-        MATCHED_SLD_CACHE.pop(cache_key, None)
+    matched_slds = MATCHED_SLD_CACHE.get(cache_key)
+    if matched_slds is None:
         return None
 
     return set(matched_slds)
 
 
 def _cache_matched_slds(cache_key, matched_slds):
-    if len(MATCHED_SLD_CACHE) >= MATCHED_SLD_CACHE_MAX_ENTRIES:
-        oldest_key = min(MATCHED_SLD_CACHE, key=lambda key: MATCHED_SLD_CACHE[key][0])
-        MATCHED_SLD_CACHE.pop(oldest_key, None)
-
-    MATCHED_SLD_CACHE[cache_key] = (time.time(), sorted(set(matched_slds)))
+    MATCHED_SLD_CACHE.set(cache_key, sorted(set(matched_slds)))
 
 
 def _get_cached_search_fields_entry(table_identifier):
-    cached_entry = SEARCH_FIELDS_CACHE.get(table_identifier)
-    if not cached_entry:
-        return None
-
-    cached_at, search_fields = cached_entry
-    if (time.time() - cached_at) > SEARCH_FIELDS_CACHE_TTL_SECONDS:
-        SEARCH_FIELDS_CACHE.pop(table_identifier, None)
-        return None
-
-    return set(search_fields)
+    return SEARCH_FIELDS_CACHE.get(table_identifier)
 
 
 def _cache_search_fields(table_identifier, search_fields):
-    if len(SEARCH_FIELDS_CACHE) >= SEARCH_FIELDS_CACHE_MAX_ENTRIES:
-        oldest_key = min(SEARCH_FIELDS_CACHE, key=lambda key: SEARCH_FIELDS_CACHE[key][0])
-        SEARCH_FIELDS_CACHE.pop(oldest_key, None)
+    SEARCH_FIELDS_CACHE.set(table_identifier, frozenset(search_fields))
+
 
-    SEARCH_FIELDS_CACHE[table_identifier] = (time.time(), sorted(set(search_fields)))
+def _cache_stats():
+    return {
+        cache.name: cache.snapshot()
+        for cache in (IDENTITY_CACHE, SUBJECT_IDENTITY_CACHE, MATCHED_SLD_CACHE, SEARCH_FIELDS_CACHE, SEARCH_FIELD_MEMBERSHIP_CACHE, SECTION_CACHE)
+    }
 
 
 def _get_cached_search_fields(dynamodb_client, table_identifier):
@@ -703,7 +1324,7 @@ def _get_cached_search_fields(dynamodb_client, table_identifier):
     if cached_search_fields is not None:
         return cached_search_fields
 
-    search_fields = set(_query_search_fields(dynamodb_client, table_identifier))
+    search_fields = frozenset(_query_search_fields(dynamodb_client, table_identifier))
     _cache_search_fields(table_identifier, search_fields)
     return search_fields
 
@@ -723,109 +1344,317 @@ def _get_matched_slds(domains):
     return matched_slds
 
 
-def _get_domain_sections(domain):
-    normalized_domain = _normalize_domain(domain)
-    is_valid, _ = _validate_domain(normalized_domain)
-    if not is_valid:
-        return {}
+def _matched_slds_future(domains):
+    # One scan per watchlist: the deferred client request joins the scan the page render started.
+    cache_key = tuple(_normalize_domain_list(domains))
+    with MATCHED_SLD_IN_FLIGHT_LOCK:
+        future = MATCHED_SLD_IN_FLIGHT.get(cache_key)
+        if future is None:
+            future = MATCHED_SLD_EXECUTOR.submit(_get_matched_slds, domains)
+            MATCHED_SLD_IN_FLIGHT[cache_key] = future
+            future.add_done_callback(lambda _: MATCHED_SLD_IN_FLIGHT.pop(cache_key, None))
 
-    sld, tld = _split_domain(normalized_domain)
-    dynamodb_client = DYNAMODB_CLIENT
-    suspect_domains = {
-        'openSourceIntelligence': _load_section_domains(dynamodb_client, sld, 'WM_OSINT'),
-        'domainsMonitorSubscription': _load_section_domains(dynamodb_client, sld, 'WM_MALWARE'),
-    }
+    return future
+
+
+def _get_matched_slds_within_budget(domains, budget_seconds):
+    cache_key = tuple(_normalize_domain_list(domains))
+    if not cache_key:
+        return set(), False
+
+    cached_match = _get_cached_matched_slds(cache_key)
+    if cached_match is not None:
+        return cached_match, False
+
+    future = _matched_slds_future(domains)
+    if budget_seconds <= 0:
+        return set(), True
+
+    try:
+        return set(future.result(timeout=budget_seconds)), False
+    except TimeoutError:
+        # The scan keeps running and warms the cache for the client's GetMatchedSlds call.
+        return set(), True
+    except (BotoCoreError, ClientError, KeyError, TypeError, ValueError) as exc:
+        print(f'Matched SLD lookup failed: {exc}')
+        return set(), True
+
+
+def _lookup_deadline():
+    return time.monotonic() + DOMAIN_LOOKUP_TIMEOUT_SECONDS
+
+
+def _collect_lookups(futures, deadline, default, failed=None):
+    remaining = max(0.0, deadline - time.monotonic())
+    done, _ = wait(list(futures.values()), timeout=remaining)
+
+    results = {}
+    for key, future in futures.items():
+        if future not in done:
+            # Keep partial results; a slow table must not hold up the whole response.
+            future.cancel()
+            print(f'Domain lookup {key} exceeded {DOMAIN_LOOKUP_TIMEOUT_SECONDS}s deadline')
+            results[key] = default
+            if failed is not None:
+                failed.add(key)
+            continue
+
+        try:
+            results[key] = future.result()
+        except (BotoCoreError, ClientError, KeyError, TypeError, ValueError) as exc:
+            print(f'Domain lookup {key} failed: {exc}')
+            results[key] = default
+            if failed is not None:
+                failed.add(key)
 
+    return results
+
+
+def _section_cache_get(key, bypass_cache=False):
+    return SECTION_CACHE.get(key, bypass=bypass_cache)
+
+
+def _section_cache_put(key, value, ttl_seconds):
+    SECTION_CACHE.set(key, value, ttl_seconds)
+
+
+def _section_cache_ttl(group, name):
+    return SECTION_CACHE_TTL_SECONDS['suspect' if group == 'suspect' else name]
+
+
+def _get_cached_sections(sld, bypass_cache=False):
+    cached = {}
+    for group, name, env_keys in DOMAIN_SECTION_LOOKUPS:
+        domains = _section_cache_get((sld, env_keys[0]), bypass_cache)
+        if domains is not None:
+            cached[(group, name)] = domains
+
+    return cached
+
+
+def _cache_sections(sld, results):
+    for group, name, env_keys in DOMAIN_SECTION_LOOKUPS:
+        if (group, name) in results:
+            _section_cache_put((sld, env_keys[0]), results[(group, name)], _section_cache_ttl(group, name))
+
+
+def _submit_section_lookups(sld, skip=()):
     return {
-        'suspect': suspect_domains,
-        'newRegistrations': {
-            'daily': _load_section_domains(dynamodb_client, sld, 'WM_DAILYUPDATE'),
-            'weekly': _load_section_domains(dynamodb_client, sld, 'WM_WEEKLYUPDATE'),
-            'monthly': _load_section_domains(dynamodb_client, sld, 'WM_MONTHLY', 'WM_MONTHLYUPDATE'),
-        },
-        'expiredRegistrations': {
-            'daily': _load_section_domains(dynamodb_client, sld, 'WM_DAILYREMOVE'),
-            'weekly': _load_section_domains(dynamodb_client, sld, 'WM_WEEKLYREMOVE'),
-            'monthly': _load_section_domains(dynamodb_client, sld, 'WM_MONTHLYREMOVE'),
-        }
+        (group, name): DOMAIN_LOOKUP_EXECUTOR.submit(_load_section_domains, DYNAMODB_CLIENT, sld, *env_keys)
+        for group, name, env_keys in DOMAIN_SECTION_LOOKUPS
+        if (group, name) not in skip
     }
 
 
-def _get_permutation_count(domain):
+def _assemble_sections(results):
+    sections = {}
+    for group, name, _ in DOMAIN_SECTION_LOOKUPS:
+        sections.setdefault(group, {})[name] = results[(group, name)]
+
+    return sections
+
+
+def _get_domain_sections(domain, bypass_cache=False, failed=None):
     normalized_domain = _normalize_domain(domain)
     is_valid, _ = _validate_domain(normalized_domain)
     if not is_valid:
-        return 0
+        return {}
 
     sld, tld = _split_domain(normalized_domain)
-    table = _get_env_table('PERMUTATION_TABLE', 'permutation')
+    cached = _get_cached_sections(sld, bypass_cache)
+    if len(cached) == len(DOMAIN_SECTION_LOOKUPS):
+        return _assemble_sections(cached)
+
+    deadline = _lookup_deadline()
+    section_failed = set()
+    results = _collect_lookups(_submit_section_lookups(sld, cached), deadline, [], section_failed)
+    _cache_sections(sld, {key: value for key, value in results.items() if key not in section_failed})
+    results.update(cached)
+    sections = _assemble_sections(results)
+    if failed is not None:
+        failed.update(section_failed)
+
+    return sections
+
+
+def _get_domain_details(domain, bypass_cache=False, failed=None):
+    deadline = _lookup_deadline()
+    count_futures = {
+        'permutations': DOMAIN_LOOKUP_EXECUTOR.submit(_get_permutation_count, domain, bypass_cache),
+        'possibilities': DOMAIN_LOOKUP_EXECUTOR.submit(_get_possibility_count, domain, bypass_cache),
+    }
 
     try:
+        sections = _get_domain_sections(domain, bypass_cache, failed)
+    except (BotoCoreError, ClientError, KeyError, TypeError, ValueError) as exc:
+        print(f'GetDomainSections failed: {exc}')
+        sections = {}
+        if failed is not None:
+            failed.add('sections')
+
+    counts = _collect_lookups(count_futures, deadline, 0, failed)
+    return sections, counts['permutations'], counts['possibilities']
+
+
+def _group_domains_by_sld(domains):
+    domains_by_sld = {}
+    for domain in domains or []:
+        normalized_domain = _normalize_domain(domain)
+        is_valid, _ = _validate_domain(normalized_domain)
+        if not is_valid:
+            continue
+
+        sld, _ = _split_domain(normalized_domain)
+        sld_domains = domains_by_sld.setdefault(sld, [])
+        if normalized_domain not in sld_domains:
+            sld_domains.append(normalized_domain)
+
+    return domains_by_sld
+
+
+def _get_domain_details_batch(domains):
+    domains_by_sld = _group_domains_by_sld(domains)
+    slds = list(domains_by_sld)[:DOMAIN_SECTIONS_BATCH_MAX_SLDS]
+    if len(domains_by_sld) > len(slds):
+        print(f'GetDomainSectionsBatch truncated to {len(slds)} of {len(domains_by_sld)} SLDs')
+
+    deadline = _lookup_deadline()
+    cached_by_sld = {sld: _get_cached_sections(sld) for sld in slds}
+    sections_by_sld = {
+        sld: _assemble_sections(cached)
+        for sld, cached in cached_by_sld.items()
+        if len(cached) == len(DOMAIN_SECTION_LOOKUPS)
+    }
+
+    section_futures = {}
+    count_futures = {}
+    for sld in slds:
+        # Every domain sharing an SLD shares its webmonitor rows, so query once per SLD.
+        representative_domain = domains_by_sld[sld][0]
+        if sld not in sections_by_sld:
+            for key, future in _submit_section_lookups(sld, cached_by_sld[sld]).items():
+                section_futures[(sld,) + key] = future
+        count_futures[(sld, 'permutations')] = DOMAIN_LOOKUP_EXECUTOR.submit(_get_permutation_count, representative_domain)
+        count_futures[(sld, 'possibilities')] = DOMAIN_LOOKUP_EXECUTOR.submit(_get_possibility_count, representative_domain)
+
+    failed = set()
+    section_results = _collect_lookups(section_futures, deadline, [], failed)
+    count_results = _collect_lookups(count_futures, deadline, 0, failed)
+
+    for sld in slds:
+        if sld in sections_by_sld:
+            continue
+
+        results = {
+            (group, name): section_results[(sld, group, name)]
+            for group, name, _ in DOMAIN_SECTION_LOOKUPS
+            if (sld, group, name) in section_results
+        }
+        _cache_sections(sld, {key: value for key, value in results.items() if (sld,) + key not in failed})
+        results.update(cached_by_sld[sld])
+        sections_by_sld[sld] = _assemble_sections(results)
+
+    details = {}
+    for sld in slds:
+        sld_details = {
+            'sections': sections_by_sld[sld],
+            'permutations': count_results[(sld, 'permutations')],
+            'possibilities': count_results[(sld, 'possibilities')],
+            # Timed-out or failed lookups read as empty; the page must not cache them as real data.
+            'partial': any(key[0] == sld for key in failed),
+        }
+        for domain in domains_by_sld[sld]:
+            details[domain] = sld_details
+
+    return details
+
+
+def _get_permutation_item(table, sld, attribute):
+    for partition in _lunker_partitions(sld):
         response = table.get_item(
             Key={
-                'pk': 'LUNKER#',
+                'pk': partition,
                 'sk': f'LUNKER#{sld}#',
             },
-            ProjectionExpression='#count',
+            ProjectionExpression='#attribute',
             ExpressionAttributeNames={
-                '#count': 'count',
+                '#attribute': attribute,
             },
         )
+        if response.get('Item'):
+            return response['Item']
+
+    return {}
+
+
+def _get_permutation_count(domain, bypass_cache=False):
+    normalized_domain = _normalize_domain(domain)
+    is_valid, _ = _validate_domain(normalized_domain)
+    if not is_valid:
+        return 0
+
+    sld, tld = _split_domain(normalized_domain)
+    cache_key = (sld, 'PERMUTATION_TABLE#count')
+    cached_count = _section_cache_get(cache_key, bypass_cache)
+    if cached_count is not None:
+        return cached_count
+
+    table = _get_env_table('PERMUTATION_TABLE', 'permutation')
+
+    try:
+        item = _get_permutation_item(table, sld, 'count')
     except (BotoCoreError, ClientError, KeyError, TypeError) as exc:
         print(f'Permutation count lookup failed for {normalized_domain}: {exc}')
         return 0
 
-    item = response.get('Item') or {}
     count = item.get('count', 0)
     try:
-        return int(count)
+        count = int(count)
     except (TypeError, ValueError, ArithmeticError):
-        if isinstance(count, str):
-            try:
-                return int(float(count))
-            except (TypeError, ValueError, ArithmeticError):
-                return 0
-        return 0
+        try:
+            count = int(float(count)) if isinstance(count, str) else 0
+        except (TypeError, ValueError, ArithmeticError):
+            count = 0
+
+    _section_cache_put(cache_key, count, SECTION_CACHE_TTL_SECONDS['permutations'])
+    return count
 
 
-def _get_domain_permutations(domain):
+def _get_domain_permutations(domain, bypass_cache=False):
     normalized_domain = _normalize_domain(domain)
     is_valid, _ = _validate_domain(normalized_domain)
     if not is_valid:
         return []
 
     sld, tld = _split_domain(normalized_domain)
+    cache_key = (sld, 'PERMUTATION_TABLE')
+    cached_permutations = _section_cache_get(cache_key, bypass_cache)
+    if cached_permutations is not None:
+        return cached_permutations
+
     table = _get_env_table('PERMUTATION_TABLE', 'permutation')
 
     try:
-        response = table.get_item(
-            Key={
-                'pk': 'LUNKER#',
-                'sk': f'LUNKER#{sld}#',
-            },
-            ProjectionExpression='#perm',
-            ExpressionAttributeNames={
-                '#perm': 'perm',
-            },
-        )
+        item = _get_permutation_item(table, sld, 'perm')
     except (BotoCoreError, ClientError, KeyError, TypeError) as exc:
         print(f'Permutation lookup failed for {normalized_domain}: {exc}')
         return []
 
-    item = response.get('Item') or {}
     permutations = item.get('perm', [])
     if not isinstance(permutations, list):
-        return []
+        permutations = []
 
     normalized_permutations = []
     for permutation in permutations:
         if permutation is None:
             continue
         normalized_permutations.append(str(permutation))
+
+    _section_cache_put(cache_key, normalized_permutations, SECTION_CACHE_TTL_SECONDS['permutations'])
     return normalized_permutations
 
 
-def _get_possibility_count(domain):
+def _get_possibility_count(domain, bypass_cache=False):
     normalized_domain = _normalize_domain(domain)
     is_valid, _ = _validate_domain(normalized_domain)
     if not is_valid:
@@ -836,6 +1665,11 @@ def _get_possibility_count(domain):
     if not table_targets:
         return 0
 
+    cache_key = (sld, 'POSSIBILITIES_TABLE#count')
+    cached_count = _section_cache_get(cache_key, bypass_cache)
+    if cached_count is not None:
+        return cached_count
+
     def _count_possibilities(table_target):
         # Fast path: count matching records instead of materializing possibility values.
         total = 0
@@ -860,81 +1694,98 @@ def _get_possibility_count(domain):
 
         return total
 
+    lookup_failed = False
     for table_target in table_targets:
         try:
             count = _count_possibilities(table_target)
         except (BotoCoreError, ClientError, KeyError, TypeError, ValueError) as exc:
             print(f'Possibility count lookup failed for {normalized_domain} on table {table_target}: {exc}')
+            lookup_failed = True
             continue
 
         if count > 0:
+            _section_cache_put(cache_key, count, SECTION_CACHE_TTL_SECONDS['possibilities'])
             return count
 
+    if not lookup_failed:
+        _section_cache_put(cache_key, 0, SECTION_CACHE_TTL_SECONDS['possibilities'])
+
     return 0
 
 
-def _get_domain_possibilities(domain):
-    normalized_domain = _normalize_domain(domain)
-    is_valid, _ = _validate_domain(normalized_domain)
-    if not is_valid:
+def _extract_possibility_domains(item):
+    if not isinstance(item, dict):
         return []
 
-    sld, _ = _split_domain(normalized_domain)
-    table_targets = _resolve_query_table_targets('POSSIBILITIES_TABLE', 'possibilities')
-    if not table_targets:
-        return []
+    extracted = []
 
-    def _extract_possibility_domains(item):
-        if not isinstance(item, dict):
-            return []
+    for key in POSSIBILITY_DOMAIN_ATTRIBUTES:
+        raw_value = item.get(key)
+        normalized_value = _normalize_domain(raw_value)
+        if normalized_value and '.' in normalized_value:
+            extracted.append(normalized_value)
+
+    for key in POSSIBILITY_LIST_ATTRIBUTES:
+        raw_values = item.get(key)
 
-        extracted = []
+        if isinstance(raw_values, str):
+            candidates = [raw_values]
+        elif isinstance(raw_values, (list, tuple, set)):
+            candidates = list(raw_values)
+        else:
+            continue
 
-        for key in ('domain', 'fqdn', 'host', 'name'):
-            raw_value = item.get(key)
+        for raw_value in candidates:
             normalized_value = _normalize_domain(raw_value)
             if normalized_value and '.' in normalized_value:
                 extracted.append(normalized_value)
 
-        for key in ('poss', 'possibilities', 'value', 'values', 'domains'):
-            raw_values = item.get(key)
+    sk_value = item.get('sk')
+    if isinstance(sk_value, str):
+        for token in sk_value.split('#'):
+            normalized_token = _normalize_domain(token)
+            if normalized_token and '.' in normalized_token:
+                extracted.append(normalized_token)
+
+    return extracted
+
+
+def _possibility_query_kwargs(table_target, sld):
+    return {
+        'TableName': table_target,
+        'KeyConditionExpression': 'pk = :pk AND begins_with(sk, :sk)',
+        'ExpressionAttributeValues': {
+            ':pk': {'S': 'LUNKER#'},
+            ':sk': {'S': f'LUNKER#{sld}#'},
+        },
+        **_attribute_projection(POSSIBILITY_ATTRIBUTES),
+    }
 
-            if isinstance(raw_values, str):
-                candidates = [raw_values]
-            elif isinstance(raw_values, (list, tuple, set)):
-                candidates = list(raw_values)
-            else:
-                continue
 
-            for raw_value in candidates:
-                normalized_value = _normalize_domain(raw_value)
-                if normalized_value and '.' in normalized_value:
-                    extracted.append(normalized_value)
+def _get_domain_possibilities(domain, bypass_cache=False):
+    normalized_domain = _normalize_domain(domain)
+    is_valid, _ = _validate_domain(normalized_domain)
+    if not is_valid:
+        return []
 
-        sk_value = item.get('sk')
-        if isinstance(sk_value, str):
-            for token in sk_value.split('#'):
-                normalized_token = _normalize_domain(token)
-                if normalized_token and '.' in normalized_token:
-                    extracted.append(normalized_token)
+    sld, _ = _split_domain(normalized_domain)
+    table_targets = _resolve_query_table_targets('POSSIBILITIES_TABLE', 'possibilities')
+    if not table_targets:
+        return []
 
-        return extracted
+    cache_key = (sld, 'POSSIBILITIES_TABLE')
+    cached_possibilities = _section_cache_get(cache_key, bypass_cache)
+    if cached_possibilities is not None:
+        return cached_possibilities
 
     def _query_possibilities(table_target):
         possibilities = []
-        query_kwargs = {
-            'TableName': table_target,
-            'KeyConditionExpression': 'pk = :pk AND begins_with(sk, :sk)',
-            'ExpressionAttributeValues': {
-                ':pk': {'S': 'LUNKER#'},
-                ':sk': {'S': f'LUNKER#{sld}#'},
-            },
-        }
+        query_kwargs = _possibility_query_kwargs(table_target, sld)
 
         while True:
             response = DYNAMODB_CLIENT.query(**query_kwargs)
             for item in response.get('Items', []):
-                normalized_item = _deserialize_dynamodb_item(item)
+                normalized_item = _decode_string_attributes(item, POSSIBILITY_ATTRIBUTES)
                 possibilities.extend(_extract_possibility_domains(normalized_item))
 
             last_evaluated_key = response.get('LastEvaluatedKey')
@@ -944,463 +1795,374 @@ def _get_domain_possibilities(domain):
 
         return sorted(set(possibilities))
 
+    lookup_failed = False
     for table_target in table_targets:
         try:
             results = _query_possibilities(table_target)
         except (BotoCoreError, ClientError, KeyError, TypeError) as exc:
             print(f'Possibility lookup failed for {normalized_domain} on table {table_target}: {exc}')
+            lookup_failed = True
             continue
 
         if results:
+            _section_cache_put(cache_key, results, SECTION_CACHE_TTL_SECONDS['possibilities'])
             return results
 
-    return []
+    if not lookup_failed:
+        _section_cache_put(cache_key, [], SECTION_CACHE_TTL_SECONDS['possibilities'])
 
+    return []
 
-def _render_form(authorization_header, identity, domains=None, matched_slds=None):
-    auth_header_json = json.dumps(authorization_header)
-    safe_email = html.escape(identity.get('email', 'unknown'))
-    safe_region = html.escape(identity.get('region', 'unknown'))
-    domains = domains or []
-    matched_slds = matched_slds or set()
-    domains_json = json.dumps(domains)
-    if domains:
-        domain_items = []
-        for domain in domains:
-            css_class = ''
-            normalized_domain = _normalize_domain(domain)
-            is_valid, _ = _validate_domain(normalized_domain)
-            if is_valid:
-                sld, _ = _split_domain(normalized_domain)
-                if sld in matched_slds:
-                    css_class = ' class="matched-domain"'
 
-            safe_domain = html.escape(domain)
-            domain_items.append(
-                '<li><a data-domain="{d}"{css_class} href="#" onclick="showDomain(\'{d}\'); return false;">{d}</a></li>'.format(
-                    d=safe_domain,
-                    css_class=css_class
-                )
-            )
+def _possibility_page_limit(limit):
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return POSSIBILITIES_PAGE_DEFAULT_LIMIT
 
-        domain_list_html = ''.join(domain_items)
-        domains_section = f'''
-            <section class="domains">
-                <h2>Domains</h2>
-                <ol>
-                    {domain_list_html}
-                </ol>
-            </section>
-        '''
-    else:
-        domains_section = '''
-            <section class="domains">
-                <h2>Domains</h2>
-                <ul>
-                    <li>Empty!</li>
-                </ul>
-            </section>
-        '''
-    return f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="utf-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Gone Fishing!</title>
-    <style>
-        body {{
-            font-family: sans-serif;
-            margin: 0;
-            background: #f4f7fb;
-            color: #10233c;
-        }}
+    return min(max(limit, 1), POSSIBILITIES_PAGE_MAX_LIMIT)
 
-        body.modal-open {{
-            overflow: hidden;
-        }}
 
-        main {{
-            position: relative;
-            max-width: 540px;
-            margin: 48px auto;
-            padding: 32px;
-            background: #ffffff;
-            border-radius: 16px;
-            box-shadow: 0 18px 40px rgba(16, 35, 60, 0.12);
-        }}
+def _encode_possibility_cursor(table_target, last_evaluated_key):
+    raw_cursor = json.dumps({'t': table_target, 'k': last_evaluated_key}, separators=(',', ':'), sort_keys=True)
+    return base64.urlsafe_b64encode(raw_cursor.encode('utf-8')).decode('ascii').rstrip('=')
 
-        img {{
-            display: block;
-            margin: 0 auto 16px;
-            max-width: 220px;
-        }}
 
-        h1 {{
-            margin: 0 0 8px;
-            text-align: center;
-        }}
+def _decode_possibility_cursor(cursor, sld, table_targets):
+    try:
+        padded_cursor = cursor + '=' * (-len(cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(padded_cursor.encode('ascii')).decode('utf-8'))
+        table_target = decoded['t']
+        start_key = decoded['k']
+        sk_value = start_key['sk']['S']
+        pk_value = start_key['pk']['S']
+    except (AttributeError, binascii.Error, KeyError, TypeError, UnicodeError, ValueError) as exc:
+        raise ValueError('Invalid pagination token') from exc
+
+    # Tokens are not signed, so they may only resume within this SLD's key range.
+    if (
+        table_target not in table_targets
+        or set(start_key) != {'pk', 'sk'}
+        or pk_value != 'LUNKER#'
+        or not isinstance(sk_value, str)
+        or not sk_value.startswith(f'LUNKER#{sld}#')
+    ):
+        raise ValueError('Invalid pagination token')
+
+    return table_target, start_key
+
+
+def _get_domain_possibilities_page(domain, limit=None, cursor=None, bypass_cache=False):
+    normalized_domain = _normalize_domain(domain)
+    is_valid, _ = _validate_domain(normalized_domain)
+    if not is_valid:
+        return [], None
 
-        p {{
-            margin: 0 0 24px;
-            text-align: center;
-        }}
+    sld, _ = _split_domain(normalized_domain)
+    table_targets = _resolve_query_table_targets('POSSIBILITIES_TABLE', 'possibilities')
+    if not table_targets:
+        return [], None
 
-        .identity {{
-            margin: 0 0 24px;
-            padding: 12px 14px;
-            border: 1px solid #c6d3e1;
-            border-radius: 10px;
-            background: #f8fbff;
-            text-align: left;
-            line-height: 1.5;
-        }}
+    page_limit = _possibility_page_limit(limit)
+    start_key = None
+    if cursor:
+        table_target, start_key = _decode_possibility_cursor(cursor, sld, table_targets)
+        table_targets = [table_target]
 
-        label {{
-            display: block;
-            font-weight: 600;
-            margin-bottom: 8px;
-        }}
+    cache_key = (sld, f'POSSIBILITIES_TABLE#page:{page_limit}:{cursor or ""}')
+    cached_page = _section_cache_get(cache_key, bypass_cache)
+    if cached_page is not None:
+        return cached_page
 
-        input[type="text"],
-        input[type="password"] {{
-            width: 100%;
-            padding: 12px;
-            margin-bottom: 18px;
-            border: 1px solid #c6d3e1;
-            border-radius: 10px;
-            box-sizing: border-box;
-        }}
+    lookup_failed = False
+    for table_target in table_targets:
+        query_kwargs = {
+            **_possibility_query_kwargs(table_target, sld),
+            'Limit': page_limit,
+        }
+        if start_key:
+            query_kwargs['ExclusiveStartKey'] = start_key
 
-        .options {{
-            display: flex;
-            gap: 18px;
-            margin-bottom: 24px;
-        }}
+        try:
+            response = DYNAMODB_CLIENT.query(**query_kwargs)
+        except (BotoCoreError, ClientError, KeyError, TypeError) as exc:
+            print(f'Possibility page lookup failed for {normalized_domain} on table {table_target}: {exc}')
+            lookup_failed = True
+            continue
 
-        .actions {{
-            text-align: center;
-        }}
+        possibilities = []
+        for item in response.get('Items', []):
+            possibilities.extend(_extract_possibility_domains(_decode_string_attributes(item, POSSIBILITY_ATTRIBUTES)))
 
-        .domains {{
-            margin-top: 24px;
-            text-align: left;
-            border-top: 1px solid #dbe5f0;
-            padding-top: 16px;
-        }}
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        next_cursor = _encode_possibility_cursor(table_target, last_evaluated_key) if last_evaluated_key else None
+        if possibilities or next_cursor or start_key:
+            page = (sorted(set(possibilities)), next_cursor)
+            _section_cache_put(cache_key, page, SECTION_CACHE_TTL_SECONDS['possibilities'])
+            return page
 
-        .domains h2 {{
-            margin: 0 0 10px;
-            font-size: 1rem;
-        }}
+    if lookup_failed:
+        raise LookupError(f'Possibility page lookup failed for {normalized_domain}')
 
-        .domains ul {{
-            margin: 0;
-            padding-left: 20px;
-        }}
+    _section_cache_put(cache_key, ([], None), SECTION_CACHE_TTL_SECONDS['possibilities'])
+    return [], None
 
-        .domains li {{
-            margin-bottom: 6px;
-        }}
 
-        .domains a {{
-            color: #0e7490;
-            text-decoration: none;
-        }}
+def _shell_slot(name):
+    return f'\x00slot:{name}\x00'
 
-        .domains a.matched-domain {{
-            font-weight: 800;
-        }}
 
-        .domains a:hover {{
-            text-decoration: underline;
-        }}
+def _compile_shell(template):
+    parts = SHELL_SLOT_PATTERN.split(template)
+    return tuple(parts[0::2]), tuple(parts[1::2])
 
-        .inline-link {{
-            color: #0e7490;
-            text-decoration: none;
-        }}
 
-        .inline-link:hover {{
-            text-decoration: underline;
-        }}
+def _fill_shell(shell, values):
+    static_parts, slot_names = shell
+    rendered = [static_parts[0]]
+    for slot_name, static_part in zip(slot_names, static_parts[1:]):
+        rendered.append(values[slot_name])
+        rendered.append(static_part)
 
-        .domains-empty {{
-            margin: 0;
-            text-align: left;
-        }}
+    return ''.join(rendered)
 
-        .domain-sections {{
-            margin-top: 24px;
-            border-top: 1px solid #dbe5f0;
-            padding-top: 16px;
-            text-align: left;
-        }}
 
-        .domain-sections h3 {{
-            margin: 16px 0 8px;
-            font-size: 1rem;
-            color: #10233c;
-        }}
+def _get_static_assets():
+    cache_key = (API_ENDPOINT, LOGOUT_ENDPOINT)
+    static_assets = STATIC_ASSET_CACHE.get(cache_key)
+    if static_assets is None:
+        static_assets = _build_static_assets()
+        STATIC_ASSET_CACHE[cache_key] = static_assets
 
-        .domain-sections h3:first-child {{
-            margin-top: 0;
-        }}
+    return static_assets
 
-        .domain-sections h4 {{
-            margin: 12px 0 8px;
-            font-size: 0.95rem;
-            font-weight: 400;
-            color: #10233c;
-            text-decoration: underline;
-        }}
 
-        .domain-sections details.section-toggle {{
-            margin: 10px 0;
-            border: 1px solid #dbe5f0;
-            border-radius: 8px;
-            background: #f8fafc;
-        }}
+def _build_static_assets():
+    # Assets are named by content hash so browsers can cache them indefinitely.
+    sources = {
+        'form_css': ('css', _build_form_css()),
+        'form_script': ('js', _build_form_script()),
+        'result_css': ('css', _build_result_css()),
+        'result_script': ('js', _build_result_script()),
+    }
+    names = {}
+    bodies = {}
+    for asset_key, (extension, body) in sources.items():
+        digest = hashlib.sha256(body.encode('utf-8')).hexdigest()[:20]
+        asset_name = f'{digest}.{extension}'
+        names[asset_key] = asset_name
+        bodies[asset_name] = body
 
-        .domain-sections details.section-toggle > summary {{
-            cursor: pointer;
-            list-style: none;
-            padding: 10px 12px;
-            font-size: 0.95rem;
-            color: #10233c;
-            text-decoration: underline;
-            user-select: none;
-        }}
+    return {
+        'names': names,
+        'bodies': bodies,
+    }
 
-        .domain-sections details.section-toggle > summary::-webkit-details-marker {{
-            display: none;
-        }}
 
-        .domain-sections details.section-toggle > summary::before {{
-            content: '+';
-            display: inline-block;
-            width: 16px;
-            margin-right: 8px;
-            font-size: 1rem;
-            font-weight: 700;
-            line-height: 1;
-            text-align: center;
-            color: #0e7490;
-        }}
+def _static_asset_url(asset_key):
+    asset_name = _get_static_assets()['names'][asset_key]
+    return f'{API_ENDPOINT}?asset={asset_name}'
 
-        .domain-sections details.section-toggle[open] > summary::before {{
-            content: '-';
-        }}
 
-        .domain-sections details.section-toggle > ul,
-        .domain-sections details.section-toggle > ol {{
-            margin: 0 0 12px;
-            padding-left: 34px;
-            padding-right: 12px;
-        }}
+def _get_query_parameter(event, name):
+    parameters = event.get('queryStringParameters') or {}
+    value = parameters.get(name)
+    return value if isinstance(value, str) else ''
 
-        .domain-sections .section-header-alert {{
-            color: #ff0000;
-        }}
 
-        .domain-sections .section-header-warning {{
-            color: #ff8c00;
-        }}
+def _etag_matches(event, digest):
+    for token in _get_header(event, 'if-none-match').split(','):
+        token = token.strip()
+        if token == '*':
+            return True
 
-        .domain-sections ul {{
-            margin: 0;
-            padding-left: 20px;
-        }}
+        if token.startswith('W/'):
+            token = token[2:]
+        if token.strip('"').split('-', 1)[0] == digest:
+            return True
 
-        .domain-sections ol {{
-            margin: 0;
-            padding-left: 20px;
-        }}
+    return False
 
-        .domain-sections li {{
-            margin-bottom: 6px;
-        }}
 
-        .domains .attention-text,
-        .domain-sections .attention-text {{
-            color: #ff8c00;
-            font-weight: 800;
-        }}
+def _serve_static_asset(event, asset_name):
+    body = _get_static_assets()['bodies'].get(asset_name)
+    if body is None:
+        return {
+            'statusCode': 404,
+            'body': 'Not Found',
+            'headers': {
+                'Content-Type': 'text/plain; charset=utf-8',
+                'Cache-Control': 'no-store',
+            }
+        }
 
-        .domains .exact-sld-text,
-        .domain-sections .exact-sld-text {{
-            color: #ff0000;
-            font-weight: 800;
-        }}
+    digest, extension = asset_name.split('.', 1)
+    headers = {
+        'Content-Type': STATIC_ASSET_CONTENT_TYPES[extension],
+        'Cache-Control': STATIC_ASSET_CACHE_CONTROL,
+        'ETag': f'"{digest}"',
+    }
+    if _etag_matches(event, digest):
+        return {
+            'statusCode': 304,
+            'body': '',
+            'headers': headers,
+        }
 
-        .btn-primary {{
-            display: inline-block;
-            margin-top: 16px;
-            border: 0;
-            border-radius: 999px;
-            background: #0e7490;
-            color: #ffffff;
-            cursor: pointer;
-            font-size: 1rem;
-            padding: 12px 28px;
-            text-decoration: none;
-        }}
+    response = _compress_response(event, {
+        'statusCode': 200,
+        'body': body,
+        'headers': headers,
+    })
+    encoding = response['headers'].get('Content-Encoding')
+    if encoding:
+        response['headers']['ETag'] = f'"{digest}-{encoding}"'
 
-        .actions .btn-primary {{
-            margin-top: 0;
-        }}
+    return response
 
-        .card-actions {{
-            position: absolute;
-            top: 16px;
-            right: 16px;
-            display: flex;
-            gap: 8px;
-        }}
 
-        .help-button {{
-            width: 34px;
-            height: 34px;
-            border: 1px solid #cbd5e1;
-            border-radius: 50%;
-            background: #ffffff;
-            color: #10233c;
-            font-size: 1rem;
-            font-weight: 700;
-            line-height: 1;
-            cursor: pointer;
-        }}
+def _domain_list_body(domains, matched_slds, highlights_pending):
+    return json.dumps({
+        'domains': domains,
+        'matchedSlds': sorted(matched_slds),
+        'highlightsPending': bool(highlights_pending and domains),
+    }, separators=(',', ':'))
 
-        .help-button:hover {{
-            background: #f8fafc;
-        }}
 
-        .logoff-button {{
-            width: 34px;
-            height: 34px;
-            border: 1px solid #cbd5e1;
-            border-radius: 50%;
-            background: #ffffff;
-            color: #10233c;
-            font-size: 0.95rem;
-            font-weight: 700;
-            line-height: 1;
-            cursor: pointer;
-        }}
+def _domain_list_etag(body):
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()[:20]
 
-        .logoff-button:hover {{
-            background: #f8fafc;
-        }}
 
-        .refresh-button {{
-            width: 34px;
-            height: 34px;
-            border: 1px solid #cbd5e1;
-            border-radius: 50%;
-            background: #ffffff;
-            color: #10233c;
-            font-size: 0.95rem;
-            font-weight: 700;
-            line-height: 1;
-            cursor: pointer;
-        }}
+def _unauthorized_response():
+    return {
+        'statusCode': 401,
+        'body': json.dumps({
+            'error': 'Unauthorized',
+        }),
+        'headers': {
+            'Content-Type': 'application/json; charset=utf-8',
+            'WWW-Authenticate': 'Bearer error="invalid_token"',
+        }
+    }
 
-        .refresh-button:hover {{
-            background: #f8fafc;
-        }}
 
-        .help-modal-overlay {{
-            position: fixed;
-            inset: 0;
-            display: none;
-            align-items: center;
-            justify-content: center;
-            background: rgba(16, 35, 60, 0.45);
-            padding: 16px;
-            z-index: 1000;
-        }}
-
-        .help-modal-overlay.open {{
-            display: flex;
-        }}
-
-        .help-modal {{
-            width: min(420px, 100%);
-            padding: 18px 18px 14px;
-            border: 1px solid #dbe4ee;
-            border-radius: 14px;
-            background: #ffffff;
-            box-shadow: 0 18px 36px rgba(16, 35, 60, 0.2);
-            text-align: left;
-            max-height: 80vh;
-            overflow-y: auto;
-        }}
-
-        .help-modal h2 {{
-            margin: 0 0 12px;
-            font-size: 1rem;
-        }}
-
-        .help-modal h3 {{
-            margin: 14px 0 8px;
-            font-size: 0.98rem;
-            color: #10233c;
-        }}
-
-        .help-modal h4 {{
-            margin: 12px 0 8px;
-            font-size: 0.92rem;
-            color: #10233c;
-        }}
-
-        .help-steps {{
-            margin: 0;
-            padding-left: 20px;
-            color: #486581;
-            font-size: 0.92rem;
-        }}
+def _serve_domain_list(event, authorization_header):
+    identity = _fetch_user_identity(authorization_header)
+    if identity.get('rejected'):
+        return _unauthorized_response()
+    lunker_table = _get_table(os.environ['LUNKER_TABLE'])
+    domains = _list_lunker_domains(lunker_table, identity.get('email', 'unknown'))
+    matched_slds, highlights_pending = _get_matched_slds_within_budget(domains, MATCHED_SLD_RENDER_BUDGET_SECONDS)
+
+    # The tag is derived from the body, so an unchanged watchlist revalidates with an empty 304.
+    body = _domain_list_body(domains, matched_slds, highlights_pending)
+    digest = _domain_list_etag(body)
+    headers = {
+        'Content-Type': 'application/json; charset=utf-8',
+        'Cache-Control': 'private, no-cache',
+        'ETag': f'"{digest}"',
+    }
+    if _etag_matches(event, digest):
+        return {
+            'statusCode': 304,
+            'body': '',
+            'headers': headers,
+        }
 
-        .help-rules {{
-            margin: 0;
-            padding-left: 20px;
-            color: #486581;
-            font-size: 0.9rem;
-        }}
+    response = _compress_response(event, {
+        'statusCode': 200,
+        'body': body,
+        'headers': headers,
+    })
+    encoding = response['headers'].get('Content-Encoding')
+    if encoding:
+        response['headers']['ETag'] = f'"{digest}-{encoding}"'
 
-        .help-rules li {{
-            margin-bottom: 8px;
-        }}
+    return response
 
-        .help-steps li {{
-            margin-bottom: 12px;
-        }}
 
-        .help-steps span {{
-            display: block;
-            margin-bottom: 6px;
-            font-weight: 600;
-            color: #10233c;
-        }}
+def _render_form(authorization_header, identity, domains=None, matched_slds=None, highlights_pending=False):
+    domains = domains or []
+    matched_slds = matched_slds or set()
+    domains_json = json.dumps(domains)
+    if domains:
+        domain_items = []
+        for domain in domains:
+            css_class = ''
+            normalized_domain = _normalize_domain(domain)
+            is_valid, _ = _validate_domain(normalized_domain)
+            if is_valid:
+                sld, _ = _split_domain(normalized_domain)
+                if sld in matched_slds:
+                    css_class = ' class="matched-domain"'
 
-        .help-steps img {{
-            display: block;
-            max-width: 100%;
-            border-radius: 8px;
-            border: 1px solid #dbe4ee;
-            margin: 0;
-        }}
+            safe_domain = html.escape(domain)
+            domain_items.append(
+                '<li><a data-domain="{d}"{css_class} href="#" onclick="showDomain(\'{d}\'); return false;">{d}</a></li>'.format(
+                    d=safe_domain,
+                    css_class=css_class
+                )
+            )
 
-        .help-close {{
-            display: inline-block;
-            margin-top: 12px;
-            border: 0;
-            border-radius: 999px;
-            background: #0e7490;
-            color: #ffffff;
-            font-size: 1rem;
-            padding: 12px 28px;
-            cursor: pointer;
-        }}
-    </style>
+        domain_list_html = ''.join(domain_items)
+        domains_section = f'''
+            <section class="domains">
+                <h2>Domains</h2>
+                <ol>
+                    {domain_list_html}
+                </ol>
+            </section>
+        '''
+    else:
+        domains_section = '''
+            <section class="domains">
+                <h2>Domains</h2>
+                <ul>
+                    <li>Empty!</li>
+                </ul>
+            </section>
+        '''
+    return _fill_shell(_get_form_shell(), {
+        'auth_header_json': json.dumps(authorization_header),
+        'email': html.escape(identity.get('email', 'unknown')),
+        'region': html.escape(identity.get('region', 'unknown')),
+        'domains_json': domains_json,
+        'matched_slds_json': json.dumps(sorted(matched_slds)),
+        'highlights_pending_json': json.dumps(bool(highlights_pending and domains)),
+        'domains_etag_json': json.dumps('"' + _domain_list_etag(_domain_list_body(domains, matched_slds, highlights_pending)) + '"'),
+        'domains_section': domains_section,
+    })
+
+
+def _get_form_shell():
+    cache_key = (API_ENDPOINT, LOGOUT_ENDPOINT)
+    shell = FORM_SHELL_CACHE.get(cache_key)
+    if shell is None:
+        shell = _build_form_shell()
+        FORM_SHELL_CACHE[cache_key] = shell
+
+    return shell
+
+
+def _build_form_shell():
+    # Static markup is rendered once per endpoint configuration; per-request values fill the slots.
+    auth_header_json = _shell_slot('auth_header_json')
+    safe_email = _shell_slot('email')
+    safe_region = _shell_slot('region')
+    domains_json = _shell_slot('domains_json')
+    matched_slds_json = _shell_slot('matched_slds_json')
+    highlights_pending_json = _shell_slot('highlights_pending_json')
+    domains_etag_json = _shell_slot('domains_etag_json')
+    domains_section = _shell_slot('domains_section')
+    form_css_url = _static_asset_url('form_css')
+    form_script_url = _static_asset_url('form_script')
+    return _compile_shell(f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Gone Fishing!</title>
+    <link rel="stylesheet" href="{form_css_url}">
 </head>
 <body>
     <section id="lunker-help" class="help-modal-overlay" aria-hidden="true" aria-live="polite">
@@ -1410,835 +2172,106 @@ def _render_form(authorization_header, identity, domains=None, matched_slds=None
             <h3>Add Domain</h3>
             <ol class="help-steps">
                 <li>
-                    <span>Step 1: Enter a Domain</span>
-                    In the Domain field, enter a second-level domain (for example: example.com), keep <b>Add</b> selected, then click <b>Submit</b>.
-                    <img src="https://cdn.lukach.io/help/add-domain.png" alt="Add Domain">
-                </li>
-                <li>
-                    <span>Step 2: Domain Validation Runs</span>
-                    Client-side validation runs before submit continues.
-                    <img src="https://cdn.lukach.io/help/domain-validation.png" alt="Domain Validation">
-                </li>
-                <li>
-                    <span>Step 3: Submission Failed Case</span>
-                    If backend validation fails, the app shows a failed submission result.
-                    <img src="https://cdn.lukach.io/help/submission-failed.png" alt="Submission Failed">
-                </li>
-                <li>
-                    <span>Step 4: Successful Add</span>
-                    If all checks pass, the domain is stored and success is shown.
-                    <img src="https://cdn.lukach.io/help/successful-add.png" alt="Successful Add">
-                </li>
-            </ol>
-
-            <h4>Domain Validation On Submit</h4>
-            <ul class="help-rules">
-                <li>Domain is required (cannot be empty).</li>
-                <li>Must include one dot and exactly two labels (example.com format).</li>
-                <li>No subdomains are allowed.</li>
-                <li>Second-level label regex: starts/ends alphanumeric, dashes allowed only inside.</li>
-                <li>Top-level label regex: 2-63 chars using alphanumeric or dash.</li>
-                <li>Entry is normalized to lowercase and trimmed.</li>
-            </ul>
-
-            <h4>Validation That Produces Submission Failed</h4>
-            <ul class="help-rules">
-                <li>Client-side validation rules above fail.</li>
-                <li>User email cannot be resolved from token (unknown identity).</li>
-                <li>Top-level domain is not found in the TLD table.</li>
-                <li>POST request returns non-OK HTTP status.</li>
-                <li>Network or runtime fetch error during submit.</li>
-            </ul>
-
-            <h3>Remove Domain</h3>
-            <ol class="help-steps">
-                <li>
-                    <span>Step 1: Select Remove and Submit</span>
-                    Enter an existing domain, select <b>Remove</b>, then click <b>Submit</b>.
-                    <img src="https://cdn.lukach.io/help/remove-domain.png" alt="Remove Domain">
-                </li>
-                <li>
-                    <span>Step 2: Successful Delete</span>
-                    If the request succeeds, the domain is removed and a success result is shown.
-                    <img src="https://cdn.lukach.io/help/successful-delete.png" alt="Successful Delete">
-                </li>
-            </ol>
-            <div style="text-align:center">
-                <button class="help-close" type="button" onclick="closeHelp()">Close</button>
-            </div>
-        </div>
-    </section>
-    <main>
-        <div class="card-actions">
-            <button class="help-button" type="button" title="Lunker Help" onclick="toggleHelp()">?</button>
-            <button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>
-            <button class="logoff-button" type="button" title="Cognito Log Off" onclick="logOff()">X</button>
-        </div>
-        <img src="https://cdn.lukach.io/lunker.png" alt="Lunker Logo">
-
-        <div class="identity">
-            <strong>Email:</strong> {safe_email}<br>
-            <strong>Region:</strong> {safe_region}
-        </div>
-
-        <form id="home-form">
-            <label for="entry">Domain</label>
-            <input id="entry" name="entry" type="text" required>
-
-            <div class="options">
-                <label><input type="radio" name="action" value="PutItem" checked> Add</label>
-                <label><input type="radio" name="action" value="DeleteItem"> Remove</label>
-            </div>
-
-            <p id="entry-print"></p>
-
-            <div class="actions">
-                <button class="btn-primary" type="button" onclick="submitHomeForm()">Submit</button>
-            </div>
-
-            {domains_section}
-        </form>
-    </main>
-
-    <script>
-        function validateDomain(domain) {{
-            const issues = [];
-            if (!domain) {{
-                issues.push('Domain is required.');
-                return issues;
-            }}
-
-            const labels = domain.split('.');
-            if (labels.length < 2 || (labels.length === 2 && labels[1] === '')) {{
-                issues.push('Domain must include a single dot (e.g. example.com).');
-                return issues;
-            }}
-            if (labels.length !== 2) {{
-                issues.push('Domain must contain exactly one dot (no subdomains allowed).');
-                return issues;
-            }}
-
-            const sldPattern = /^[a-z0-9](?:[a-z0-9-]{{0,61}}[a-z0-9])?$/;
-            const tldPattern = /^[a-z0-9-]{{2,63}}$/;
-            const sld = labels[0];
-            const tld = labels[1];
-
-            if (!sldPattern.test(sld)) {{
-                issues.push('Invalid second-level domain.');
-            }}
-
-            if (!tldPattern.test(tld)) {{
-                issues.push('Invalid top-level domain format.');
-            }}
-
-            return issues;
-        }}
-
-        var initialDomains = {domains_json};
-        var activeView = {{
-            name: 'home',
-            domain: ''
-        }};
-        var refreshInFlight = false;
-        var domainSectionsAbortController = null;
-        var domainPermutationsAbortController = null;
-
-        function setRefreshButtonsDisabled(disabled) {{
-            document.querySelectorAll('.refresh-button').forEach((button) => {{
-                button.disabled = Boolean(disabled);
-                button.style.opacity = disabled ? '0.6' : '1';
-                button.style.cursor = disabled ? 'not-allowed' : 'pointer';
-            }});
-        }}
-
-        function showRefreshError(message) {{
-            const existing = document.getElementById('refresh-error-banner');
-            if (existing) {{
-                existing.remove();
-            }}
-
-            const banner = document.createElement('div');
-            banner.id = 'refresh-error-banner';
-            banner.style.margin = '12px 0 0';
-            banner.style.padding = '10px 12px';
-            banner.style.border = '1px solid #f5c2c7';
-            banner.style.borderRadius = '10px';
-            banner.style.background = '#fff5f5';
-            banner.style.color = '#b42318';
-            banner.style.fontSize = '0.92rem';
-            banner.textContent = message || 'Refresh failed. Please try again.';
-
-            const main = document.querySelector('main');
-            if (main) {{
-                main.prepend(banner);
-            }}
-        }}
-
-        async function loadMatchedDomains() {{
-            // Main-list highlighting is now rendered server-side to avoid extra network latency.
-            return;
-        }}
-
-        async function submitHomeForm() {{
-            const form = document.getElementById('home-form');
-            const formData = new FormData(form);
-            const action = formData.get('action');
-            const entry = formData.get('entry');
-            const normalizedEntry = (entry || '').trim().toLowerCase();
-            const entryPrint = document.getElementById('entry-print');
-            const authHeader = {auth_header_json};
-
-            document.getElementById('entry').value = normalizedEntry;
-            const issues = validateDomain(normalizedEntry);
-            if (issues.length > 0) {{
-                entryPrint.style.color = '#b42318';
-                entryPrint.innerHTML = issues.join('<br>');
-                return;
-            }}
-
-            entryPrint.style.color = '#166534';
-            entryPrint.textContent = 'Submitting…';
-
-            try {{
-                const response = await fetch('{API_ENDPOINT}', {{
-                    method: 'POST',
-                    headers: {{
-                        'Content-Type': 'application/json',
-                        'Authorization': authHeader || ''
-                    }},
-                    body: JSON.stringify({{ action, entry: normalizedEntry }})
-                }});
-
-                if (!response.ok) {{
-                    entryPrint.style.color = '#b42318';
-                    entryPrint.textContent = 'Submission failed: HTTP ' + response.status;
-                    return;
-                }}
-
-                const responseHtml = await response.text();
-                document.open();
-                document.write(responseHtml);
-                document.close();
-            }} catch (err) {{
-                entryPrint.style.color = '#b42318';
-                entryPrint.textContent = 'Submission failed: ' + err.message;
-            }}
-        }}
-
-        async function goHome() {{
-            activeView = {{
-                name: 'home',
-                domain: ''
-            }};
-            const authHeader = {auth_header_json} || '';
-            try {{
-                const r = await fetch('{API_ENDPOINT}', {{
-                    method: 'GET',
-                    credentials: 'include',
-                    cache: 'no-store',
-                    headers: authHeader ? {{ 'Authorization': authHeader }} : {{}}
-                }});
-
-                if (!r.ok || r.redirected) {{
-                    throw new Error('Home reload was redirected or failed: ' + r.status);
-                }}
-
-                const h = await r.text();
-                document.open();
-                document.write(h);
-                document.close();
-            }} catch (err) {{
-                console.error('Failed to refresh home view.', err);
-                showRefreshError('Failed to refresh home view. Please try again.');
-            }}
-        }}
-
-        async function refreshCurrentView(event) {{
-            if (event) {{
-                event.preventDefault();
-                event.stopPropagation();
-            }}
-
-            if (refreshInFlight) {{
-                return;
-            }}
-
-            refreshInFlight = true;
-            setRefreshButtonsDisabled(true);
-
-            try {{
-                if (activeView.name === 'domain' && activeView.domain) {{
-                    domainDetailsCache.delete(activeView.domain);
-                    domainPermutationsCache.delete(activeView.domain);
-                    domainPossibilitiesCache.delete(activeView.domain);
-                    await showDomain(activeView.domain);
-                    return;
-                }}
-
-                if (activeView.name === 'permutations' && activeView.domain) {{
-                    domainPermutationsCache.delete(activeView.domain);
-                    await showPermutations(activeView.domain);
-                    return;
-                }}
-
-                if (activeView.name === 'possibilities' && activeView.domain) {{
-                    domainPossibilitiesCache.delete(activeView.domain);
-                    await showPossibilities(activeView.domain);
-                    return;
-                }}
-
-                await goHome();
-            }} catch (err) {{
-                console.error('Refresh failed.', err);
-                showRefreshError('Refresh failed. Please try again.');
-            }} finally {{
-                refreshInFlight = false;
-                setRefreshButtonsDisabled(false);
-            }}
-        }}
-
-        function escapeHtml(value) {{
-            return String(value || '')
-                .replace(/&/g, '&amp;')
-                .replace(/</g, '&lt;')
-                .replace(/>/g, '&gt;');
-        }}
-
-        function extractSld(value) {{
-            const normalized = normalizeDomainKey(value);
-            if (!normalized) {{
-                return '';
-            }}
-
-            return normalized.includes('.') ? normalized.split('.', 1)[0] : normalized;
-        }}
-
-        function containsSldMatch(item, matchSld) {{
-            const normalizedMatch = normalizeDomainKey(matchSld);
-            if (!normalizedMatch) {{
-                return false;
-            }}
-
-            const normalizedItem = normalizeDomainKey(item);
-            if (!normalizedItem) {{
-                return false;
-            }}
-
-            return normalizedItem.includes(normalizedMatch);
-        }}
-
-        function containsPermutationMatch(item, permutationTerms) {{
-            const normalizedItem = normalizeDomainKey(item);
-            if (!normalizedItem) {{
-                return false;
-            }}
-
-            return (Array.isArray(permutationTerms) ? permutationTerms : []).some(term => {{
-                const normalizedTerm = normalizeDomainKey(term);
-                return normalizedTerm && normalizedItem.includes(normalizedTerm);
-            }});
-        }}
-
-        function markSubstringMatches(styleMap, normalizedText, term, styleCode) {{
-            const normalizedTerm = normalizeDomainKey(term);
-            if (!normalizedTerm) {{
-                return;
-            }}
-
-            let startIndex = 0;
-            while (startIndex < normalizedText.length) {{
-                const matchIndex = normalizedText.indexOf(normalizedTerm, startIndex);
-                if (matchIndex === -1) {{
-                    break;
-                }}
-
-                const endIndex = matchIndex + normalizedTerm.length;
-                for (let idx = matchIndex; idx < endIndex; idx += 1) {{
-                    styleMap[idx] = Math.max(styleMap[idx], styleCode);
-                }}
-
-                startIndex = endIndex;
-            }}
-        }}
-
-        function highlightDomainSubstrings(item, exactTerms, permutationTerms) {{
-            const rawText = String(item || '');
-            const normalizedText = rawText.toLowerCase();
-            if (!rawText) {{
-                return '';
-            }}
-
-            const styleMap = new Array(rawText.length).fill(0);
-            const safePermutationTerms = Array.isArray(permutationTerms) ? permutationTerms : [];
-
-            safePermutationTerms
-                .map(term => normalizeDomainKey(term))
-                .filter(term => term)
-                .sort((a, b) => b.length - a.length)
-                .forEach(term => markSubstringMatches(styleMap, normalizedText, term, 1));
-
-            const safeExactTerms = (Array.isArray(exactTerms) ? exactTerms : [exactTerms])
-                .map(term => normalizeDomainKey(term))
-                .filter(term => term)
-                .sort((a, b) => b.length - a.length);
-            safeExactTerms.forEach(term => markSubstringMatches(styleMap, normalizedText, term, 2));
-
-            if (!styleMap.some(value => value > 0)) {{
-                return escapeHtml(rawText);
-            }}
-
-            let output = '';
-            let segmentStart = 0;
-            while (segmentStart < rawText.length) {{
-                const styleCode = styleMap[segmentStart];
-                let segmentEnd = segmentStart + 1;
-                while (segmentEnd < rawText.length && styleMap[segmentEnd] === styleCode) {{
-                    segmentEnd += 1;
-                }}
-
-                const segmentText = escapeHtml(rawText.slice(segmentStart, segmentEnd));
-                if (styleCode === 2) {{
-                    output += '<span class="exact-sld-text">' + segmentText + '</span>';
-                }} else if (styleCode === 1) {{
-                    output += '<span class="attention-text">' + segmentText + '</span>';
-                }} else {{
-                    output += segmentText;
-                }}
-
-                segmentStart = segmentEnd;
-            }}
-
-            return output;
-        }}
-
-        function renderNumberedList(items, emphasize = false, matchSld = '', permutationTerms = []) {{
-            if (!Array.isArray(items) || items.length === 0) {{
-                return '<ul><li>Empty!</li></ul>';
-            }}
-
-            const rows = items
-                .map(item => {{
-                    const hasExactMatch = containsSldMatch(item, matchSld);
-                    const hasPermutationMatch = containsPermutationMatch(item, permutationTerms);
-                    const highlightItem = emphasize && (hasExactMatch || hasPermutationMatch);
-                    const rowExactTerms = hasExactMatch ? [matchSld] : [];
-                    return '<li>' + (highlightItem ? highlightDomainSubstrings(item, rowExactTerms, permutationTerms) : escapeHtml(item)) + '</li>';
-                }})
-                .join('');
-            return '<ol>' + rows + '</ol>';
-        }}
-
-        function normalizeDomainKey(value) {{
-            return String(value || '').trim().toLowerCase();
-        }}
-
-        function dedupeByPriority(section) {{
-            const safeSection = section || {{}};
-            const seen = new Set();
-            const filterBySeen = (items) => (Array.isArray(items) ? items : []).filter(item => {{
-                const key = normalizeDomainKey(item);
-                if (!key || seen.has(key)) {{
-                    return false;
-                }}
-                seen.add(key);
-                return true;
-            }});
-
-            return {{
-                daily: filterBySeen(safeSection.daily),
-                weekly: filterBySeen(safeSection.weekly),
-                monthly: filterBySeen(safeSection.monthly),
-            }};
-        }}
-
-        function formatSectionHeader(label, count, alertIfPositive = false) {{
-            const safeLabel = escapeHtml(label);
-            const safeCount = escapeHtml(String(count));
-            const text = safeLabel + ' - ' + safeCount;
-
-            if (alertIfPositive && count > 0) {{
-                return '<span class="section-header-alert"><strong>' + text + '</strong></span>';
-            }}
-
-            return text;
-        }}
-
-        function getHeaderHighlightLevel(items, matchSld, permutationTerms) {{
-            const safeItems = Array.isArray(items) ? items : [];
-            const hasExactSldMatch = safeItems.some(item => containsSldMatch(item, matchSld));
-            if (hasExactSldMatch) {{
-                return 'alert';
-            }}
-
-            const hasPermutationMatch = safeItems.some(item => containsPermutationMatch(item, permutationTerms));
-            if (hasPermutationMatch) {{
-                return 'warning';
-            }}
-
-            return 'none';
-        }}
-
-        function renderCollapsibleList(label, items, options = {{}}) {{
-            const safeItems = Array.isArray(items) ? items : [];
-            const count = safeItems.length;
-            const emphasizeRows = Boolean(options.emphasizeRows);
-            const alertIfPositive = Boolean(options.alertIfPositive);
-            const matchSld = extractSld(options.matchSld);
-            const permutationTerms = Array.isArray(options.permutationTerms) ? options.permutationTerms : [];
-            const headerHighlightLevel = getHeaderHighlightLevel(safeItems, matchSld, permutationTerms);
-            const shouldAlertHeader = alertIfPositive && count > 0 && headerHighlightLevel === 'alert';
-            const shouldWarnHeader = alertIfPositive && count > 0 && headerHighlightLevel === 'warning';
-            const baseHeader = formatSectionHeader(label, count, shouldAlertHeader);
-            const styledHeader = shouldWarnHeader
-                ? '<span class="section-header-warning"><strong>' + baseHeader + '</strong></span>'
-                : baseHeader;
-
-            return '<details class="section-toggle">' +
-                '<summary>' + styledHeader + '</summary>' +
-                renderNumberedList(safeItems, emphasizeRows, matchSld, permutationTerms) +
-                '</details>';
-        }}
-
-        function getEmptySections() {{
-            return {{
-                suspect: {{
-                    openSourceIntelligence: [],
-                    domainsMonitorSubscription: []
-                }},
-                newRegistrations: {{
-                    daily: [],
-                    weekly: [],
-                    monthly: []
-                }},
-                expiredRegistrations: {{
-                    daily: [],
-                    weekly: [],
-                    monthly: []
-                }}
-            }};
-        }}
-
-        async function fetchDomainSections(domain) {{
-            const authHeader = {auth_header_json};
-            const fallback = {{
-                sections: getEmptySections(),
-                permutations: 0,
-                possibilities: 0
-            }};
-
-            if (domainSectionsAbortController) {{
-                domainSectionsAbortController.abort();
-            }}
-            domainSectionsAbortController = new AbortController();
-            const requestController = domainSectionsAbortController;
-
-            try {{
-                const response = await fetch('{API_ENDPOINT}', {{
-                    method: 'POST',
-                    headers: {{
-                        'Content-Type': 'application/json',
-                        'Authorization': authHeader || ''
-                    }},
-                    signal: requestController.signal,
-                    body: JSON.stringify({{ action: 'GetDomainSections', entry: domain }})
-                }});
-
-                if (!response.ok) {{
-                    return fallback;
-                }}
-
-                const payload = await response.json();
-                if (domainSectionsAbortController !== requestController) {{
-                    return fallback;
-                }}
-                const permutations = Number(payload.permutations);
-                const possibilities = Number(payload.possibilities);
-                return {{
-                    sections: payload.sections || fallback.sections,
-                    permutations: Number.isFinite(permutations) ? permutations : 0,
-                    possibilities: Number.isFinite(possibilities) ? possibilities : 0
-                }};
-            }} catch (err) {{
-                if (err && err.name === 'AbortError') {{
-                    return fallback;
-                }}
-                return fallback;
-            }}
-        }}
-
-        async function fetchDomainPermutations(domain) {{
-            const authHeader = {auth_header_json};
-
-            if (domainPermutationsAbortController) {{
-                domainPermutationsAbortController.abort();
-            }}
-            domainPermutationsAbortController = new AbortController();
-            const requestController = domainPermutationsAbortController;
-
-            try {{
-                const response = await fetch('{API_ENDPOINT}', {{
-                    method: 'POST',
-                    headers: {{
-                        'Content-Type': 'application/json',
-                        'Authorization': authHeader || ''
-                    }},
-                    signal: requestController.signal,
-                    body: JSON.stringify({{ action: 'GetDomainPermutations', entry: domain }})
-                }});
-
-                if (!response.ok) {{
-                    return [];
-                }}
-
-                const payload = await response.json();
-                if (domainPermutationsAbortController !== requestController) {{
-                    return [];
-                }}
-                return Array.isArray(payload.permutations) ? payload.permutations : [];
-            }} catch (err) {{
-                if (err && err.name === 'AbortError') {{
-                    return [];
-                }}
-                return [];
-            }}
-        }}
-
-        var domainPossibilitiesAbortController = null;
-
-        async function fetchDomainPossibilities(domain) {{
-            const authHeader = {auth_header_json};
-
-            if (domainPossibilitiesAbortController) {{
-                domainPossibilitiesAbortController.abort();
-            }}
-            domainPossibilitiesAbortController = new AbortController();
-            const requestController = domainPossibilitiesAbortController;
-
-            try {{
-                const response = await fetch('{API_ENDPOINT}', {{
-                    method: 'POST',
-                    headers: {{
-                        'Content-Type': 'application/json',
-                        'Authorization': authHeader || ''
-                    }},
-                    signal: requestController.signal,
-                    body: JSON.stringify({{ action: 'GetDomainPossibilities', entry: domain }})
-                }});
-
-                if (!response.ok) {{
-                    return [];
-                }}
-
-                const payload = await response.json();
-                if (domainPossibilitiesAbortController !== requestController) {{
-                    return [];
-                }}
-                return Array.isArray(payload.possibilities) ? payload.possibilities : [];
-            }} catch (err) {{
-                if (err && err.name === 'AbortError') {{
-                    return [];
-                }}
-                return [];
-            }}
-        }}
-
-        var domainDetailsCache = new Map();
-        var domainPermutationsCache = new Map();
-        var domainPossibilitiesCache = new Map();
-
-        function renderDomainView(domain, domainDetails) {{
-            const safeDomain = escapeHtml(domain);
-            const domainLiteral = JSON.stringify(String(domain || '')).replace(/"/g, '&quot;');
-            const selectedSld = extractSld(domain);
-            const permutationTerms = Array.isArray(domainDetails?.permutationTerms)
-                ? domainDetails.permutationTerms
-                : [];
-            const rawSections = domainDetails?.sections || getEmptySections();
-            const safeSections = {{
-                suspect: {{
-                    openSourceIntelligence: Array.isArray(rawSections.suspect?.openSourceIntelligence)
-                        ? rawSections.suspect.openSourceIntelligence
-                        : [],
-                    domainsMonitorSubscription: Array.isArray(rawSections.suspect?.domainsMonitorSubscription)
-                        ? rawSections.suspect.domainsMonitorSubscription
-                        : [],
-                }},
-                newRegistrations: dedupeByPriority(rawSections.newRegistrations),
-                expiredRegistrations: dedupeByPriority(rawSections.expiredRegistrations),
-            }};
-            const safePermutations = Number.isFinite(domainDetails?.permutations)
-                ? domainDetails.permutations
-                : 0;
-            const safePossibilities = Number.isFinite(domainDetails?.possibilities)
-                ? domainDetails.possibilities
-                : 0;
-
-            domainDetailsCache.set(domain, {{
-                sections: safeSections,
-                permutations: safePermutations,
-                possibilities: safePossibilities
-            }});
-
-            document.querySelector('main').innerHTML =
-                '<div class="card-actions">' +
-                '<button class="help-button" type="button" title="Lunker Help" onclick="toggleHelp()">?</button>' +
-                '<button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>' +
-                '<button class="logoff-button" type="button" title="Cognito Log Off" onclick="logOff()">X</button>' +
-                '</div>' +
-                '<img src="https://cdn.lukach.io/lunker.png" alt="Lunker Logo">' +
-                '<div style="text-align:center; margin: 8px 0 12px; line-height: 1.4;">' +
-                '<p style="margin:0;"><strong>Domain:</strong> ' + safeDomain + '</p>' +
-                '<p style="margin:4px 0 0;"><strong>Permutations:</strong> <a class="inline-link" href="#" onclick="showPermutations(' + domainLiteral + '); return false;">' + String(safePermutations) + '</a></p>' +
-                '<p style="margin:4px 0 0;"><strong>Possibilities:</strong> <a class="inline-link" href="#" onclick="showPossibilities(' + domainLiteral + '); return false;">' + String(safePossibilities) + '</a></p>' +
-                '</div>' +
-                '<div style="text-align:center;">' +
-                '<a class="btn-primary" href="#" onclick="goHome(); return false;">Back</a>' +
-                '</div>' +
-                '<div class="domain-sections">' +
-                '<h3>Suspect Domains</h3>' +
-                renderCollapsibleList('Open Source Intelligence', safeSections.suspect?.openSourceIntelligence || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
-                renderCollapsibleList('Domains Monitor Subscription', safeSections.suspect?.domainsMonitorSubscription || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
-                '<h3>New Domains</h3>' +
-                renderCollapsibleList('Daily', safeSections.newRegistrations?.daily || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
-                renderCollapsibleList('Weekly', safeSections.newRegistrations?.weekly || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
-                renderCollapsibleList('Monthly', safeSections.newRegistrations?.monthly || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
-                '<h3>Expired Domains</h3>' +
-                renderCollapsibleList('Daily', safeSections.expiredRegistrations?.daily || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
-                renderCollapsibleList('Weekly', safeSections.expiredRegistrations?.weekly || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
-                renderCollapsibleList('Monthly', safeSections.expiredRegistrations?.monthly || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
-                '</div>';
-        }}
-
-        async function getDomainPermutationTerms(domain) {{
-            let permutations = domainPermutationsCache.get(domain);
-            if (!permutations) {{
-                permutations = await fetchDomainPermutations(domain);
-                domainPermutationsCache.set(domain, permutations);
-            }}
-
-            return Array.isArray(permutations) ? permutations : [];
-        }}
-
-        function renderPermutationsView(domain, permutations) {{
-            const safeDomain = escapeHtml(domain);
-            const domainLiteral = JSON.stringify(String(domain || '')).replace(/"/g, '&quot;');
-            const selectedSld = extractSld(domain);
-
-            document.querySelector('main').innerHTML =
-                '<div class="card-actions">' +
-                '<button class="help-button" type="button" title="Lunker Help" onclick="toggleHelp()">?</button>' +
-                '<button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>' +
-                '<button class="logoff-button" type="button" title="Cognito Log Off" onclick="logOff()">X</button>' +
-                '</div>' +
-                '<img src="https://cdn.lukach.io/lunker.png" alt="Lunker Logo">' +
-                '<div style="text-align:center; margin: 8px 0 12px; line-height: 1.4;">' +
-                '<p style="margin:0;"><strong>Domain:</strong> ' + safeDomain + '</p>' +
-                '<p style="margin:4px 0 0;"><strong>Permutations:</strong> ' + String(Array.isArray(permutations) ? permutations.length : 0) + '</p>' +
-                '</div>' +
-                '<div style="text-align:center; margin: 0 0 12px;">' +
-                '<a class="btn-primary" href="#" onclick="showDomain(' + domainLiteral + '); return false;">Back</a>' +
-                '</div>' +
-                '<div class="domain-sections">' +
-                '<h3>Permutations</h3>' +
-                renderNumberedList(permutations || [], true, selectedSld) +
-                '</div>';
-        }}
-
-        async function showDomain(domain) {{
-            activeView = {{
-                name: 'domain',
-                domain,
-            }};
-            const [domainDetails, permutationTerms] = await Promise.all([
-                domainDetailsCache.get(domain) || fetchDomainSections(domain),
-                getDomainPermutationTerms(domain),
-            ]);
-            renderDomainView(domain, {{
-                ...domainDetails,
-                permutationTerms,
-            }});
-        }}
+                    <span>Step 1: Enter a Domain</span>
+                    In the Domain field, enter a second-level domain (for example: example.com), keep <b>Add</b> selected, then click <b>Submit</b>.
+                    <img src="https://cdn.lukach.io/help/add-domain.png" alt="Add Domain">
+                </li>
+                <li>
+                    <span>Step 2: Domain Validation Runs</span>
+                    Client-side validation runs before submit continues.
+                    <img src="https://cdn.lukach.io/help/domain-validation.png" alt="Domain Validation">
+                </li>
+                <li>
+                    <span>Step 3: Submission Failed Case</span>
+                    If backend validation fails, the app shows a failed submission result.
+                    <img src="https://cdn.lukach.io/help/submission-failed.png" alt="Submission Failed">
+                </li>
+                <li>
+                    <span>Step 4: Successful Add</span>
+                    If all checks pass, the domain is stored and success is shown.
+                    <img src="https://cdn.lukach.io/help/successful-add.png" alt="Successful Add">
+                </li>
+            </ol>
 
-        async function showPermutations(domain) {{
-            activeView = {{
-                name: 'permutations',
-                domain,
-            }};
-            let permutations = domainPermutationsCache.get(domain);
-            if (!permutations) {{
-                permutations = await fetchDomainPermutations(domain);
-                domainPermutationsCache.set(domain, permutations);
-            }}
+            <h4>Domain Validation On Submit</h4>
+            <ul class="help-rules">
+                <li>Domain is required (cannot be empty).</li>
+                <li>Must include one dot and exactly two labels (example.com format).</li>
+                <li>No subdomains are allowed.</li>
+                <li>Second-level label regex: starts/ends alphanumeric, dashes allowed only inside.</li>
+                <li>Top-level label regex: 2-63 chars using alphanumeric or dash.</li>
+                <li>Entry is normalized to lowercase and trimmed.</li>
+            </ul>
 
-            renderPermutationsView(domain, permutations);
-        }}
+            <h4>Validation That Produces Submission Failed</h4>
+            <ul class="help-rules">
+                <li>Client-side validation rules above fail.</li>
+                <li>User email cannot be resolved from token (unknown identity).</li>
+                <li>Top-level domain is not found in the TLD table.</li>
+                <li>POST request returns non-OK HTTP status.</li>
+                <li>Network or runtime fetch error during submit.</li>
+            </ul>
 
-        function renderPossibilitiesView(domain, possibilities, permutationTerms = []) {{
-            const safeDomain = escapeHtml(domain);
-            const domainLiteral = JSON.stringify(String(domain || '')).replace(/"/g, '&quot;');
-            const selectedSld = extractSld(domain);
-
-            document.querySelector('main').innerHTML =
-                '<div class="card-actions">' +
-                '<button class="help-button" type="button" title="Lunker Help" onclick="toggleHelp()">?</button>' +
-                '<button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>' +
-                '<button class="logoff-button" type="button" title="Cognito Log Off" onclick="logOff()">X</button>' +
-                '</div>' +
-                '<img src="https://cdn.lukach.io/lunker.png" alt="Lunker Logo">' +
-                '<div style="text-align:center; margin: 8px 0 12px; line-height: 1.4;">' +
-                '<p style="margin:0;"><strong>Domain:</strong> ' + safeDomain + '</p>' +
-                '<p style="margin:4px 0 0;"><strong>Possibilities:</strong> ' + String(Array.isArray(possibilities) ? possibilities.length : 0) + '</p>' +
-                '</div>' +
-                '<div style="text-align:center; margin: 0 0 12px;">' +
-                '<a class="btn-primary" href="#" onclick="showDomain(' + domainLiteral + '); return false;">Back</a>' +
-                '</div>' +
-                '<div class="domain-sections">' +
-                '<h3>Possibilities</h3>' +
-                renderNumberedList(possibilities || [], true, selectedSld, permutationTerms) +
-                '</div>';
-        }}
+            <h3>Remove Domain</h3>
+            <ol class="help-steps">
+                <li>
+                    <span>Step 1: Select Remove and Submit</span>
+                    Enter an existing domain, select <b>Remove</b>, then click <b>Submit</b>.
+                    <img src="https://cdn.lukach.io/help/remove-domain.png" alt="Remove Domain">
+                </li>
+                <li>
+                    <span>Step 2: Successful Delete</span>
+                    If the request succeeds, the domain is removed and a success result is shown.
+                    <img src="https://cdn.lukach.io/help/successful-delete.png" alt="Successful Delete">
+                </li>
+            </ol>
+            <div style="text-align:center">
+                <button class="help-close" type="button" onclick="closeHelp()">Close</button>
+            </div>
+        </div>
+    </section>
+    <main>
+        <div class="card-actions">
+            <button class="help-button" type="button" title="Lunker Help" onclick="toggleHelp()">?</button>
+            <button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>
+            <button class="logoff-button" type="button" title="Cognito Log Off" onclick="logOff()">X</button>
+        </div>
+        <img src="https://cdn.lukach.io/lunker.png" alt="Lunker Logo">
 
-        async function showPossibilities(domain) {{
-            activeView = {{
-                name: 'possibilities',
-                domain,
-            }};
-            let possibilities = domainPossibilitiesCache.get(domain);
-            if (!possibilities) {{
-                possibilities = await fetchDomainPossibilities(domain);
-                domainPossibilitiesCache.set(domain, possibilities);
-            }}
+        <div class="identity">
+            <strong>Email:</strong> {safe_email}<br>
+            <strong>Region:</strong> {safe_region}
+        </div>
 
-            const permutationTerms = await getDomainPermutationTerms(domain);
+        <form id="home-form">
+            <label for="entry">Domain</label>
+            <input id="entry" name="entry" type="text" required>
 
-            renderPossibilitiesView(domain, possibilities, permutationTerms);
-        }}
+            <div class="options">
+                <label><input type="radio" name="action" value="PutItem" checked> Add</label>
+                <label><input type="radio" name="action" value="DeleteItem"> Remove</label>
+            </div>
 
-        function toggleHelp() {{
-            const modal = document.getElementById('lunker-help');
-            modal.classList.toggle('open');
-            document.body.classList.toggle('modal-open', modal.classList.contains('open'));
-        }}
+            <p id="entry-print"></p>
 
-        function closeHelp() {{
-            const modal = document.getElementById('lunker-help');
-            modal.classList.remove('open');
-            document.body.classList.remove('modal-open');
-        }}
+            <div class="actions">
+                <button class="btn-primary" type="button" onclick="submitHomeForm()">Submit</button>
+            </div>
 
-        function logOff() {{
-            window.location.href = '{LOGOUT_ENDPOINT}';
-        }}
+            {domains_section}
+        </form>
+    </main>
 
-        window.addEventListener('click', function(event) {{
-            const modal = document.getElementById('lunker-help');
-            if (event.target === modal) {{
-                closeHelp();
-            }}
-        }});
+    <script>
+        var lunkerAuthHeader = {auth_header_json};
+        var initialDomains = {domains_json};
+        var initialMatchedSlds = {matched_slds_json};
+        var highlightsPending = {highlights_pending_json};
+        var initialDomainsETag = {domains_etag_json};
     </script>
+    <script src="{form_script_url}"></script>
 </body>
-</html>'''
+</html>''')
 
 
 def _render_result(message, success=True, authorization_header='', operation='submission'):
@@ -2250,6 +2283,8 @@ def _render_result(message, success=True, authorization_header='', operation='su
     message_color = '#166534' if success else '#b42318'
     auth_header_json = json.dumps(authorization_header)
     refresh_button = '' if success else '            <button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>\n'
+    result_css_url = _static_asset_url('result_css')
+    result_script_url = _static_asset_url('result_script')
 
     return f'''<!DOCTYPE html>
 <html lang="en">
@@ -2257,208 +2292,7 @@ def _render_result(message, success=True, authorization_header='', operation='su
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Gone Fishing!</title>
-    <style>
-        body {{
-            font-family: sans-serif;
-            margin: 0;
-            background: #f4f7fb;
-            color: #10233c;
-        }}
-
-        main {{
-            position: relative;
-            max-width: 540px;
-            margin: 48px auto;
-            padding: 32px;
-            background: #ffffff;
-            border-radius: 16px;
-            box-shadow: 0 18px 40px rgba(16, 35, 60, 0.12);
-            text-align: center;
-        }}
-
-        img {{
-            display: block;
-            margin: 0 auto 16px;
-            max-width: 220px;
-        }}
-
-        dl {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 12px;
-            text-align: left;
-            margin-top: 24px;
-        }}
-
-        dt {{
-            font-weight: 700;
-        }}
-
-        a {{
-            display: inline-block;
-            margin-top: 24px;
-            border: 0;
-            border-radius: 999px;
-            background: #0e7490;
-            color: #ffffff;
-            cursor: pointer;
-            font-size: 1rem;
-            padding: 12px 28px;
-            text-decoration: none;
-        }}
-
-        .card-actions {{
-            position: absolute;
-            top: 16px;
-            right: 16px;
-            display: flex;
-            gap: 8px;
-        }}
-
-        .help-button {{
-            width: 34px;
-            height: 34px;
-            border: 1px solid #cbd5e1;
-            border-radius: 50%;
-            background: #ffffff;
-            color: #10233c;
-            font-size: 1rem;
-            font-weight: 700;
-            line-height: 1;
-            cursor: pointer;
-        }}
-
-        .help-button:hover {{
-            background: #f8fafc;
-        }}
-
-        .logoff-button {{
-            width: 34px;
-            height: 34px;
-            border: 1px solid #cbd5e1;
-            border-radius: 50%;
-            background: #ffffff;
-            color: #10233c;
-            font-size: 0.95rem;
-            font-weight: 700;
-            line-height: 1;
-            cursor: pointer;
-        }}
-
-        .logoff-button:hover {{
-            background: #f8fafc;
-        }}
-
-        .refresh-button {{
-            width: 34px;
-            height: 34px;
-            border: 1px solid #cbd5e1;
-            border-radius: 50%;
-            background: #ffffff;
-            color: #10233c;
-            font-size: 1rem;
-            font-weight: 700;
-            line-height: 1;
-            cursor: pointer;
-        }}
-
-        .refresh-button:hover {{
-            background: #f8fafc;
-        }}
-
-        .help-modal-overlay {{
-            position: fixed;
-            inset: 0;
-            display: none;
-            align-items: center;
-            justify-content: center;
-            background: rgba(16, 35, 60, 0.45);
-            padding: 16px;
-            z-index: 1000;
-        }}
-
-        .help-modal-overlay.open {{
-            display: flex;
-        }}
-
-        .help-modal {{
-            width: min(420px, 100%);
-            padding: 18px 18px 14px;
-            border: 1px solid #dbe4ee;
-            border-radius: 14px;
-            background: #ffffff;
-            box-shadow: 0 18px 36px rgba(16, 35, 60, 0.2);
-            text-align: left;
-            max-height: 80vh;
-            overflow-y: auto;
-        }}
-
-        .help-modal h2 {{
-            margin: 0 0 12px;
-            font-size: 1rem;
-        }}
-
-        .help-modal h3 {{
-            margin: 14px 0 8px;
-            font-size: 0.98rem;
-            color: #10233c;
-        }}
-
-        .help-modal h4 {{
-            margin: 12px 0 8px;
-            font-size: 0.92rem;
-            color: #10233c;
-        }}
-
-        .help-steps {{
-            margin: 0;
-            padding-left: 20px;
-            color: #486581;
-            font-size: 0.92rem;
-        }}
-
-        .help-rules {{
-            margin: 0;
-            padding-left: 20px;
-            color: #486581;
-            font-size: 0.9rem;
-        }}
-
-        .help-rules li {{
-            margin-bottom: 8px;
-        }}
-
-        .help-steps li {{
-            margin-bottom: 12px;
-        }}
-
-        .help-steps span {{
-            display: block;
-            margin-bottom: 6px;
-            font-weight: 600;
-            color: #10233c;
-        }}
-
-        .help-steps img {{
-            display: block;
-            max-width: 100%;
-            border-radius: 8px;
-            border: 1px solid #dbe4ee;
-            margin: 0;
-        }}
-
-        .help-close {{
-            display: inline-block;
-            margin-top: 12px;
-            border: 0;
-            border-radius: 999px;
-            background: #0e7490;
-            color: #ffffff;
-            font-size: 1rem;
-            padding: 12px 28px;
-            cursor: pointer;
-        }}
-    </style>
+    <link rel="stylesheet" href="{result_css_url}">
 </head>
 <body>
     <section id="lunker-help" class="help-modal-overlay" aria-hidden="true" aria-live="polite">
@@ -2537,88 +2371,1694 @@ def _render_result(message, success=True, authorization_header='', operation='su
         <a href="#" onclick="goHome(); return false;">Back</a>
     </main>
     <script>
-        function showRefreshError(message) {{
-            const existing = document.getElementById('refresh-error-banner');
-            if (existing) {{
-                existing.remove();
-            }}
+        var lunkerAuthHeader = {auth_header_json};
+    </script>
+    <script src="{result_script_url}"></script>
+</body>
+</html>'''
 
-            const banner = document.createElement('div');
-            banner.id = 'refresh-error-banner';
-            banner.style.margin = '12px auto 0';
-            banner.style.maxWidth = '540px';
-            banner.style.padding = '10px 12px';
-            banner.style.border = '1px solid #f5c2c7';
-            banner.style.borderRadius = '10px';
-            banner.style.background = '#fff5f5';
-            banner.style.color = '#b42318';
-            banner.style.fontSize = '0.92rem';
-            banner.textContent = message || 'Failed to load home view. Please try again.';
-
-            const main = document.querySelector('main');
-            if (main && main.parentNode) {{
-                main.parentNode.insertBefore(banner, main);
-            }}
+
+def _build_form_css():
+    return '''body {
+    font-family: sans-serif;
+    margin: 0;
+    background: #f4f7fb;
+    color: #10233c;
+}
+
+body.modal-open {
+    overflow: hidden;
+}
+
+main {
+    position: relative;
+    max-width: 540px;
+    margin: 48px auto;
+    padding: 32px;
+    background: #ffffff;
+    border-radius: 16px;
+    box-shadow: 0 18px 40px rgba(16, 35, 60, 0.12);
+}
+
+img {
+    display: block;
+    margin: 0 auto 16px;
+    max-width: 220px;
+}
+
+h1 {
+    margin: 0 0 8px;
+    text-align: center;
+}
+
+p {
+    margin: 0 0 24px;
+    text-align: center;
+}
+
+.identity {
+    margin: 0 0 24px;
+    padding: 12px 14px;
+    border: 1px solid #c6d3e1;
+    border-radius: 10px;
+    background: #f8fbff;
+    text-align: left;
+    line-height: 1.5;
+}
+
+label {
+    display: block;
+    font-weight: 600;
+    margin-bottom: 8px;
+}
+
+input[type="text"],
+input[type="password"] {
+    width: 100%;
+    padding: 12px;
+    margin-bottom: 18px;
+    border: 1px solid #c6d3e1;
+    border-radius: 10px;
+    box-sizing: border-box;
+}
+
+.options {
+    display: flex;
+    gap: 18px;
+    margin-bottom: 24px;
+}
+
+.actions {
+    text-align: center;
+}
+
+.domains {
+    margin-top: 24px;
+    text-align: left;
+    border-top: 1px solid #dbe5f0;
+    padding-top: 16px;
+}
+
+.domains h2 {
+    margin: 0 0 10px;
+    font-size: 1rem;
+}
+
+.domains ul {
+    margin: 0;
+    padding-left: 20px;
+}
+
+.domains li {
+    margin-bottom: 6px;
+}
+
+.domains a {
+    color: #0e7490;
+    text-decoration: none;
+}
+
+.domains a.matched-domain {
+    font-weight: 800;
+}
+
+.domains a:hover {
+    text-decoration: underline;
+}
+
+.inline-link {
+    color: #0e7490;
+    text-decoration: none;
+}
+
+.inline-link:hover {
+    text-decoration: underline;
+}
+
+.domains-empty {
+    margin: 0;
+    text-align: left;
+}
+
+.domain-sections {
+    margin-top: 24px;
+    border-top: 1px solid #dbe5f0;
+    padding-top: 16px;
+    text-align: left;
+}
+
+.domain-sections h3 {
+    margin: 16px 0 8px;
+    font-size: 1rem;
+    color: #10233c;
+}
+
+.domain-sections h3:first-child {
+    margin-top: 0;
+}
+
+.domain-sections h4 {
+    margin: 12px 0 8px;
+    font-size: 0.95rem;
+    font-weight: 400;
+    color: #10233c;
+    text-decoration: underline;
+}
+
+.domain-sections details.section-toggle {
+    margin: 10px 0;
+    border: 1px solid #dbe5f0;
+    border-radius: 8px;
+    background: #f8fafc;
+}
+
+.domain-sections details.section-toggle > summary {
+    cursor: pointer;
+    list-style: none;
+    padding: 10px 12px;
+    font-size: 0.95rem;
+    color: #10233c;
+    text-decoration: underline;
+    user-select: none;
+}
+
+.domain-sections details.section-toggle > summary::-webkit-details-marker {
+    display: none;
+}
+
+.domain-sections details.section-toggle > summary::before {
+    content: '+';
+    display: inline-block;
+    width: 16px;
+    margin-right: 8px;
+    font-size: 1rem;
+    font-weight: 700;
+    line-height: 1;
+    text-align: center;
+    color: #0e7490;
+}
+
+.domain-sections details.section-toggle[open] > summary::before {
+    content: '-';
+}
+
+.domain-sections details.section-toggle > ul,
+.domain-sections details.section-toggle > ol {
+    margin: 0 0 12px;
+    padding-left: 34px;
+    padding-right: 12px;
+}
+
+.domain-sections .section-header-alert {
+    color: #ff0000;
+}
+
+.domain-sections .section-header-warning {
+    color: #ff8c00;
+}
+
+.domain-sections ul {
+    margin: 0;
+    padding-left: 20px;
+}
+
+.domain-sections ol {
+    margin: 0;
+    padding-left: 20px;
+}
+
+.domain-sections li {
+    margin-bottom: 6px;
+}
+
+.domains .attention-text,
+.domain-sections .attention-text {
+    color: #ff8c00;
+    font-weight: 800;
+}
+
+.domains .exact-sld-text,
+.domain-sections .exact-sld-text {
+    color: #ff0000;
+    font-weight: 800;
+}
+
+.btn-primary {
+    display: inline-block;
+    margin-top: 16px;
+    border: 0;
+    border-radius: 999px;
+    background: #0e7490;
+    color: #ffffff;
+    cursor: pointer;
+    font-size: 1rem;
+    padding: 12px 28px;
+    text-decoration: none;
+}
+
+.actions .btn-primary {
+    margin-top: 0;
+}
+
+.card-actions {
+    position: absolute;
+    top: 16px;
+    right: 16px;
+    display: flex;
+    gap: 8px;
+}
+
+.help-button {
+    width: 34px;
+    height: 34px;
+    border: 1px solid #cbd5e1;
+    border-radius: 50%;
+    background: #ffffff;
+    color: #10233c;
+    font-size: 1rem;
+    font-weight: 700;
+    line-height: 1;
+    cursor: pointer;
+}
+
+.help-button:hover {
+    background: #f8fafc;
+}
+
+.logoff-button {
+    width: 34px;
+    height: 34px;
+    border: 1px solid #cbd5e1;
+    border-radius: 50%;
+    background: #ffffff;
+    color: #10233c;
+    font-size: 0.95rem;
+    font-weight: 700;
+    line-height: 1;
+    cursor: pointer;
+}
+
+.logoff-button:hover {
+    background: #f8fafc;
+}
+
+.refresh-button {
+    width: 34px;
+    height: 34px;
+    border: 1px solid #cbd5e1;
+    border-radius: 50%;
+    background: #ffffff;
+    color: #10233c;
+    font-size: 0.95rem;
+    font-weight: 700;
+    line-height: 1;
+    cursor: pointer;
+}
+
+.refresh-button:hover {
+    background: #f8fafc;
+}
+
+.help-modal-overlay {
+    position: fixed;
+    inset: 0;
+    display: none;
+    align-items: center;
+    justify-content: center;
+    background: rgba(16, 35, 60, 0.45);
+    padding: 16px;
+    z-index: 1000;
+}
+
+.help-modal-overlay.open {
+    display: flex;
+}
+
+.help-modal {
+    width: min(420px, 100%);
+    padding: 18px 18px 14px;
+    border: 1px solid #dbe4ee;
+    border-radius: 14px;
+    background: #ffffff;
+    box-shadow: 0 18px 36px rgba(16, 35, 60, 0.2);
+    text-align: left;
+    max-height: 80vh;
+    overflow-y: auto;
+}
+
+.help-modal h2 {
+    margin: 0 0 12px;
+    font-size: 1rem;
+}
+
+.help-modal h3 {
+    margin: 14px 0 8px;
+    font-size: 0.98rem;
+    color: #10233c;
+}
+
+.help-modal h4 {
+    margin: 12px 0 8px;
+    font-size: 0.92rem;
+    color: #10233c;
+}
+
+.help-steps {
+    margin: 0;
+    padding-left: 20px;
+    color: #486581;
+    font-size: 0.92rem;
+}
+
+.help-rules {
+    margin: 0;
+    padding-left: 20px;
+    color: #486581;
+    font-size: 0.9rem;
+}
+
+.help-rules li {
+    margin-bottom: 8px;
+}
+
+.help-steps li {
+    margin-bottom: 12px;
+}
+
+.help-steps span {
+    display: block;
+    margin-bottom: 6px;
+    font-weight: 600;
+    color: #10233c;
+}
+
+.help-steps img {
+    display: block;
+    max-width: 100%;
+    border-radius: 8px;
+    border: 1px solid #dbe4ee;
+    margin: 0;
+}
+
+.help-close {
+    display: inline-block;
+    margin-top: 12px;
+    border: 0;
+    border-radius: 999px;
+    background: #0e7490;
+    color: #ffffff;
+    font-size: 1rem;
+    padding: 12px 28px;
+    cursor: pointer;
+}
+'''
+
+
+def _build_form_script():
+    return f'''function validateDomain(domain) {{
+    const issues = [];
+    if (!domain) {{
+        issues.push('Domain is required.');
+        return issues;
+    }}
+
+    const labels = domain.split('.');
+    if (labels.length < 2 || (labels.length === 2 && labels[1] === '')) {{
+        issues.push('Domain must include a single dot (e.g. example.com).');
+        return issues;
+    }}
+    if (labels.length !== 2) {{
+        issues.push('Domain must contain exactly one dot (no subdomains allowed).');
+        return issues;
+    }}
+
+    const sldPattern = /^[a-z0-9](?:[a-z0-9-]{{0,61}}[a-z0-9])?$/;
+    const tldPattern = /^[a-z0-9-]{{2,63}}$/;
+    const sld = labels[0];
+    const tld = labels[1];
+
+    if (!sldPattern.test(sld)) {{
+        issues.push('Invalid second-level domain.');
+    }}
+
+    if (!tldPattern.test(tld)) {{
+        issues.push('Invalid top-level domain format.');
+    }}
+
+    return issues;
+}}
+
+var activeView = {{
+    name: 'home',
+    domain: ''
+}};
+var refreshInFlight = false;
+var refreshRequested = false;
+var homeMainHtml = document.querySelector('main').innerHTML;
+var homeDomains = initialDomains;
+var homeMatchedSlds = initialMatchedSlds;
+var homeDomainsETag = initialDomainsETag;
+var domainSectionsAbortController = null;
+var domainPermutationsAbortController = null;
+
+function setRefreshButtonsDisabled(disabled) {{
+    document.querySelectorAll('.refresh-button').forEach((button) => {{
+        button.disabled = Boolean(disabled);
+        button.style.opacity = disabled ? '0.6' : '1';
+        button.style.cursor = disabled ? 'not-allowed' : 'pointer';
+    }});
+}}
+
+function showRefreshError(message) {{
+    const existing = document.getElementById('refresh-error-banner');
+    if (existing) {{
+        existing.remove();
+    }}
+
+    const banner = document.createElement('div');
+    banner.id = 'refresh-error-banner';
+    banner.style.margin = '12px 0 0';
+    banner.style.padding = '10px 12px';
+    banner.style.border = '1px solid #f5c2c7';
+    banner.style.borderRadius = '10px';
+    banner.style.background = '#fff5f5';
+    banner.style.color = '#b42318';
+    banner.style.fontSize = '0.92rem';
+    banner.textContent = message || 'Refresh failed. Please try again.';
+
+    const main = document.querySelector('main');
+    if (main) {{
+        main.prepend(banner);
+    }}
+}}
+
+async function loadMatchedDomains() {{
+    // Main-list highlighting is now rendered server-side to avoid extra network latency.
+    return;
+}}
+
+async function submitHomeForm() {{
+    const form = document.getElementById('home-form');
+    const formData = new FormData(form);
+    const action = formData.get('action');
+    const entry = formData.get('entry');
+    const normalizedEntry = (entry || '').trim().toLowerCase();
+    const entryPrint = document.getElementById('entry-print');
+    const authHeader = lunkerAuthHeader;
+
+    document.getElementById('entry').value = normalizedEntry;
+    const issues = validateDomain(normalizedEntry);
+    if (issues.length > 0) {{
+        entryPrint.style.color = '#b42318';
+        entryPrint.innerHTML = issues.join('<br>');
+        return;
+    }}
+
+    entryPrint.style.color = '#166534';
+    entryPrint.textContent = 'Submitting…';
+
+    try {{
+        const response = await fetch('{API_ENDPOINT}', {{
+            method: 'POST',
+            headers: {{
+                'Content-Type': 'application/json',
+                'Authorization': authHeader || ''
+            }},
+            body: JSON.stringify({{ action, entry: normalizedEntry }})
+        }});
+
+        if (!response.ok) {{
+            entryPrint.style.color = '#b42318';
+            entryPrint.textContent = 'Submission failed: HTTP ' + response.status;
+            return;
         }}
 
-        async function goHome() {{
-            try {{
-                const authHeader = {auth_header_json} || '';
-                const response = await fetch('{API_ENDPOINT}', {{
-                    method: 'GET',
-                    credentials: 'include',
-                    cache: 'no-store',
-                    headers: authHeader ? {{ 'Authorization': authHeader }} : {{}}
-                }});
-
-                if (!response.ok || response.redirected) {{
-                    throw new Error('Home reload was redirected or failed: ' + response.status);
-                }}
+        const responseHtml = await response.text();
+        document.open();
+        document.write(responseHtml);
+        document.close();
+    }} catch (err) {{
+        entryPrint.style.color = '#b42318';
+        entryPrint.textContent = 'Submission failed: ' + err.message;
+    }}
+}}
+
+function renderDomainsSection(domains, matchedSlds) {{
+    if (!Array.isArray(domains) || domains.length === 0) {{
+        return '<h2>Domains</h2><ul><li>Empty!</li></ul>';
+    }}
+
+    const matched = new Set(matchedSlds || []);
+    const items = domains.map(domain => {{
+        const safeDomain = escapeHtml(domain);
+        const cssClass = matched.has(extractSld(domain)) ? ' class="matched-domain"' : '';
+        return '<li><a data-domain="' + safeDomain + '"' + cssClass + ' href="#" onclick="showDomain(\\'' + safeDomain + '\\'); return false;">' + safeDomain + '</a></li>';
+    }});
+    return '<h2>Domains</h2><ol>' + items.join('') + '</ol>';
+}}
+
+function renderHomeView() {{
+    const main = document.querySelector('main');
+    main.innerHTML = homeMainHtml;
+    const section = main.querySelector('section.domains');
+    if (section) {{
+        section.innerHTML = renderDomainsSection(homeDomains, homeMatchedSlds);
+    }}
+}}
+
+async function goHome() {{
+    activeView = {{
+        name: 'home',
+        domain: ''
+    }};
+    const authHeader = lunkerAuthHeader || '';
+    const headers = {{
+        'Content-Type': 'application/json',
+        'Authorization': authHeader
+    }};
+    if (homeDomainsETag) {{
+        headers['If-None-Match'] = homeDomainsETag;
+    }}
+
+    try {{
+        const r = await fetch('{API_ENDPOINT}', {{
+            method: 'POST',
+            cache: 'no-store',
+            headers: headers,
+            body: JSON.stringify({{ action: 'ListDomains' }})
+        }});
 
-                const responseHtml = await response.text();
-                document.open();
-                document.write(responseHtml);
-                document.close();
-            }} catch (err) {{
-                console.error('Failed to load home view.', err);
-                showRefreshError('Failed to load home view. Please try again.');
-            }}
+        // 304 means the watchlist and its highlights are unchanged; the page redraws from what it holds.
+        if (r.status === 304) {{
+            renderHomeView();
+            return;
+        }}
+
+        if (!r.ok) {{
+            throw new Error('Domain list refresh failed: ' + r.status);
+        }}
+
+        const payload = await r.json();
+        homeDomains = Array.isArray(payload.domains) ? payload.domains : [];
+        homeMatchedSlds = Array.isArray(payload.matchedSlds) ? payload.matchedSlds : [];
+        homeDomainsETag = r.headers.get('ETag') || '';
+        domainDetailsCache.clear();
+        domainPermutationsCache.clear();
+        domainPossibilitiesCache.clear();
+        renderHomeView();
+
+        domainDetailsPrefetch = prefetchDomainDetails(homeDomains);
+        if (payload.highlightsPending) {{
+            loadMatchedSlds(homeDomains);
+        }}
+    }} catch (err) {{
+        console.error('Failed to refresh home view.', err);
+        showRefreshError('Failed to refresh home view. Please try again.');
+    }}
+}}
+
+async function refreshCurrentView(event) {{
+    if (event) {{
+        event.preventDefault();
+        event.stopPropagation();
+    }}
+
+    if (refreshInFlight) {{
+        return;
+    }}
+
+    refreshInFlight = true;
+    refreshRequested = true;
+    setRefreshButtonsDisabled(true);
+
+    try {{
+        if (activeView.name === 'domain' && activeView.domain) {{
+            domainDetailsCache.delete(activeView.domain);
+            domainPermutationsCache.delete(activeView.domain);
+            domainPossibilitiesCache.delete(activeView.domain);
+            await showDomain(activeView.domain);
+            return;
+        }}
+
+        if (activeView.name === 'permutations' && activeView.domain) {{
+            domainPermutationsCache.delete(activeView.domain);
+            await showPermutations(activeView.domain);
+            return;
+        }}
+
+        if (activeView.name === 'possibilities' && activeView.domain) {{
+            domainPossibilitiesCache.delete(activeView.domain);
+            await showPossibilities(activeView.domain);
+            return;
+        }}
+
+        await goHome();
+    }} catch (err) {{
+        console.error('Refresh failed.', err);
+        showRefreshError('Refresh failed. Please try again.');
+    }} finally {{
+        refreshInFlight = false;
+        refreshRequested = false;
+        setRefreshButtonsDisabled(false);
+    }}
+}}
+
+function escapeHtml(value) {{
+    return String(value || '')
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;');
+}}
+
+function extractSld(value) {{
+    const normalized = normalizeDomainKey(value);
+    if (!normalized) {{
+        return '';
+    }}
+
+    return normalized.includes('.') ? normalized.split('.', 1)[0] : normalized;
+}}
+
+function containsSldMatch(item, matchSld) {{
+    const normalizedMatch = normalizeDomainKey(matchSld);
+    if (!normalizedMatch) {{
+        return false;
+    }}
+
+    const normalizedItem = normalizeDomainKey(item);
+    if (!normalizedItem) {{
+        return false;
+    }}
+
+    return normalizedItem.includes(normalizedMatch);
+}}
+
+function containsPermutationMatch(item, permutationTerms) {{
+    const normalizedItem = normalizeDomainKey(item);
+    if (!normalizedItem) {{
+        return false;
+    }}
+
+    return (Array.isArray(permutationTerms) ? permutationTerms : []).some(term => {{
+        const normalizedTerm = normalizeDomainKey(term);
+        return normalizedTerm && normalizedItem.includes(normalizedTerm);
+    }});
+}}
+
+function markSubstringMatches(styleMap, normalizedText, term, styleCode) {{
+    const normalizedTerm = normalizeDomainKey(term);
+    if (!normalizedTerm) {{
+        return;
+    }}
+
+    let startIndex = 0;
+    while (startIndex < normalizedText.length) {{
+        const matchIndex = normalizedText.indexOf(normalizedTerm, startIndex);
+        if (matchIndex === -1) {{
+            break;
+        }}
+
+        const endIndex = matchIndex + normalizedTerm.length;
+        for (let idx = matchIndex; idx < endIndex; idx += 1) {{
+            styleMap[idx] = Math.max(styleMap[idx], styleCode);
+        }}
+
+        startIndex = endIndex;
+    }}
+}}
+
+function highlightDomainSubstrings(item, exactTerms, permutationTerms) {{
+    const rawText = String(item || '');
+    const normalizedText = rawText.toLowerCase();
+    if (!rawText) {{
+        return '';
+    }}
+
+    const styleMap = new Array(rawText.length).fill(0);
+    const safePermutationTerms = Array.isArray(permutationTerms) ? permutationTerms : [];
+
+    safePermutationTerms
+        .map(term => normalizeDomainKey(term))
+        .filter(term => term)
+        .sort((a, b) => b.length - a.length)
+        .forEach(term => markSubstringMatches(styleMap, normalizedText, term, 1));
+
+    const safeExactTerms = (Array.isArray(exactTerms) ? exactTerms : [exactTerms])
+        .map(term => normalizeDomainKey(term))
+        .filter(term => term)
+        .sort((a, b) => b.length - a.length);
+    safeExactTerms.forEach(term => markSubstringMatches(styleMap, normalizedText, term, 2));
+
+    if (!styleMap.some(value => value > 0)) {{
+        return escapeHtml(rawText);
+    }}
+
+    let output = '';
+    let segmentStart = 0;
+    while (segmentStart < rawText.length) {{
+        const styleCode = styleMap[segmentStart];
+        let segmentEnd = segmentStart + 1;
+        while (segmentEnd < rawText.length && styleMap[segmentEnd] === styleCode) {{
+            segmentEnd += 1;
+        }}
+
+        const segmentText = escapeHtml(rawText.slice(segmentStart, segmentEnd));
+        if (styleCode === 2) {{
+            output += '<span class="exact-sld-text">' + segmentText + '</span>';
+        }} else if (styleCode === 1) {{
+            output += '<span class="attention-text">' + segmentText + '</span>';
+        }} else {{
+            output += segmentText;
+        }}
+
+        segmentStart = segmentEnd;
+    }}
+
+    return output;
+}}
+
+function renderNumberedList(items, emphasize = false, matchSld = '', permutationTerms = []) {{
+    if (!Array.isArray(items) || items.length === 0) {{
+        return '<ul><li>Empty!</li></ul>';
+    }}
+
+    return '<ol>' + renderNumberedRows(items, emphasize, matchSld, permutationTerms) + '</ol>';
+}}
+
+function renderNumberedRows(items, emphasize = false, matchSld = '', permutationTerms = []) {{
+    return items
+        .map(item => {{
+            const hasExactMatch = containsSldMatch(item, matchSld);
+            const hasPermutationMatch = containsPermutationMatch(item, permutationTerms);
+            const highlightItem = emphasize && (hasExactMatch || hasPermutationMatch);
+            const rowExactTerms = hasExactMatch ? [matchSld] : [];
+            return '<li>' + (highlightItem ? highlightDomainSubstrings(item, rowExactTerms, permutationTerms) : escapeHtml(item)) + '</li>';
+        }})
+        .join('');
+}}
+
+function normalizeDomainKey(value) {{
+    return String(value || '').trim().toLowerCase();
+}}
+
+function dedupeByPriority(section) {{
+    const safeSection = section || {{}};
+    const seen = new Set();
+    const filterBySeen = (items) => (Array.isArray(items) ? items : []).filter(item => {{
+        const key = normalizeDomainKey(item);
+        if (!key || seen.has(key)) {{
+            return false;
+        }}
+        seen.add(key);
+        return true;
+    }});
+
+    return {{
+        daily: filterBySeen(safeSection.daily),
+        weekly: filterBySeen(safeSection.weekly),
+        monthly: filterBySeen(safeSection.monthly),
+    }};
+}}
+
+function formatSectionHeader(label, count, alertIfPositive = false) {{
+    const safeLabel = escapeHtml(label);
+    const safeCount = escapeHtml(String(count));
+    const text = safeLabel + ' - ' + safeCount;
+
+    if (alertIfPositive && count > 0) {{
+        return '<span class="section-header-alert"><strong>' + text + '</strong></span>';
+    }}
+
+    return text;
+}}
+
+function getHeaderHighlightLevel(items, matchSld, permutationTerms) {{
+    const safeItems = Array.isArray(items) ? items : [];
+    const hasExactSldMatch = safeItems.some(item => containsSldMatch(item, matchSld));
+    if (hasExactSldMatch) {{
+        return 'alert';
+    }}
+
+    const hasPermutationMatch = safeItems.some(item => containsPermutationMatch(item, permutationTerms));
+    if (hasPermutationMatch) {{
+        return 'warning';
+    }}
+
+    return 'none';
+}}
+
+function renderCollapsibleList(label, items, options = {{}}) {{
+    const safeItems = Array.isArray(items) ? items : [];
+    const count = safeItems.length;
+    const emphasizeRows = Boolean(options.emphasizeRows);
+    const alertIfPositive = Boolean(options.alertIfPositive);
+    const matchSld = extractSld(options.matchSld);
+    const permutationTerms = Array.isArray(options.permutationTerms) ? options.permutationTerms : [];
+    const headerHighlightLevel = getHeaderHighlightLevel(safeItems, matchSld, permutationTerms);
+    const shouldAlertHeader = alertIfPositive && count > 0 && headerHighlightLevel === 'alert';
+    const shouldWarnHeader = alertIfPositive && count > 0 && headerHighlightLevel === 'warning';
+    const baseHeader = formatSectionHeader(label, count, shouldAlertHeader);
+    const styledHeader = shouldWarnHeader
+        ? '<span class="section-header-warning"><strong>' + baseHeader + '</strong></span>'
+        : baseHeader;
+
+    return '<details class="section-toggle">' +
+        '<summary>' + styledHeader + '</summary>' +
+        renderNumberedList(safeItems, emphasizeRows, matchSld, permutationTerms) +
+        '</details>';
+}}
+
+function getEmptySections() {{
+    return {{
+        suspect: {{
+            openSourceIntelligence: [],
+            domainsMonitorSubscription: []
+        }},
+        newRegistrations: {{
+            daily: [],
+            weekly: [],
+            monthly: []
+        }},
+        expiredRegistrations: {{
+            daily: [],
+            weekly: [],
+            monthly: []
+        }}
+    }};
+}}
+
+async function fetchDomainSections(domain) {{
+    const authHeader = lunkerAuthHeader;
+    const fallback = {{
+        sections: getEmptySections(),
+        permutations: 0,
+        possibilities: 0,
+        partial: true
+    }};
+
+    if (domainSectionsAbortController) {{
+        domainSectionsAbortController.abort();
+    }}
+    domainSectionsAbortController = new AbortController();
+    const requestController = domainSectionsAbortController;
+
+    try {{
+        const response = await fetch('{API_ENDPOINT}', {{
+            method: 'POST',
+            headers: {{
+                'Content-Type': 'application/json',
+                'Authorization': authHeader || ''
+            }},
+            signal: requestController.signal,
+            body: JSON.stringify({{ action: 'GetDomainSections', entry: domain, refresh: refreshRequested }})
+        }});
+
+        if (!response.ok) {{
+            return fallback;
+        }}
+
+        const payload = await response.json();
+        if (domainSectionsAbortController !== requestController) {{
+            return fallback;
+        }}
+        const permutations = Number(payload.permutations);
+        const possibilities = Number(payload.possibilities);
+        return {{
+            sections: payload.sections || fallback.sections,
+            permutations: Number.isFinite(permutations) ? permutations : 0,
+            possibilities: Number.isFinite(possibilities) ? possibilities : 0,
+            partial: Boolean(payload.partial)
+        }};
+    }} catch (err) {{
+        if (err && err.name === 'AbortError') {{
+            return fallback;
+        }}
+        return fallback;
+    }}
+}}
+
+async function fetchDomainPermutations(domain) {{
+    const authHeader = lunkerAuthHeader;
+
+    if (domainPermutationsAbortController) {{
+        domainPermutationsAbortController.abort();
+    }}
+    domainPermutationsAbortController = new AbortController();
+    const requestController = domainPermutationsAbortController;
+
+    try {{
+        const response = await fetch('{API_ENDPOINT}', {{
+            method: 'POST',
+            headers: {{
+                'Content-Type': 'application/json',
+                'Authorization': authHeader || ''
+            }},
+            signal: requestController.signal,
+            body: JSON.stringify({{ action: 'GetDomainPermutations', entry: domain, refresh: refreshRequested }})
+        }});
+
+        if (!response.ok) {{
+            return [];
+        }}
+
+        const payload = await response.json();
+        if (domainPermutationsAbortController !== requestController) {{
+            return [];
         }}
+        return Array.isArray(payload.permutations) ? payload.permutations : [];
+    }} catch (err) {{
+        if (err && err.name === 'AbortError') {{
+            return [];
+        }}
+        return [];
+    }}
+}}
+
+var domainPossibilitiesAbortController = null;
+
+var possibilitiesPageLimit = {POSSIBILITIES_PAGE_DEFAULT_LIMIT};
+
+var possibilitiesView = null;
+
+async function fetchDomainPossibilities(domain, next, refresh) {{
+    const authHeader = lunkerAuthHeader;
+
+    if (domainPossibilitiesAbortController) {{
+        domainPossibilitiesAbortController.abort();
+    }}
+    domainPossibilitiesAbortController = new AbortController();
+    const requestController = domainPossibilitiesAbortController;
+
+    const response = await fetch('{API_ENDPOINT}', {{
+        method: 'POST',
+        headers: {{
+            'Content-Type': 'application/json',
+            'Authorization': authHeader || ''
+        }},
+        signal: requestController.signal,
+        body: JSON.stringify({{ action: 'GetDomainPossibilities', entry: domain, limit: possibilitiesPageLimit, next, refresh }})
+    }});
+
+    if (!response.ok) {{
+        throw new Error('GetDomainPossibilities failed: ' + response.status);
+    }}
+
+    const payload = await response.json();
+    if (domainPossibilitiesAbortController !== requestController) {{
+        return null;
+    }}
+    return {{
+        possibilities: Array.isArray(payload.possibilities) ? payload.possibilities : [],
+        next: typeof payload.next === 'string' && payload.next ? payload.next : null,
+    }};
+}}
+
+var domainDetailsCache = new Map();
+var domainPermutationsCache = new Map();
+var domainPossibilitiesCache = new Map();
+var domainDetailsPrefetch = null;
+var domainDetailsPrefetchGeneration = 0;
+var domainDetailsInFlight = new Map();
+var domainDetailsChunkSize = {DOMAIN_DETAILS_PREFETCH_CHUNK_SIZE};
+
+function fetchDomainDetailsChunk(domains) {{
+    const authHeader = lunkerAuthHeader;
+    const request = (async () => {{
+        try {{
+            const response = await fetch('{API_ENDPOINT}', {{
+                method: 'POST',
+                headers: {{
+                    'Content-Type': 'application/json',
+                    'Authorization': authHeader || ''
+                }},
+                body: JSON.stringify({{ action: 'GetDomainSectionsBatch', domains: domains }})
+            }});
 
-        function refreshCurrentView(event) {{
-            if (event) {{
-                event.preventDefault();
-                event.stopPropagation();
+            if (!response.ok) {{
+                return;
             }}
 
-            goHome();
+            const payload = await response.json();
+            const details = payload.domains || {{}};
+            Object.keys(details).forEach(domain => {{
+                const entry = details[domain] || {{}};
+                const permutations = Number(entry.permutations);
+                const possibilities = Number(entry.possibilities);
+                // A partial entry stands for lookups that timed out, not for an empty domain.
+                if (!entry.partial && !domainDetailsCache.has(domain)) {{
+                    domainDetailsCache.set(domain, {{
+                        sections: entry.sections || getEmptySections(),
+                        permutations: Number.isFinite(permutations) ? permutations : 0,
+                        possibilities: Number.isFinite(possibilities) ? possibilities : 0
+                    }});
+                }}
+            }});
+        }} catch (err) {{
+            console.error('Failed to prefetch domain details.', err);
         }}
+    }})();
+
+    domains.forEach(domain => domainDetailsInFlight.set(domain, request));
+    return request.finally(() => {{
+        domains.forEach(domain => {{
+            if (domainDetailsInFlight.get(domain) === request) {{
+                domainDetailsInFlight.delete(domain);
+            }}
+        }});
+    }});
+}}
+
+async function prefetchDomainDetails(domains) {{
+    const generation = ++domainDetailsPrefetchGeneration;
+    const pending = (Array.isArray(domains) ? domains : []).filter(domain => !domainDetailsCache.has(domain));
 
-        function toggleHelp() {{
-            const modal = document.getElementById('lunker-help');
-            modal.classList.toggle('open');
-            document.body.classList.toggle('modal-open', modal.classList.contains('open'));
+    // Chunks go one at a time, so a click only ever waits for the chunk that holds its domain.
+    for (let idx = 0; idx < pending.length; idx += domainDetailsChunkSize) {{
+        if (generation !== domainDetailsPrefetchGeneration) {{
+            return;
         }}
 
-        function closeHelp() {{
-            const modal = document.getElementById('lunker-help');
-            modal.classList.remove('open');
-            document.body.classList.remove('modal-open');
+        const chunk = pending.slice(idx, idx + domainDetailsChunkSize).filter(domain => !domainDetailsCache.has(domain));
+        if (chunk.length > 0) {{
+            await fetchDomainDetailsChunk(chunk);
         }}
+    }}
+}}
+
+async function loadMatchedSlds(domains) {{
+    if (!Array.isArray(domains) || domains.length === 0) {{
+        return;
+    }}
+
+    const authHeader = lunkerAuthHeader;
+    try {{
+        const response = await fetch('{API_ENDPOINT}', {{
+            method: 'POST',
+            headers: {{
+                'Content-Type': 'application/json',
+                'Authorization': authHeader || ''
+            }},
+            body: JSON.stringify({{ action: 'GetMatchedSlds', domains: domains }})
+        }});
 
-        function logOff() {{
-            window.location.href = '{LOGOUT_ENDPOINT}';
+        if (!response.ok) {{
+            return;
         }}
 
-        window.addEventListener('click', function(event) {{
-            const modal = document.getElementById('lunker-help');
-            if (event.target === modal) {{
-                closeHelp();
+        const payload = await response.json();
+        homeMatchedSlds = Array.isArray(payload.matchedSlds) ? payload.matchedSlds : [];
+        const matchedSlds = new Set(homeMatchedSlds);
+        document.querySelectorAll('.domains a[data-domain]').forEach(link => {{
+            if (matchedSlds.has(extractSld(link.dataset.domain))) {{
+                link.classList.add('matched-domain');
             }}
         }});
-    </script>
-</body>
-</html>'''
+    }} catch (err) {{
+        console.error('Failed to load matched domains.', err);
+    }}
+}}
+
+function renderDomainView(domain, domainDetails) {{
+    const safeDomain = escapeHtml(domain);
+    const domainLiteral = JSON.stringify(String(domain || '')).replace(/"/g, '&quot;');
+    const selectedSld = extractSld(domain);
+    const permutationTerms = Array.isArray(domainDetails?.permutationTerms)
+        ? domainDetails.permutationTerms
+        : [];
+    const rawSections = domainDetails?.sections || getEmptySections();
+    const safeSections = {{
+        suspect: {{
+            openSourceIntelligence: Array.isArray(rawSections.suspect?.openSourceIntelligence)
+                ? rawSections.suspect.openSourceIntelligence
+                : [],
+            domainsMonitorSubscription: Array.isArray(rawSections.suspect?.domainsMonitorSubscription)
+                ? rawSections.suspect.domainsMonitorSubscription
+                : [],
+        }},
+        newRegistrations: dedupeByPriority(rawSections.newRegistrations),
+        expiredRegistrations: dedupeByPriority(rawSections.expiredRegistrations),
+    }};
+    const safePermutations = Number.isFinite(domainDetails?.permutations)
+        ? domainDetails.permutations
+        : 0;
+    const safePossibilities = Number.isFinite(domainDetails?.possibilities)
+        ? domainDetails.possibilities
+        : 0;
+
+    if (!domainDetails?.partial) {{
+        domainDetailsCache.set(domain, {{
+            sections: safeSections,
+            permutations: safePermutations,
+            possibilities: safePossibilities
+        }});
+    }}
+
+    document.querySelector('main').innerHTML =
+        '<div class="card-actions">' +
+        '<button class="help-button" type="button" title="Lunker Help" onclick="toggleHelp()">?</button>' +
+        '<button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>' +
+        '<button class="logoff-button" type="button" title="Cognito Log Off" onclick="logOff()">X</button>' +
+        '</div>' +
+        '<img src="https://cdn.lukach.io/lunker.png" alt="Lunker Logo">' +
+        '<div style="text-align:center; margin: 8px 0 12px; line-height: 1.4;">' +
+        '<p style="margin:0;"><strong>Domain:</strong> ' + safeDomain + '</p>' +
+        '<p style="margin:4px 0 0;"><strong>Permutations:</strong> <a class="inline-link" href="#" onclick="showPermutations(' + domainLiteral + '); return false;">' + String(safePermutations) + '</a></p>' +
+        '<p style="margin:4px 0 0;"><strong>Possibilities:</strong> <a class="inline-link" href="#" onclick="showPossibilities(' + domainLiteral + '); return false;">' + String(safePossibilities) + '</a></p>' +
+        '</div>' +
+        '<div style="text-align:center;">' +
+        '<a class="btn-primary" href="#" onclick="goHome(); return false;">Back</a>' +
+        '</div>' +
+        '<div class="domain-sections">' +
+        '<h3>Suspect Domains</h3>' +
+        renderCollapsibleList('Open Source Intelligence', safeSections.suspect?.openSourceIntelligence || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
+        renderCollapsibleList('Domains Monitor Subscription', safeSections.suspect?.domainsMonitorSubscription || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
+        '<h3>New Domains</h3>' +
+        renderCollapsibleList('Daily', safeSections.newRegistrations?.daily || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
+        renderCollapsibleList('Weekly', safeSections.newRegistrations?.weekly || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
+        renderCollapsibleList('Monthly', safeSections.newRegistrations?.monthly || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
+        '<h3>Expired Domains</h3>' +
+        renderCollapsibleList('Daily', safeSections.expiredRegistrations?.daily || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
+        renderCollapsibleList('Weekly', safeSections.expiredRegistrations?.weekly || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
+        renderCollapsibleList('Monthly', safeSections.expiredRegistrations?.monthly || [], {{ emphasizeRows: true, alertIfPositive: true, matchSld: selectedSld, permutationTerms }}) +
+        '</div>';
+}}
+
+async function getDomainPermutationTerms(domain) {{
+    let permutations = domainPermutationsCache.get(domain);
+    if (!permutations) {{
+        permutations = await fetchDomainPermutations(domain);
+        domainPermutationsCache.set(domain, permutations);
+    }}
+
+    return Array.isArray(permutations) ? permutations : [];
+}}
+
+function renderPermutationsView(domain, permutations) {{
+    const safeDomain = escapeHtml(domain);
+    const domainLiteral = JSON.stringify(String(domain || '')).replace(/"/g, '&quot;');
+    const selectedSld = extractSld(domain);
+
+    document.querySelector('main').innerHTML =
+        '<div class="card-actions">' +
+        '<button class="help-button" type="button" title="Lunker Help" onclick="toggleHelp()">?</button>' +
+        '<button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>' +
+        '<button class="logoff-button" type="button" title="Cognito Log Off" onclick="logOff()">X</button>' +
+        '</div>' +
+        '<img src="https://cdn.lukach.io/lunker.png" alt="Lunker Logo">' +
+        '<div style="text-align:center; margin: 8px 0 12px; line-height: 1.4;">' +
+        '<p style="margin:0;"><strong>Domain:</strong> ' + safeDomain + '</p>' +
+        '<p style="margin:4px 0 0;"><strong>Permutations:</strong> ' + String(Array.isArray(permutations) ? permutations.length : 0) + '</p>' +
+        '</div>' +
+        '<div style="text-align:center; margin: 0 0 12px;">' +
+        '<a class="btn-primary" href="#" onclick="showDomain(' + domainLiteral + '); return false;">Back</a>' +
+        '</div>' +
+        '<div class="domain-sections">' +
+        '<h3>Permutations</h3>' +
+        renderNumberedList(permutations || [], true, selectedSld) +
+        '</div>';
+}}
+
+async function showDomain(domain) {{
+    activeView = {{
+        name: 'domain',
+        domain,
+    }};
+    if (!domainDetailsCache.has(domain) && domainDetailsInFlight.has(domain)) {{
+        await domainDetailsInFlight.get(domain);
+    }}
+    const [domainDetails, permutationTerms] = await Promise.all([
+        domainDetailsCache.get(domain) || fetchDomainSections(domain),
+        getDomainPermutationTerms(domain),
+    ]);
+    renderDomainView(domain, {{
+        ...domainDetails,
+        permutationTerms,
+    }});
+}}
+
+async function showPermutations(domain) {{
+    activeView = {{
+        name: 'permutations',
+        domain,
+    }};
+    let permutations = domainPermutationsCache.get(domain);
+    if (!permutations) {{
+        permutations = await fetchDomainPermutations(domain);
+        domainPermutationsCache.set(domain, permutations);
+    }}
+
+    renderPermutationsView(domain, permutations);
+}}
+
+function renderPossibilitiesView(domain, view) {{
+    const safeDomain = escapeHtml(domain);
+    const domainLiteral = JSON.stringify(String(domain || '')).replace(/"/g, '&quot;');
+
+    document.querySelector('main').innerHTML =
+        '<div class="card-actions">' +
+        '<button class="help-button" type="button" title="Lunker Help" onclick="toggleHelp()">?</button>' +
+        '<button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>' +
+        '<button class="logoff-button" type="button" title="Cognito Log Off" onclick="logOff()">X</button>' +
+        '</div>' +
+        '<img src="https://cdn.lukach.io/lunker.png" alt="Lunker Logo">' +
+        '<div style="text-align:center; margin: 8px 0 12px; line-height: 1.4;">' +
+        '<p style="margin:0;"><strong>Domain:</strong> ' + safeDomain + '</p>' +
+        '<p style="margin:4px 0 0;"><strong>Possibilities:</strong> <span id="possibilities-count"></span></p>' +
+        '</div>' +
+        '<div style="text-align:center; margin: 0 0 12px;">' +
+        '<a class="btn-primary" href="#" onclick="showDomain(' + domainLiteral + '); return false;">Back</a>' +
+        '</div>' +
+        '<div class="domain-sections">' +
+        '<h3>Possibilities</h3>' +
+        '<ol id="possibilities-list"></ol>' +
+        '<div id="possibilities-status" style="text-align:center; margin: 12px 0 0;"></div>' +
+        '</div>';
+
+    appendPossibilities(view, view.items);
+}}
+
+function isPossibilitiesViewActive(view) {{
+    return possibilitiesView === view && activeView.name === 'possibilities' && activeView.domain === view.domain;
+}}
+
+function appendPossibilities(view, items) {{
+    // Rows are appended as pages arrive; rows already on the page are never rebuilt.
+    const list = document.getElementById('possibilities-list');
+    if (list && items.length > 0) {{
+        list.insertAdjacentHTML('beforeend', renderNumberedRows(items, true, extractSld(view.domain), view.permutationTerms));
+    }}
+    updatePossibilitiesStatus(view);
+}}
+
+function updatePossibilitiesStatus(view) {{
+    const count = document.getElementById('possibilities-count');
+    const status = document.getElementById('possibilities-status');
+    if (!count || !status) {{
+        return;
+    }}
+
+    count.textContent = String(view.items.length) + (view.complete ? '' : '+');
+    if (view.loading) {{
+        status.textContent = 'Loading…';
+    }} else if (view.failed) {{
+        status.innerHTML = 'Failed to load possibilities. <a class="inline-link" href="#" onclick="loadMorePossibilities(); return false;">Retry</a>';
+    }} else if (!view.complete) {{
+        status.innerHTML = '<a class="btn-primary" href="#" onclick="loadMorePossibilities(); return false;">Load more</a>';
+    }} else {{
+        status.textContent = view.items.length === 0 ? 'Empty!' : '';
+    }}
+}}
+
+async function loadMorePossibilities() {{
+    const view = possibilitiesView;
+    if (!view || view.loading || view.complete) {{
+        return;
+    }}
+
+    view.loading = true;
+    view.failed = false;
+    updatePossibilitiesStatus(view);
+
+    let page = null;
+    try {{
+        page = await fetchDomainPossibilities(view.domain, view.next, view.refresh);
+    }} catch (err) {{
+        if (!err || err.name !== 'AbortError') {{
+            console.error('Failed to load possibilities.', err);
+            view.failed = true;
+        }}
+    }}
+    view.loading = false;
+
+    if (page) {{
+        const fresh = page.possibilities.filter(value => !view.seen.has(value));
+        fresh.forEach(value => {{
+            view.seen.add(value);
+            view.items.push(value);
+        }});
+        view.next = page.next;
+        view.complete = !page.next;
+        if (view.complete) {{
+            // Only a fully loaded list is cached.
+            domainPossibilitiesCache.set(view.domain, view.items);
+        }}
+        if (isPossibilitiesViewActive(view)) {{
+            appendPossibilities(view, fresh);
+        }}
+        return;
+    }}
+
+    if (isPossibilitiesViewActive(view)) {{
+        updatePossibilitiesStatus(view);
+    }}
+}}
+
+async function showPossibilities(domain) {{
+    activeView = {{
+        name: 'possibilities',
+        domain,
+    }};
+    const permutationTerms = await getDomainPermutationTerms(domain);
+    if (activeView.name !== 'possibilities' || activeView.domain !== domain) {{
+        return;
+    }}
+
+    // Further pages load on demand, so a long list is never fetched or held unless the user asks for it.
+    const cached = domainPossibilitiesCache.get(domain);
+    const view = {{
+        domain,
+        permutationTerms,
+        items: cached ? cached.slice() : [],
+        seen: new Set(cached || []),
+        next: null,
+        complete: Boolean(cached),
+        loading: false,
+        failed: false,
+        refresh: refreshRequested,
+    }};
+    possibilitiesView = view;
+    renderPossibilitiesView(domain, view);
+
+    if (!cached) {{
+        await loadMorePossibilities();
+    }}
+}}
+
+function toggleHelp() {{
+    const modal = document.getElementById('lunker-help');
+    modal.classList.toggle('open');
+    document.body.classList.toggle('modal-open', modal.classList.contains('open'));
+}}
+
+function closeHelp() {{
+    const modal = document.getElementById('lunker-help');
+    modal.classList.remove('open');
+    document.body.classList.remove('modal-open');
+}}
+
+function logOff() {{
+    window.location.href = '{LOGOUT_ENDPOINT}';
+}}
+
+window.addEventListener('click', function(event) {{
+    const modal = document.getElementById('lunker-help');
+    if (event.target === modal) {{
+        closeHelp();
+    }}
+}});
+
+domainDetailsPrefetch = prefetchDomainDetails(initialDomains);
+if (highlightsPending) {{
+    loadMatchedSlds(initialDomains);
+}}
+'''
+
+
+def _build_result_css():
+    return '''body {
+    font-family: sans-serif;
+    margin: 0;
+    background: #f4f7fb;
+    color: #10233c;
+}
+
+main {
+    position: relative;
+    max-width: 540px;
+    margin: 48px auto;
+    padding: 32px;
+    background: #ffffff;
+    border-radius: 16px;
+    box-shadow: 0 18px 40px rgba(16, 35, 60, 0.12);
+    text-align: center;
+}
+
+img {
+    display: block;
+    margin: 0 auto 16px;
+    max-width: 220px;
+}
+
+dl {
+    display: grid;
+    grid-template-columns: 1fr 1fr;
+    gap: 12px;
+    text-align: left;
+    margin-top: 24px;
+}
+
+dt {
+    font-weight: 700;
+}
+
+a {
+    display: inline-block;
+    margin-top: 24px;
+    border: 0;
+    border-radius: 999px;
+    background: #0e7490;
+    color: #ffffff;
+    cursor: pointer;
+    font-size: 1rem;
+    padding: 12px 28px;
+    text-decoration: none;
+}
+
+.card-actions {
+    position: absolute;
+    top: 16px;
+    right: 16px;
+    display: flex;
+    gap: 8px;
+}
+
+.help-button {
+    width: 34px;
+    height: 34px;
+    border: 1px solid #cbd5e1;
+    border-radius: 50%;
+    background: #ffffff;
+    color: #10233c;
+    font-size: 1rem;
+    font-weight: 700;
+    line-height: 1;
+    cursor: pointer;
+}
+
+.help-button:hover {
+    background: #f8fafc;
+}
+
+.logoff-button {
+    width: 34px;
+    height: 34px;
+    border: 1px solid #cbd5e1;
+    border-radius: 50%;
+    background: #ffffff;
+    color: #10233c;
+    font-size: 0.95rem;
+    font-weight: 700;
+    line-height: 1;
+    cursor: pointer;
+}
+
+.logoff-button:hover {
+    background: #f8fafc;
+}
+
+.refresh-button {
+    width: 34px;
+    height: 34px;
+    border: 1px solid #cbd5e1;
+    border-radius: 50%;
+    background: #ffffff;
+    color: #10233c;
+    font-size: 1rem;
+    font-weight: 700;
+    line-height: 1;
+    cursor: pointer;
+}
+
+.refresh-button:hover {
+    background: #f8fafc;
+}
+
+.help-modal-overlay {
+    position: fixed;
+    inset: 0;
+    display: none;
+    align-items: center;
+    justify-content: center;
+    background: rgba(16, 35, 60, 0.45);
+    padding: 16px;
+    z-index: 1000;
+}
+
+.help-modal-overlay.open {
+    display: flex;
+}
+
+.help-modal {
+    width: min(420px, 100%);
+    padding: 18px 18px 14px;
+    border: 1px solid #dbe4ee;
+    border-radius: 14px;
+    background: #ffffff;
+    box-shadow: 0 18px 36px rgba(16, 35, 60, 0.2);
+    text-align: left;
+    max-height: 80vh;
+    overflow-y: auto;
+}
+
+.help-modal h2 {
+    margin: 0 0 12px;
+    font-size: 1rem;
+}
+
+.help-modal h3 {
+    margin: 14px 0 8px;
+    font-size: 0.98rem;
+    color: #10233c;
+}
+
+.help-modal h4 {
+    margin: 12px 0 8px;
+    font-size: 0.92rem;
+    color: #10233c;
+}
+
+.help-steps {
+    margin: 0;
+    padding-left: 20px;
+    color: #486581;
+    font-size: 0.92rem;
+}
+
+.help-rules {
+    margin: 0;
+    padding-left: 20px;
+    color: #486581;
+    font-size: 0.9rem;
+}
+
+.help-rules li {
+    margin-bottom: 8px;
+}
+
+.help-steps li {
+    margin-bottom: 12px;
+}
+
+.help-steps span {
+    display: block;
+    margin-bottom: 6px;
+    font-weight: 600;
+    color: #10233c;
+}
+
+.help-steps img {
+    display: block;
+    max-width: 100%;
+    border-radius: 8px;
+    border: 1px solid #dbe4ee;
+    margin: 0;
+}
+
+.help-close {
+    display: inline-block;
+    margin-top: 12px;
+    border: 0;
+    border-radius: 999px;
+    background: #0e7490;
+    color: #ffffff;
+    font-size: 1rem;
+    padding: 12px 28px;
+    cursor: pointer;
+}
+'''
+
+
+def _build_result_script():
+    return f'''function showRefreshError(message) {{
+    const existing = document.getElementById('refresh-error-banner');
+    if (existing) {{
+        existing.remove();
+    }}
+
+    const banner = document.createElement('div');
+    banner.id = 'refresh-error-banner';
+    banner.style.margin = '12px auto 0';
+    banner.style.maxWidth = '540px';
+    banner.style.padding = '10px 12px';
+    banner.style.border = '1px solid #f5c2c7';
+    banner.style.borderRadius = '10px';
+    banner.style.background = '#fff5f5';
+    banner.style.color = '#b42318';
+    banner.style.fontSize = '0.92rem';
+    banner.textContent = message || 'Failed to load home view. Please try again.';
+
+    const main = document.querySelector('main');
+    if (main && main.parentNode) {{
+        main.parentNode.insertBefore(banner, main);
+    }}
+}}
+
+async function goHome() {{
+    try {{
+        const authHeader = lunkerAuthHeader || '';
+        const response = await fetch('{API_ENDPOINT}', {{
+            method: 'GET',
+            credentials: 'include',
+            cache: 'no-store',
+            headers: authHeader ? {{ 'Authorization': authHeader }} : {{}}
+        }});
+
+        if (!response.ok || response.redirected) {{
+            throw new Error('Home reload was redirected or failed: ' + response.status);
+        }}
+
+        const responseHtml = await response.text();
+        document.open();
+        document.write(responseHtml);
+        document.close();
+    }} catch (err) {{
+        console.error('Failed to load home view.', err);
+        showRefreshError('Failed to load home view. Please try again.');
+    }}
+}}
+
+function refreshCurrentView(event) {{
+    if (event) {{
+        event.preventDefault();
+        event.stopPropagation();
+    }}
+
+    goHome();
+}}
+
+function toggleHelp() {{
+    const modal = document.getElementById('lunker-help');
+    modal.classList.toggle('open');
+    document.body.classList.toggle('modal-open', modal.classList.contains('open'));
+}}
+
+function closeHelp() {{
+    const modal = document.getElementById('lunker-help');
+    modal.classList.remove('open');
+    document.body.classList.remove('modal-open');
+}}
+
+function logOff() {{
+    window.location.href = '{LOGOUT_ENDPOINT}';
+}}
+
+window.addEventListener('click', function(event) {{
+    const modal = document.getElementById('lunker-help');
+    if (event.target === modal) {{
+        closeHelp();
+    }}
+}});
+'''
 
 
 def create_handler(api_endpoint, logout_endpoint, user_info_endpoint):
@@ -2645,12 +4085,22 @@ def create_handler(api_endpoint, logout_endpoint, user_info_endpoint):
     return configured_handler
 
 
+def _bypass_cache(payload):
+    return payload.get('refresh') is True
+
+
 def _handle_request(event, _context):
     print(_sanitize_event_for_logging(event))
+    print(f'Cache stats: {json.dumps(_cache_stats(), sort_keys=True)}')
 
     method = _get_method(event)
     authorization_header = _get_authorization(event)
 
+    # Stylesheet and script tags send no Authorization header, so assets are served before any identity lookup.
+    asset_name = _get_query_parameter(event, 'asset')
+    if method == 'GET' and asset_name:
+        return _serve_static_asset(event, asset_name)
+
     if method == 'POST':
         try:
             payload = json.loads(_get_body(event) or '{}')
@@ -2661,21 +4111,36 @@ def _handle_request(event, _context):
         normalized_action = (action or '').strip().lower()
 
         if normalized_action == 'getdomainsections':
-            try:
-                sections = _get_domain_sections(payload.get('entry', ''))
-                permutations = _get_permutation_count(payload.get('entry', ''))
-                possibilities = _get_possibility_count(payload.get('entry', ''))
-            except (BotoCoreError, ClientError, KeyError, TypeError, ValueError) as exc:
-                print(f'GetDomainSections failed: {exc}')
-                sections = {}
-                permutations = 0
-                possibilities = 0
+            failed = set()
+            sections, permutations, possibilities = _get_domain_details(payload.get('entry', ''), bypass_cache=_bypass_cache(payload), failed=failed)
             return {
                 'statusCode': 200,
                 'body': json.dumps({
                     'sections': sections,
                     'permutations': permutations,
                     'possibilities': possibilities,
+                    'partial': bool(failed),
+                }),
+                'headers': {
+                    'Content-Type': 'application/json; charset=utf-8'
+                }
+            }
+
+        if normalized_action == 'getdomainsectionsbatch':
+            requested_domains = payload.get('domains', [])
+            if not isinstance(requested_domains, list):
+                requested_domains = []
+
+            try:
+                domain_details = _get_domain_details_batch(requested_domains)
+            except (BotoCoreError, ClientError, KeyError, TypeError, ValueError) as exc:
+                print(f'GetDomainSectionsBatch failed: {exc}')
+                domain_details = {}
+
+            return {
+                'statusCode': 200,
+                'body': json.dumps({
+                    'domains': domain_details,
                 }),
                 'headers': {
                     'Content-Type': 'application/json; charset=utf-8'
@@ -2684,7 +4149,7 @@ def _handle_request(event, _context):
 
         if normalized_action == 'getdomainpermutations':
             try:
-                permutations = _get_domain_permutations(payload.get('entry', ''))
+                permutations = _get_domain_permutations(payload.get('entry', ''), bypass_cache=_bypass_cache(payload))
             except (BotoCoreError, ClientError, KeyError, TypeError, ValueError) as exc:
                 print(f'GetDomainPermutations failed: {exc}')
                 permutations = []
@@ -2698,9 +4163,50 @@ def _handle_request(event, _context):
                 }
             }
 
+        if normalized_action == 'getdomainpossibilities' and ('limit' in payload or payload.get('next')):
+            cursor = payload.get('next') or None
+            try:
+                possibilities, next_cursor = _get_domain_possibilities_page(
+                    payload.get('entry', ''),
+                    payload.get('limit'),
+                    None if cursor is None else str(cursor),
+                    bypass_cache=_bypass_cache(payload),
+                )
+            except ValueError as exc:
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({
+                        'error': str(exc),
+                    }),
+                    'headers': {
+                        'Content-Type': 'application/json; charset=utf-8'
+                    }
+                }
+            except (BotoCoreError, ClientError, KeyError, LookupError, TypeError) as exc:
+                print(f'GetDomainPossibilities page failed: {exc}')
+                return {
+                    'statusCode': 502,
+                    'body': json.dumps({
+                        'error': 'Possibility lookup failed',
+                    }),
+                    'headers': {
+                        'Content-Type': 'application/json; charset=utf-8'
+                    }
+                }
+            return {
+                'statusCode': 200,
+                'body': json.dumps({
+                    'possibilities': possibilities,
+                    'next': next_cursor,
+                }),
+                'headers': {
+                    'Content-Type': 'application/json; charset=utf-8'
+                }
+            }
+
         if normalized_action == 'getdomainpossibilities':
             try:
-                possibilities = _get_domain_possibilities(payload.get('entry', ''))
+                possibilities = _get_domain_possibilities(payload.get('entry', ''), bypass_cache=_bypass_cache(payload))
             except (BotoCoreError, ClientError, KeyError, TypeError, ValueError) as exc:
                 print(f'GetDomainPossibilities failed: {exc}')
                 possibilities = []
@@ -2714,13 +4220,16 @@ def _handle_request(event, _context):
                 }
             }
 
+        if normalized_action == 'listdomains':
+            return _serve_domain_list(event, authorization_header)
+
         if normalized_action == 'getmatchedslds':
             requested_domains = payload.get('domains', [])
             if not isinstance(requested_domains, list):
                 requested_domains = []
 
             try:
-                matched_slds = sorted(_get_matched_slds(requested_domains))
+                matched_slds = sorted(_matched_slds_future(requested_domains).result())
             except (BotoCoreError, ClientError, KeyError, TypeError, ValueError) as exc:
                 print(f'GetMatchedSlds failed: {exc}')
                 matched_slds = []
@@ -2734,6 +4243,9 @@ def _handle_request(event, _context):
             }
 
         identity = _fetch_user_identity(authorization_header)
+        if identity.get('rejected'):
+            return _unauthorized_response()
+
         domain, success, message = _process_submission(
             payload.get('entry', ''),
             identity.get('email', 'unknown'),
@@ -2754,15 +4266,18 @@ def _handle_request(event, _context):
         response_html = _render_result(message, success, authorization_header, operation)
     else:
         identity = _fetch_user_identity(authorization_header)
+        if identity.get('rejected'):
+            return _unauthorized_response()
+
         lunker_table = _get_table(os.environ['LUNKER_TABLE'])
         domains = _list_lunker_domains(lunker_table, identity.get('email', 'unknown'))
-        matched_slds = _get_matched_slds(domains)
-        response_html = _render_form(authorization_header, identity, domains, matched_slds)
+        matched_slds, highlights_pending = _get_matched_slds_within_budget(domains, MATCHED_SLD_RENDER_BUDGET_SECONDS)
+        response_html = _render_form(authorization_header, identity, domains, matched_slds, highlights_pending)
 
-    return {
+    return _compress_response(event, {
         'statusCode': 200,
         'body': response_html,
         'headers': {
             'Content-Type': 'text/html; charset=utf-8'
         }
-    }
\ No newline at end of file
+    })
\ No newline at end of file
@@ -0,0 +1,118 @@
+from collections import OrderedDict
+import threading
+import time
+
+
+def _estimate_size(value):
+    if isinstance(value, (str, bytes)):
+        return len(value)
+
+    if isinstance(value, dict):
+        return sum(_estimate_size(key) + _estimate_size(entry) for key, entry in value.items())
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(_estimate_size(entry) for entry in value) + 8 * len(value)
+
+    return 8
+
+
+class LruTtlCache:
+    # Least-recently-used entries are evicted first; expired entries are swept on write.
+    def __init__(self, name, ttl_seconds, max_entries, max_bytes=None):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval_seconds = min(60, max(1, ttl_seconds))
+        self.stats = dict.fromkeys(('hits', 'misses', 'bypasses', 'evictions', 'expirations'), 0)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._next_sweep_at = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(list(self._entries))
+
+    def __contains__(self, key):
+        entry = self._entries.get(key)
+        return entry is not None and entry[0] > time.monotonic()
+
+    def get(self, key, default=None, bypass=False):
+        with self._lock:
+            if bypass:
+                self.stats['bypasses'] += 1
+                return default
+
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return default
+
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[2]
+
+    def set(self, key, value, ttl_seconds=None):
+        now = time.monotonic()
+        size = _estimate_size(value)
+        with self._lock:
+            if now >= self._next_sweep_at:
+                self._sweep(now)
+
+            if key in self._entries:
+                self._remove(key)
+
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+            self._entries[key] = (now + ttl_seconds, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.stats['evictions'] += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            self._remove(key)
+            return entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._next_sweep_at = 0.0
+            self.stats = dict.fromkeys(self.stats, 0)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                **self.stats,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _sweep(self, now):
+        expired_keys = [key for key, entry in self._entries.items() if entry[0] <= now]
+        for key in expired_keys:
+            self._remove(key)
+        self.stats['expirations'] += len(expired_keys)
+        self._next_sweep_at = now + self.sweep_interval_seconds
@@ -0,0 +1,4 @@
+from home_shared import search_field_snapshot_handler
+
+
+handler = search_field_snapshot_handler
\ No newline at end of file
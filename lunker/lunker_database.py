@@ -273,6 +273,22 @@ class LunkerDatabase(Stack):
             )
         )
 
+        role.add_to_policy(
+            _iam.PolicyStatement(
+                actions = [
+                    'dynamodb:DeleteItem',
+                    'dynamodb:UpdateItem'
+                ],
+                resources = [
+                    self.format_arn(
+                        service = 'dynamodb',
+                        resource = 'table',
+                        resource_name = 'permutation'
+                    )
+                ]
+            )
+        )
+
     ### ACTION LAMBDA ###
 
         action = _lambda.Function(
@@ -284,9 +300,10 @@ class LunkerDatabase(Stack):
             handler = 'action.handler',
             environment = dict(
                 FUNCTION_NAME = 'arn:aws:lambda:'+region+':'+webmonitor.string_value+':function:searchlist',
-                PERMUTATION_FUNCTION_NAME = 'arn:aws:lambda:'+region+':'+account+':function:permutation'
+                PERMUTATION_FUNCTION_NAME = 'arn:aws:lambda:'+region+':'+account+':function:permutation',
+                PERMUTATION_TABLE = 'permutation'
             ),
-            timeout = Duration.seconds(7),
+            timeout = Duration.seconds(30),
             memory_size = 128,
             role = role
         )
@@ -302,7 +319,9 @@ class LunkerDatabase(Stack):
             _sources.DynamoEventSource(
                 table,
                 starting_position = _lambda.StartingPosition.TRIM_HORIZON,
-                batch_size = 1,
+                batch_size = 100,
+                max_batching_window = Duration.seconds(5),
+                report_batch_item_failures = True,
                 retry_attempts = 3
             )
         )
@@ -325,6 +344,7 @@ class LunkerDatabase(Stack):
         tldrole.add_to_policy(
             _iam.PolicyStatement(
                 actions = [
+                    'dynamodb:BatchWriteItem',
                     'dynamodb:GetItem',
                     'dynamodb:DeleteItem',
                     'dynamodb:PutItem',
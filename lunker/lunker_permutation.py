@@ -1,4 +1,5 @@
 from aws_cdk import (
+    ArnFormat,
     Duration,
     RemovalPolicy,
     Stack,
@@ -34,6 +35,9 @@ class LunkerPermutation(Stack):
         role.add_to_policy(
             _iam.PolicyStatement(
                 actions = [
+                    'dynamodb:BatchGetItem',
+                    'dynamodb:BatchWriteItem',
+                    'dynamodb:ConditionCheckItem',
                     'dynamodb:GetItem',
                     'dynamodb:PutItem',
                     'dynamodb:UpdateItem',
@@ -65,6 +69,22 @@ class LunkerPermutation(Stack):
             )
         )
 
+        role.add_to_policy(
+            _iam.PolicyStatement(
+                actions = [
+                    'lambda:InvokeFunction'
+                ],
+                resources = [
+                    self.format_arn(
+                        service = 'lambda',
+                        resource = 'function',
+                        resource_name = 'permutation',
+                        arn_format = ArnFormat.COLON_RESOURCE_NAME
+                    )
+                ]
+            )
+        )
+
     ### PERMUTATION LAMBDA FUNCTION ###
 
         permutation = _lambda.Function(
@@ -76,7 +96,10 @@ class LunkerPermutation(Stack):
             handler = 'permutation.handler',
             environment = dict(
                 LUNKER_TABLE = 'lunker',
-                PERMUTATION_TABLE = 'permutation'
+                PERMUTATION_TABLE = 'permutation',
+                PERMUTATION_SHARDS = '4',
+                LUNKER_KEY_SHARDS = '8',
+                LUNKER_KEY_MODE = 'legacy'
             ),
             timeout = Duration.seconds(900),
             memory_size = 512,
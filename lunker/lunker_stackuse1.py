@@ -2,6 +2,7 @@ import datetime
 
 from aws_cdk import (
     Duration,
+    Fn,
     RemovalPolicy,
     Stack,
     aws_dynamodb as _dynamodb,
@@ -65,6 +66,16 @@ class LunkerStackUse1(Stack):
             parameter_name = '/account/cognito'
         )
 
+        userpool = _ssm.StringParameter.from_string_parameter_attributes(
+            self, 'userpool',
+            parameter_name = '/cognito/userpool'
+        )
+
+        clientid = _ssm.StringParameter.from_string_parameter_attributes(
+            self, 'clientid',
+            parameter_name = '/cognito/clientid'
+        )
+
         webmonitor = _ssm.StringParameter.from_string_parameter_attributes(
             self, 'webmonitor',
             parameter_name = '/account/webmonitor'
@@ -142,10 +153,15 @@ class LunkerStackUse1(Stack):
             handler = 'homeuse1.handler',
             environment = dict(
                 LUNKER_TABLE = 'lunker',
+                LUNKER_KEY_SHARDS = '8',
+                LUNKER_KEY_MODE = 'legacy',
                 PERMUTATION_TABLE = 'permutation',
+                SEARCH_FIELD_SNAPSHOT_TABLE = 'searchfields',
                 POSSIBILITIES_TABLE = 'arn:aws:dynamodb:'+region+':'+webdb.string_value+':table/possibilities',
                 TLD_TABLE = 'tld',
                 CLIENTID_SECRET_ARN = 'arn:aws:secretsmanager:us-east-1:'+cognito.string_value+':secret:clientid',
+                JWT_ISSUERS = 'https://cognito-idp.'+Fn.select(0, Fn.split('_', userpool.string_value))+'.amazonaws.com/'+userpool.string_value,
+                JWT_AUDIENCES = clientid.string_value,
                 WM_OSINT = 'arn:aws:dynamodb:'+region+':'+webmonitor.string_value+':table/osint',
                 WM_MALWARE = 'arn:aws:dynamodb:'+region+':'+webmonitor.string_value+':table/malware',
                 WM_DAILYUPDATE = 'arn:aws:dynamodb:'+region+':'+webmonitor.string_value+':table/dailyupdate',
@@ -171,3 +187,100 @@ class LunkerStackUse1(Stack):
             retention = _logs.RetentionDays.THIRTEEN_MONTHS,
             removal_policy = RemovalPolicy.DESTROY
         )
+
+    ### SEARCH FIELD SNAPSHOT ###
+
+        snapshots = _dynamodb.TableV2(
+            self, 'snapshots',
+            table_name = 'searchfields',
+            partition_key = {
+                'name': 'pk',
+                'type': _dynamodb.AttributeType.STRING
+            },
+            sort_key = {
+                'name': 'sk',
+                'type': _dynamodb.AttributeType.STRING
+            },
+            billing = _dynamodb.Billing.on_demand(),
+            removal_policy = RemovalPolicy.DESTROY
+        )
+
+        snapshotrole = _iam.Role(
+            self, 'snapshotrole',
+            assumed_by = _iam.ServicePrincipal(
+                'lambda.amazonaws.com'
+            )
+        )
+
+        snapshotrole.add_managed_policy(
+            _iam.ManagedPolicy.from_aws_managed_policy_name(
+                'service-role/AWSLambdaBasicExecutionRole'
+            )
+        )
+
+        snapshotrole.add_to_policy(
+            _iam.PolicyStatement(
+                actions = [
+                    'dynamodb:GetItem',
+                    'dynamodb:PutItem'
+                ],
+                resources = [
+                    snapshots.table_arn
+                ]
+            )
+        )
+
+        snapshotrole.add_to_policy(
+            _iam.PolicyStatement(
+                actions = [
+                    'dynamodb:Query'
+                ],
+                resources = [
+                    'arn:aws:dynamodb:'+region+':'+webmonitor.string_value+':table/*'
+                ]
+            )
+        )
+
+        searchfields = _lambda.Function(
+            self, 'searchfields',
+            function_name = 'searchfields',
+            runtime = _lambda.Runtime.PYTHON_3_13,
+            architecture = _lambda.Architecture.ARM_64,
+            code = _lambda.Code.from_asset('home'),
+            handler = 'searchfields.handler',
+            environment = dict(
+                SEARCH_FIELD_SNAPSHOT_TABLE = 'searchfields',
+                WM_OSINT = 'arn:aws:dynamodb:'+region+':'+webmonitor.string_value+':table/osint',
+                WM_MALWARE = 'arn:aws:dynamodb:'+region+':'+webmonitor.string_value+':table/malware',
+                WM_DAILYUPDATE = 'arn:aws:dynamodb:'+region+':'+webmonitor.string_value+':table/dailyupdate',
+                WM_DAILYREMOVE = 'arn:aws:dynamodb:'+region+':'+webmonitor.string_value+':table/dailyremove'
+            ),
+            timeout = Duration.seconds(300),
+            memory_size = 512,
+            role = snapshotrole,
+            layers = [
+                requests
+            ]
+        )
+
+        searchfieldslogs = _logs.LogGroup(
+            self, 'searchfieldslogs',
+            log_group_name = '/aws/lambda/'+searchfields.function_name,
+            retention = _logs.RetentionDays.THIRTEEN_MONTHS,
+            removal_policy = RemovalPolicy.DESTROY
+        )
+
+        searchfieldsevent = _events.Rule(
+            self, 'searchfieldsevent',
+            schedule = _events.Schedule.cron(
+                minute = '*/15',
+                hour = '*',
+                month = '*',
+                week_day = '*',
+                year = '*'
+            )
+        )
+
+        searchfieldsevent.add_target(
+            _targets.LambdaFunction(searchfields)
+        )
\ No newline at end of file
@@ -1,21 +1,55 @@
 # pyright: reportMissingImports=false
 
+import hashlib
+import json
 import os
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import boto3
 from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
 
 
 LUNKER_TABLE = os.environ.get('LUNKER_TABLE', 'lunker')
 PERMUTATION_TABLE = os.environ.get('PERMUTATION_TABLE', 'permutation')
 LUNKER_INDEX = os.environ.get('LUNKER_INDEX', 'pk-tk-index')
 TTL_DAYS = int(os.environ.get('PERMUTATION_TTL_DAYS', '30'))
+TTL_REFRESH_DAYS = int(os.environ.get('PERMUTATION_TTL_REFRESH_DAYS', '7'))
+SHARDS = int(os.environ.get('PERMUTATION_SHARDS', '1'))
+# Stop a shard with this much time left so its checkpoint is saved before the hard timeout.
+TIME_MARGIN_MS = int(os.environ.get('PERMUTATION_TIME_MARGIN_MS', '60000'))
+CHECKPOINT_TTL_DAYS = 2
+# Per-SLD output budgets; the byte budget keeps the `perm` list well inside DynamoDB's 400 KB item limit.
+MAX_CANDIDATES = int(os.environ.get('PERMUTATION_MAX_CANDIDATES', '5000'))
+MAX_ITEM_BYTES = int(os.environ.get('PERMUTATION_MAX_ITEM_BYTES', '380000'))
+# `legacy` keeps every item under LUNKER#, `dual` writes LUNKER#<n> but still reads LUNKER#, `sharded` drops LUNKER#.
+KEY_SHARDS = int(os.environ.get('LUNKER_KEY_SHARDS', '1'))
+KEY_MODE = os.environ.get('LUNKER_KEY_MODE', 'legacy').strip().lower()
+LEGACY_PARTITION = 'LUNKER#'
+# The action Lambda keeps one REGISTRY# item per watched SLD, holding a string set of watcher ids.
+REGISTRY_PARTITION = 'REGISTRY#'
+# Written once a seed from the lunker index has finished; until then the registry may miss older watchers.
+REGISTRY_SEEDED_KEY = {
+    'pk': 'SYNC#',
+    'sk': 'REGISTRY#'
+}
+
+# DynamoDB BatchWriteItem accepts at most 25 requests per call.
+BATCH_SIZE = 25
+BATCH_GET_SIZE = 100
+BATCH_MAX_ATTEMPTS = 8
 
 _DYNAMODB = boto3.resource('dynamodb')
 _LUNKER = _DYNAMODB.Table(LUNKER_TABLE)
 _PERMUTATION = _DYNAMODB.Table(PERMUTATION_TABLE)
+_LAMBDA = boto3.client('lambda')
+
 
+# Bump whenever strategy output changes so stored items are rewritten on the next run.
+STRATEGY_VERSION = '1'
 
 # Simple keyboard neighborhood map for replacement/insertion strategies.
 _QWERTY_NEIGHBORS = {
@@ -30,170 +64,403 @@ _QWERTY_NEIGHBORS = {
 }
 
 
-def _unique_slds_from_lunker_tk_index():
-    slds = set()
-    query_kwargs = {
+def _partition_key(value):
+    # Lunker items are placed by email and permutation items by SLD.
+    if KEY_MODE not in ('dual', 'sharded'):
+        return LEGACY_PARTITION
+    return f'LUNKER#{_shard_of(value, KEY_SHARDS)}'
+
+
+def _write_partitions():
+    if KEY_MODE not in ('dual', 'sharded'):
+        return [LEGACY_PARTITION]
+    return [f'LUNKER#{idx}' for idx in range(KEY_SHARDS)]
+
+
+def _read_partitions():
+    if KEY_MODE == 'dual':
+        return _write_partitions() + [LEGACY_PARTITION]
+    return _write_partitions()
+
+
+def _scatter_query(table, partitions, query_kwargs_for):
+    def _query_partition(partition):
+        items = []
+        query_kwargs = query_kwargs_for(partition)
+        while True:
+            response = table.query(**query_kwargs)
+            items.extend(response.get('Items', []))
+
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                break
+            query_kwargs['ExclusiveStartKey'] = last_key
+        return items
+
+    if len(partitions) == 1:
+        return _query_partition(partitions[0])
+
+    with ThreadPoolExecutor(max_workers=min(16, len(partitions))) as executor:
+        return [item for items in executor.map(_query_partition, partitions) for item in items]
+
+
+def _sld_from_tk(tk):
+    parts = tk.split('#')
+    if len(parts) >= 3 and parts[1]:
+        return parts[1].lower()
+    return ''
+
+
+def _lunker_index_items(projection):
+    return _scatter_query(_LUNKER, _read_partitions(), lambda partition: {
         'IndexName': LUNKER_INDEX,
-        'KeyConditionExpression': Key('pk').eq('LUNKER#') & Key('tk').begins_with('LUNKER#'),
-        'ProjectionExpression': 'tk'
+        'KeyConditionExpression': Key('pk').eq(partition) & Key('tk').begins_with('LUNKER#'),
+        'ProjectionExpression': projection
+    })
+
+
+def _unique_slds_from_lunker_tk_index():
+    slds = {_sld_from_tk(item.get('tk', '')) for item in _lunker_index_items('tk')}
+    slds.discard('')
+    return sorted(slds)
+
+
+def _watcher_id(sk):
+    # Must match the action Lambda: one id per user and domain, whichever partition holds the item.
+    return hashlib.sha256(sk.encode('utf-8')).hexdigest()[:16]
+
+
+def _registry_key(sld):
+    return {
+        'pk': REGISTRY_PARTITION,
+        'sk': f'REGISTRY#{sld}#'
     }
 
-    while True:
-        response = _LUNKER.query(**query_kwargs)
-        for item in response.get('Items', []):
-            tk = item.get('tk', '')
-            parts = tk.split('#')
-            if len(parts) >= 3 and parts[1]:
-                slds.add(parts[1].lower())
 
-        last_key = response.get('LastEvaluatedKey')
-        if not last_key:
-            break
-        query_kwargs['ExclusiveStartKey'] = last_key
+def _registered_slds():
+    items = _scatter_query(_PERMUTATION, [REGISTRY_PARTITION], lambda partition: {
+        'KeyConditionExpression': Key('pk').eq(partition),
+        'ProjectionExpression': 'sld'
+    })
+    return sorted({item['sld'] for item in items if item.get('sld')})
 
-    return sorted(slds)
 
+def _registry_seeded():
+    response = _PERMUTATION.get_item(Key=REGISTRY_SEEDED_KEY, ConsistentRead=True)
+    return bool(response.get('Item'))
 
-def _homoglyph_permutations(sld):
-    swaps = {
-        'o': ['0'], '0': ['o'],
-        'i': ['1', 'l'], '1': ['i', 'l'], 'l': ['1', 'i'],
-        's': ['5'], '5': ['s'],
-        'a': ['4'], '4': ['a'],
-        'e': ['3'], '3': ['e'],
-        'g': ['9'], '9': ['g']
+
+def _watched_slds():
+    if _registry_seeded():
+        return _registered_slds()
+
+    # Stream inserts alone only cover watchers added since the registry was deployed.
+    print('SLD registry is not seeded, seeding it from the lunker index')
+    return sorted(_seed_registry())
+
+
+def _present_watchers(keys):
+    # Base-table reads are consistent, unlike the index. A legacy row pruned mid-seed is looked up in every partition.
+    found = {sk for _, sk in _existing_keys(LUNKER_TABLE, keys, consistent=True)}
+    missing = sorted({key['sk'] for key in keys} - found)
+    if missing and len(_read_partitions()) > 1:
+        candidates = [{'pk': partition, 'sk': sk} for sk in missing for partition in _read_partitions()]
+        found |= {sk for _, sk in _existing_keys(LUNKER_TABLE, candidates, consistent=True)}
+    return {_watcher_id(sk) for sk in found}
+
+
+def _retire_watchers(sld, ids):
+    # Same as a stream REMOVE: an emptied registry item is deleted unless a watcher was added meanwhile.
+    attributes = _PERMUTATION.update_item(
+        Key=_registry_key(sld),
+        UpdateExpression='DELETE watchers :watchers',
+        ExpressionAttributeValues={':watchers': ids},
+        ReturnValues='ALL_NEW'
+    )['Attributes']
+    if attributes.get('watchers'):
+        return False
+
+    try:
+        _PERMUTATION.delete_item(Key=_registry_key(sld), ConditionExpression='attribute_not_exists(watchers)')
+    except ClientError as exc:
+        if exc.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            return False
+        raise
+
+    return True
+
+
+def _seed_registry():
+    watchers = {}
+    keys = []
+    for item in _lunker_index_items('pk, tk, sk'):
+        sld = _sld_from_tk(item.get('tk', ''))
+        if sld and item.get('pk') and item.get('sk'):
+            watchers.setdefault(sld, set()).add(_watcher_id(item['sk']))
+            keys.append({'pk': item['pk'], 'sk': item['sk']})
+
+    # ADD only merges, so watchers the stream adds while the seed runs are kept.
+    for sld, ids in sorted(watchers.items()):
+        _PERMUTATION.update_item(
+            Key=_registry_key(sld),
+            UpdateExpression='SET sld = :sld ADD watchers :watchers',
+            ExpressionAttributeValues={':sld': sld, ':watchers': ids}
+        )
+
+    # The index can still list a domain whose REMOVE the stream has already applied, and the ADD above
+    # brings that watcher back. Reconcile against the base table after the ADDs: a delete that lands
+    # later reaches the stream after them, so its own DELETE still wins.
+    present = _present_watchers(keys)
+    retired = []
+    for sld in sorted(watchers):
+        stale = watchers[sld] - present
+        if not stale:
+            continue
+
+        watchers[sld] -= stale
+        if _retire_watchers(sld, stale):
+            retired.append(sld)
+        if not watchers[sld]:
+            del watchers[sld]
+
+    if retired:
+        print(f'SLD registry seed retired {len(retired)} SLDs removed during the seed')
+        _collect_unwatched(retired)
+
+    _PERMUTATION.put_item(Item={**REGISTRY_SEEDED_KEY, 'seeded': int(time.time()), 'sld_count': len(watchers)})
+    return watchers
+
+
+def _rebuild_registry():
+    watchers = _seed_registry()
+    return {
+        'mode': 'registry',
+        'sld_count': len(watchers),
+        'watcher_count': sum(len(ids) for ids in watchers.values())
     }
-    out = set()
-    chars = list(sld)
-    for idx, char in enumerate(chars):
-        for rep in swaps.get(char, []):
-            candidate = chars.copy()
-            candidate[idx] = rep
-            out.add(''.join(candidate))
-    return out
 
 
+def _requested_collection(event):
+    if not isinstance(event, dict) or not isinstance(event.get('collect'), list):
+        return []
+
+    return sorted({
+        candidate.strip().lower()
+        for candidate in event['collect']
+        if isinstance(candidate, str) and candidate.strip()
+    })
+
+
+def _still_watched(sld):
+    response = _PERMUTATION.get_item(Key=_registry_key(sld), ConsistentRead=True, ProjectionExpression='watchers')
+    if response.get('Item', {}).get('watchers'):
+        return True
+
+    # The index also guards SLDs whose watchers predate the registry. It is eventually consistent, so a
+    # delete that just landed can still show up here; that SLD is then left for its TTL to expire.
+    for partition in _read_partitions():
+        response = _LUNKER.query(
+            IndexName=LUNKER_INDEX,
+            KeyConditionExpression=Key('pk').eq(partition) & Key('tk').begins_with(f'LUNKER#{sld}#'),
+            ProjectionExpression='tk',
+            Limit=1
+        )
+        if response.get('Items'):
+            return True
+
+    return False
+
+
+def _collect_unwatched(slds):
+    collected = []
+    for sld in slds:
+        if _still_watched(sld):
+            continue
+
+        for partition in sorted({_partition_key(sld), LEGACY_PARTITION}):
+            _PERMUTATION.delete_item(Key={'pk': partition, 'sk': f'LUNKER#{sld}#'})
+        collected.append(sld)
+
+    return collected
+
+
+_BIT_MASKS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def _bitsquat_flips(ch):
+    code = ord(ch)
+    flips = []
+    for mask in _BIT_MASKS:
+        flipped = chr(code ^ mask)
+        # Case-only flips lower-case back to the SLD itself, so they are never kept.
+        if (flipped.isalnum() or flipped == '-') and flipped.lower() != ch:
+            flips.append(flipped)
+    return tuple(flips)
+
+
+# Precomputed substitution tables; bitsquat flips outside ASCII are computed on demand.
+_BITSQUAT_TABLE = {chr(code): _bitsquat_flips(chr(code)) for code in range(128)}
+_HOMOGLYPH_TABLE = {
+    'o': ('0',), '0': ('o',),
+    'i': ('1', 'l'), '1': ('i', 'l'), 'l': ('1', 'i'),
+    's': ('5',), '5': ('s',),
+    'a': ('4',), '4': ('a',),
+    'e': ('3',), '3': ('e',),
+    'g': ('9',), '9': ('g',)
+}
+_VOWEL_TABLE = {vowel: tuple(rep for rep in 'aeiou' if rep != vowel) for vowel in 'aeiou'}
+_ADDITION_CHARSET = 'abcdefghijklmnopqrstuvwxyz0123456789'
+# For SLDs drawn from this alphabet every table emits only the same alphabet, one edit away in length.
+_TABLE_ALPHABET = 'abcdefghijklmnopqrstuvwxyz0123456789-'
+_TABLE_SAFE_SLD = re.compile('[a-z0-9-]+')
+
+
+@lru_cache(maxsize=256)
+def _positions(sld):
+    # (prefix, char, suffix, prefix + char, char + suffix) for every index, shared by all strategies.
+    heads = [sld[:idx] for idx in range(len(sld) + 1)]
+    tails = [sld[idx:] for idx in range(len(sld) + 1)]
+    return tuple(zip(heads, sld, tails[1:], heads[1:], tails))
+
+
+def _mean_width(table):
+    return sum(len(table.get(ch, ())) for ch in _TABLE_ALPHABET) / len(_TABLE_ALPHABET)
+
+
+_HOMOGLYPH_WIDTH = _mean_width(_HOMOGLYPH_TABLE)
+_QWERTY_WIDTH = _mean_width(_QWERTY_NEIGHBORS)
+_BITSQUAT_WIDTH = _mean_width(_BITSQUAT_TABLE)
+_VOWEL_WIDTH = _mean_width(_VOWEL_TABLE)
+
+# Registered strategies, highest yield first so budgets cut the least productive ones.
+STRATEGIES = []
+
+
+def _strategy(name, min_length, estimate, yield_ratio, single_edit=True):
+    # estimate(length) is the expected raw output; yield_ratio the share expected to survive filtering.
+    # single_edit strategies emit table alphabet candidates one edit from the SLD and use the fast filter.
+    def register(generate):
+        STRATEGIES.append({
+            'name': name,
+            'generate': generate,
+            'min_length': min_length,
+            'estimate': estimate,
+            'yield': yield_ratio,
+            'single_edit': single_edit
+        })
+        STRATEGIES.sort(key=lambda strategy: -strategy['yield'])
+        return generate
+    return register
+
+
+def _substitutions(sld, table):
+    return [f'{head}{rep}{tail}' for head, ch, tail, _, _ in _positions(sld) for rep in table.get(ch, ())]
+
+
+@_strategy('homoglyph', 1, lambda length: length * _HOMOGLYPH_WIDTH, 1.0)
+def _homoglyph_permutations(sld):
+    return _substitutions(sld, _HOMOGLYPH_TABLE)
+
+
+@_strategy('omission', 6, lambda length: length, 0.9)
 def _omission_permutations(sld):
-    return {sld[:idx] + sld[idx + 1:] for idx in range(len(sld)) if len(sld) > 1}
+    return [f'{head}{tail}' for head, _, tail, _, _ in _positions(sld)] if len(sld) > 1 else []
 
 
+@_strategy('repetition', 6, lambda length: length, 0.85)
 def _repetition_permutations(sld):
-    out = set()
-    for idx, char in enumerate(sld):
-        out.add(sld[:idx] + char + sld[idx:])
-    return out
+    return [f'{head_ch}{ch_tail}' for _, _, _, head_ch, ch_tail in _positions(sld)]
 
 
+@_strategy('transposition', 1, lambda length: length - 1, 1.0)
 def _transposition_permutations(sld):
-    out = set()
-    for idx in range(len(sld) - 1):
-        if sld[idx] != sld[idx + 1]:
-            out.add(sld[:idx] + sld[idx + 1] + sld[idx] + sld[idx + 2:])
-    return out
+    positions = _positions(sld)
+    return [
+        f'{head}{next_ch}{ch}{positions[idx + 1][2]}'
+        for idx, ((head, ch, _, _, _), next_ch) in enumerate(zip(positions, sld[1:]))
+        if ch != next_ch
+    ]
 
 
+@_strategy('hyphenation', 6, lambda length: length - 1, 1.0)
 def _hyphenation_permutations(sld):
-    out = set()
-    for idx in range(1, len(sld)):
-        out.add(sld[:idx] + '-' + sld[idx:])
-    return out
+    return [f'{head}-{ch_tail}' for head, _, _, _, ch_tail in _positions(sld)[1:]]
 
 
+@_strategy('replacement', 5, lambda length: length * _QWERTY_WIDTH, 0.95)
 def _replacement_permutations(sld):
-    out = set()
-    for idx, char in enumerate(sld):
-        for neighbor in _QWERTY_NEIGHBORS.get(char, ''):
-            out.add(sld[:idx] + neighbor + sld[idx + 1:])
-    return out
+    return _substitutions(sld, _QWERTY_NEIGHBORS)
 
 
+@_strategy('insertion', 6, lambda length: 2 * length * _QWERTY_WIDTH, 0.8)
 def _insertion_permutations(sld):
-    out = set()
-    for idx, char in enumerate(sld):
-        for neighbor in _QWERTY_NEIGHBORS.get(char, ''):
-            out.add(sld[:idx] + neighbor + sld[idx:])
-            out.add(sld[:idx + 1] + neighbor + sld[idx + 1:])
-    return out
+    positions = _positions(sld)
+    return [
+        f'{head}{neighbor}{ch_tail}' for head, ch, _, _, ch_tail in positions for neighbor in _QWERTY_NEIGHBORS.get(ch, '')
+    ] + [
+        f'{head_ch}{neighbor}{tail}' for _, ch, tail, head_ch, _ in positions for neighbor in _QWERTY_NEIGHBORS.get(ch, '')
+    ]
 
 
+# Every addition candidate contains the SLD and is filtered, so it is planned last and never uses budget.
+@_strategy('addition', 6, lambda length: 2 * len(_ADDITION_CHARSET), 0.0)
 def _addition_permutations(sld):
-    out = set()
-    charset = 'abcdefghijklmnopqrstuvwxyz0123456789'
-    for ch in charset:
-        out.add(ch + sld)
-        out.add(sld + ch)
-    return out
+    return [f'{ch}{sld}' for ch in _ADDITION_CHARSET] + [f'{sld}{ch}' for ch in _ADDITION_CHARSET]
 
 
+@_strategy('bitsquatting', 6, lambda length: length * _BITSQUAT_WIDTH, 0.7)
 def _bitsquatting_permutations(sld):
-    out = set()
-    bit_masks = (1, 2, 4, 8, 16, 32, 64)
-    for idx, ch in enumerate(sld):
-        code = ord(ch)
-        for mask in bit_masks:
-            flipped = chr(code ^ mask)
-            if flipped.isalnum() or flipped == '-':
-                out.add(sld[:idx] + flipped + sld[idx + 1:])
-    return out
+    return [
+        f'{head}{flipped}{tail}'
+        for head, ch, tail, _, _ in _positions(sld)
+        for flipped in (_BITSQUAT_TABLE[ch] if ch in _BITSQUAT_TABLE else _bitsquat_flips(ch))
+    ]
 
 
+@_strategy('vowel_swap', 6, lambda length: length * _VOWEL_WIDTH, 0.6)
 def _vowel_swap_permutations(sld):
-    out = set()
-    vowels = 'aeiou'
-    for idx, ch in enumerate(sld):
-        if ch in vowels:
-            for rep in vowels:
-                if rep != ch:
-                    out.add(sld[:idx] + rep + sld[idx + 1:])
-    return out
-
-
-def _strategy_candidates(sld):
-    if len(sld) < 5:
-        # Keep short-SLD output conservative to limit false positives.
-        return [
-            ('homoglyph', _homoglyph_permutations(sld)),
-            ('transposition', _transposition_permutations(sld))
-        ]
-
-    if len(sld) == 5:
-        # Use a medium profile for length-5 SLDs to balance coverage and noise.
-        return [
-            ('homoglyph', _homoglyph_permutations(sld)),
-            ('transposition', _transposition_permutations(sld)),
-            ('replacement', _replacement_permutations(sld))
-        ]
+    return _substitutions(sld, _VOWEL_TABLE)
 
-    return [
-        ('homoglyph', _homoglyph_permutations(sld)),
-        ('omission', _omission_permutations(sld)),
-        ('repetition', _repetition_permutations(sld)),
-        ('transposition', _transposition_permutations(sld)),
-        ('hyphenation', _hyphenation_permutations(sld)),
-        ('replacement', _replacement_permutations(sld)),
-        ('insertion', _insertion_permutations(sld)),
-        ('addition', _addition_permutations(sld)),
-        ('bitsquatting', _bitsquatting_permutations(sld)),
-        ('vowel_swap', _vowel_swap_permutations(sld))
-    ]
 
+def _perm_bytes(count, total_length):
+    # DynamoDB sizes a list as 3 bytes plus each element and 1 byte per element.
+    return 3 + total_length + count
 
-def _log_permutation_stats(sld, strategy_sets, pre_filter_count, post_filter_count):
-    strategy_counts = ', '.join(f'{name}:{len(values)}' for name, values in strategy_sets)
-    print(
-        f'PERMUTATION_STATS sld={sld} len={len(sld)} '
-        f'strategy_counts={{{strategy_counts}}} '
-        f'pre_filter={pre_filter_count} post_filter={post_filter_count}'
-    )
 
+def _plan_strategies(length):
+    planned = []
+    skipped = []
+    expected = 0.0
+    expected_bytes = 3.0
+
+    for strategy in STRATEGIES:
+        if length < strategy['min_length']:
+            continue
+
+        output = max(strategy['estimate'](length), 0) * strategy['yield']
+        output_bytes = output * (length + 2)
+        if expected + output > MAX_CANDIDATES or expected_bytes + output_bytes > MAX_ITEM_BYTES:
+            skipped.append(strategy['name'])
+            continue
+
+        planned.append(strategy)
+        expected += output
+        expected_bytes += output_bytes
+
+    return planned, skipped
 
-def _recommended_permutations(sld):
-    sld = sld.lower()
-    strategy_sets = _strategy_candidates(sld)
-    candidates = set()
-    for _, values in strategy_sets:
-        candidates.update(values)
 
+def _filter_single_edit(sld, candidates):
+    # Candidates are already lower-case and valid, and a one-character-longer
+    # candidate contains the SLD only as a prefix or suffix, so set arithmetic filters.
+    candidates.difference_update([f'{ch}{sld}' for ch in _TABLE_ALPHABET], [f'{sld}{ch}' for ch in _TABLE_ALPHABET])
+    candidates.discard(sld)
+    if len(sld) <= 2:
+        return {candidate for candidate in candidates if len(candidate) >= 2}
+    return candidates
+
+
+def _filter_candidates(sld, candidates):
     normalized = set()
     for candidate in candidates:
         if not candidate or len(candidate) < 2:
@@ -206,53 +473,611 @@ def _recommended_permutations(sld):
         if all(ch.isalnum() or ch == '-' for ch in lowered):
             normalized.add(lowered)
 
-    _log_permutation_stats(sld, strategy_sets, len(candidates), len(normalized))
+    return normalized
+
+
+def _apply_budget(normalized, max_length=None):
+    ordered = sorted(normalized)
+    if len(ordered) <= MAX_CANDIDATES:
+        # Single-edit output is at most one character longer than the SLD, which bounds the size without summing it.
+        if max_length is not None and _perm_bytes(len(ordered), len(ordered) * max_length) <= MAX_ITEM_BYTES:
+            return ordered, 0
+        if _perm_bytes(len(ordered), sum(map(len, ordered))) <= MAX_ITEM_BYTES:
+            return ordered, 0
+
+    kept = ordered[:MAX_CANDIDATES]
+    total_length = sum(map(len, kept))
+    while kept and _perm_bytes(len(kept), total_length) > MAX_ITEM_BYTES:
+        total_length -= len(kept.pop())
+
+    return kept, len(ordered) - len(kept)
+
+
+def _log_permutation_stats(sld, strategy_sets, pre_filter_count, post_filter_count, skipped=(), dropped=0):
+    strategy_counts = ', '.join(f'{name}:{len(values)}' for name, values in strategy_sets)
+    print(
+        f'PERMUTATION_STATS sld={sld} len={len(sld)} '
+        f'strategy_counts={{{strategy_counts}}} '
+        f'pre_filter={pre_filter_count} post_filter={post_filter_count} '
+        f'budget_truncated={str(bool(skipped or dropped)).lower()} '
+        f'skipped_strategies={{{", ".join(skipped)}}} budget_dropped={dropped}'
+    )
+
+
+def _recommended_permutations(sld):
+    sld = sld.lower()
+    planned, skipped = _plan_strategies(len(sld))
+    strategy_sets = [(strategy['name'], strategy['generate'](sld)) for strategy in planned]
+
+    table_safe = _TABLE_SAFE_SLD.fullmatch(sld) is not None
+    single_edit = set()
+    other = set()
+    for strategy, (_, values) in zip(planned, strategy_sets):
+        (single_edit if table_safe and strategy['single_edit'] else other).update(values)
+
+    pre_filter_count = len(single_edit.union(other)) if other else len(single_edit)
+
+    normalized = _filter_single_edit(sld, single_edit)
+    if other:
+        normalized = normalized | _filter_candidates(sld, other)
+
+    permutations, dropped = _apply_budget(normalized, None if other else len(sld) + 1)
+
+    _log_permutation_stats(sld, strategy_sets, pre_filter_count, len(permutations), skipped, dropped)
+
+    return permutations
+
+
+def _permutation_ttl():
+    return int(time.time()) + (TTL_DAYS * 24 * 60 * 60)
+
+
+def _permutation_hash(permutations):
+    return hashlib.sha256('\n'.join(permutations).encode('utf-8')).hexdigest()
+
+
+def _permutation_item(sld, permutations, ttl):
+    return {
+        'pk': _partition_key(sld),
+        'sk': f'LUNKER#{sld}#',
+        'sld': sld,
+        'perm': permutations,
+        'count': len(permutations),
+        'hash': _permutation_hash(permutations),
+        'version': STRATEGY_VERSION,
+        'ttl': ttl
+    }
+
+
+def _existing_permutation_state(slds):
+    # Only the keys being written count, so a dual-mode run copies items that still sit under LUNKER#.
+    keys = [{'pk': _partition_key(sld), 'sk': f'LUNKER#{sld}#'} for sld in slds]
+    items = _batch_get_items(PERMUTATION_TABLE, keys, 'sk, #hash, #version, #ttl', {
+        '#hash': 'hash',
+        '#version': 'version',
+        '#ttl': 'ttl'
+    })
+
+    return {
+        item.get('sk', ''): (
+            item.get('hash', ''),
+            item.get('version', ''),
+            int(item.get('ttl', 0) or 0)
+        )
+        for item in items
+    }
+
 
-    return sorted(normalized)
+def _extend_ttl(sld, ttl):
+    response = _PERMUTATION.update_item(
+        Key={
+            'pk': _partition_key(sld),
+            'sk': f'LUNKER#{sld}#'
+        },
+        UpdateExpression='SET #ttl = :ttl',
+        ExpressionAttributeNames={'#ttl': 'ttl'},
+        ExpressionAttributeValues={':ttl': ttl},
+        ReturnConsumedCapacity='TOTAL'
+    )
+    return float(response.get('ConsumedCapacity', {}).get('CapacityUnits', 0) or 0)
 
 
 def _write_permutations(sld, permutations):
-    ttl = int(time.time()) + (TTL_DAYS * 24 * 60 * 60)
+    _PERMUTATION.put_item(Item=_permutation_item(sld, permutations, _permutation_ttl()))
+
+
+def _batch_write(write_requests, table_name=PERMUTATION_TABLE):
+    consumed = 0.0
+    request_items = {table_name: write_requests}
+    attempt = 0
+
+    while request_items:
+        response = _PERMUTATION.meta.client.batch_write_item(
+            RequestItems=request_items,
+            ReturnConsumedCapacity='TOTAL'
+        )
+        for capacity in response.get('ConsumedCapacity', []):
+            consumed += float(capacity.get('CapacityUnits', 0) or 0)
+
+        request_items = response.get('UnprocessedItems') or {}
+        if not request_items:
+            break
+
+        attempt += 1
+        if attempt >= BATCH_MAX_ATTEMPTS:
+            pending = sum(len(entries) for entries in request_items.values())
+            raise RuntimeError(f'BatchWriteItem left {pending} unprocessed items after {attempt} attempts')
+
+        # Back off exponentially before retrying throttled items.
+        time.sleep(min(0.05 * (2 ** attempt), 2.0))
+
+    return consumed
+
+
+def _generate_chunk(slds):
+    return [(sld, _recommended_permutations(sld)) for sld in slds]
+
+
+def _generated_chunks(slds):
+    # Parallelism comes from the shard fan-out; within a shard, chunks are generated lazily so a stop wastes none.
+    for idx in range(0, len(slds), BATCH_SIZE):
+        yield _generate_chunk(slds[idx:idx + BATCH_SIZE])
+
+
+def _full_run(slds, on_progress=None, should_stop=None):
+    started = time.monotonic()
+    ttl = _permutation_ttl()
+    refresh_before = int(time.time()) + (TTL_REFRESH_DAYS * 24 * 60 * 60)
+    processed = 0
+    written = 0
+    skipped = 0
+    extended = 0
+    consumed = 0.0
+    complete = True
+
+    for generated in _generated_chunks(slds):
+        # Stored state is read per chunk, so a shard or a resumed run reads only the SLDs it is about to write.
+        existing = _existing_permutation_state([sld for sld, _ in generated])
+        write_requests = []
+        for sld, perms in generated:
+            item = _permutation_item(sld, perms, ttl)
+            stored_hash, stored_version, stored_ttl = existing.get(item['sk'], ('', '', 0))
+            if stored_hash != item['hash'] or stored_version != STRATEGY_VERSION:
+                write_requests.append({'PutRequest': {'Item': item}})
+                continue
+
+            # Unchanged content only needs its expiry pushed out when it is close to lapsing.
+            if stored_ttl < refresh_before:
+                consumed += _extend_ttl(sld, ttl)
+                extended += 1
+            else:
+                skipped += 1
+
+        if write_requests:
+            consumed += _batch_write(write_requests)
+            written += len(write_requests)
+
+        processed += len(generated)
+        if on_progress:
+            on_progress(generated[-1][0])
+
+        if should_stop and processed < len(slds) and should_stop():
+            complete = False
+            break
+
+    elapsed = max(time.monotonic() - started, 1e-6)
+    return {
+        'complete': complete,
+        'slds_processed': processed,
+        'items_written': written,
+        'items_skipped': skipped,
+        'ttl_extended': extended,
+        'duration_seconds': round(elapsed, 3),
+        'slds_per_second': round(processed / elapsed, 2),
+        'wcu_consumed': round(consumed, 2)
+    }
+
+
+def _requested_slds(event):
+    if not isinstance(event, dict):
+        return []
+
+    candidates = event.get('slds')
+    if not isinstance(candidates, list):
+        candidates = [event.get('sld') or event.get('Status')]
+
+    requested = set()
+    for candidate in candidates:
+        if isinstance(candidate, str):
+            normalized = candidate.strip().lower()
+            if normalized:
+                requested.add(normalized)
+
+    return sorted(requested)
+
+
+def _write_requested(slds):
+    if len(slds) == 1:
+        _write_permutations(slds[0], _recommended_permutations(slds[0]))
+        return 1
+
+    ttl = _permutation_ttl()
+    written = 0
+    for generated in _generated_chunks(slds):
+        _batch_write([
+            {'PutRequest': {'Item': _permutation_item(sld, perms, ttl)}}
+            for sld, perms in generated
+        ])
+        written += len(generated)
+
+    return written
+
+
+def _shard_of(sld, shards):
+    digest = hashlib.sha256(sld.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % shards
+
+
+def _run_id():
+    return time.strftime('%Y-%m-%d', time.gmtime())
+
+
+def _requested_shard(event):
+    if not isinstance(event, dict) or 'shard' not in event:
+        return None
+
+    try:
+        shard = int(event['shard'])
+        shards = int(event.get('shards', SHARDS))
+    except (TypeError, ValueError):
+        return None
+
+    if shards < 1 or not 0 <= shard < shards:
+        return None
+
+    return {
+        'shard': shard,
+        'shards': shards,
+        'run': str(event.get('run') or _run_id())
+    }
+
+
+def _checkpoint_key(shard):
+    return {
+        'pk': 'CHECKPOINT#',
+        'sk': f"RUN#{shard['run']}#SHARD#{shard['shard']}#OF#{shard['shards']}#"
+    }
+
+
+def _load_checkpoint(shard):
+    response = _PERMUTATION.get_item(Key=_checkpoint_key(shard), ConsistentRead=True)
+    return response.get('Item') or {}
+
+
+def _save_checkpoint(shard, last_sld, status):
     _PERMUTATION.put_item(
         Item={
-            'pk': 'LUNKER#',
-            'sk': f'LUNKER#{sld}#',
-            'sld': sld,
-            'perm': permutations,
-            'count': len(permutations),
-            'ttl': ttl
+            **_checkpoint_key(shard),
+            'last_sld': last_sld,
+            'status': status,
+            'updated': int(time.time()),
+            'ttl': int(time.time()) + (CHECKPOINT_TTL_DAYS * 24 * 60 * 60)
         }
     )
 
 
-def _requested_slds(event):
-    if not isinstance(event, dict):
-        return []
+def _invoke_shard(context, shard):
+    _LAMBDA.invoke(
+        FunctionName=context.invoked_function_arn,
+        InvocationType='Event',
+        Payload=json.dumps(shard)
+    )
+
+
+def _dispatch_shards(context):
+    run = _run_id()
+    if not _registry_seeded():
+        # Seed once here rather than in every shard at the same time.
+        _seed_registry()
 
-    candidate = event.get('sld') or event.get('Status')
-    if isinstance(candidate, str):
-        normalized = candidate.strip().lower()
-        if normalized:
-            return [normalized]
+    shards = [{'shard': idx, 'shards': SHARDS, 'run': run} for idx in range(SHARDS)]
+
+    if context is None:
+        # Local fan-out: drive every shard in this process, one after another.
+        results = [_run_shard(shard, None) for shard in shards]
+        return {
+            'mode': 'sharded',
+            'run': run,
+            'shards': SHARDS,
+            'sld_count': sum(result['sld_count'] for result in results),
+            'items_written': sum(result['items_written'] for result in results)
+        }
+
+    for shard in shards:
+        _invoke_shard(context, shard)
+
+    return {
+        'mode': 'dispatch',
+        'run': run,
+        'shards': SHARDS
+    }
 
-    return []
 
+def _run_shard(shard, context):
+    checkpoint = _load_checkpoint(shard)
+    if checkpoint.get('status') == 'complete':
+        return {'mode': 'shard', **shard, 'sld_count': 0, 'items_written': 0, 'complete': True}
+
+    last_sld = checkpoint.get('last_sld', '')
+    slds = [
+        sld for sld in _watched_slds()
+        if _shard_of(sld, shard['shards']) == shard['shard'] and sld > last_sld
+    ]
+
+    def should_stop():
+        return context is not None and context.get_remaining_time_in_millis() < TIME_MARGIN_MS
+
+    summary = _full_run(
+        slds,
+        on_progress=lambda sld: _save_checkpoint(shard, sld, 'running'),
+        should_stop=should_stop
+    )
+
+    if summary['complete']:
+        _save_checkpoint(shard, slds[-1] if slds else last_sld, 'complete')
+    else:
+        # Continue from the saved checkpoint in a fresh invocation.
+        _invoke_shard(context, shard)
+
+    return {
+        'mode': 'shard',
+        **shard,
+        'resumed_from': last_sld,
+        'sld_count': len(slds),
+        **summary
+    }
+
+
+# Attribute that picks the partition of each table's items.
+_MIGRATION_KEYS = {
+    'lunker': 'email',
+    'permutation': 'sld'
+}
+
+
+def _requested_migration(event):
+    if not isinstance(event, dict) or 'migrate' not in event:
+        return None
+
+    action = event.get('action') or 'backfill'
+    if event['migrate'] not in _MIGRATION_KEYS or action not in ('backfill', 'prune'):
+        return None
+
+    return {
+        'migrate': event['migrate'],
+        'action': action,
+        'cursor': event.get('cursor')
+    }
+
+
+def _copy_legacy_item(table_name, item, partition):
+    # The copy only lands while the legacy item still exists and never replaces a newer sharded write.
+    try:
+        _DYNAMODB.meta.client.transact_write_items(
+            TransactItems=[
+                {
+                    'ConditionCheck': {
+                        'TableName': table_name,
+                        'Key': {'pk': LEGACY_PARTITION, 'sk': item['sk']},
+                        'ConditionExpression': 'attribute_exists(sk)'
+                    }
+                },
+                {
+                    'Put': {
+                        'TableName': table_name,
+                        'Item': {**item, 'pk': partition, 'migrated': int(time.time())},
+                        'ConditionExpression': 'attribute_not_exists(sk)'
+                    }
+                }
+            ]
+        )
+    except ClientError as exc:
+        if exc.response.get('Error', {}).get('Code') == 'TransactionCanceledException':
+            return False
+        raise
+
+    return True
+
+
+def _batch_get_items(table_name, keys, projection, attribute_names=None, consistent=False):
+    found = []
+
+    for idx in range(0, len(keys), BATCH_GET_SIZE):
+        request = {'Keys': keys[idx:idx + BATCH_GET_SIZE], 'ProjectionExpression': projection}
+        if consistent:
+            request['ConsistentRead'] = True
+        if attribute_names:
+            request['ExpressionAttributeNames'] = attribute_names
+        request_items = {table_name: request}
+        attempt = 0
+
+        while request_items:
+            response = _DYNAMODB.meta.client.batch_get_item(RequestItems=request_items)
+            found.extend(response.get('Responses', {}).get(table_name, []))
+
+            request_items = response.get('UnprocessedKeys') or {}
+            if not request_items:
+                break
+
+            attempt += 1
+            if attempt >= BATCH_MAX_ATTEMPTS:
+                raise RuntimeError(f'BatchGetItem left unprocessed keys after {attempt} attempts')
+
+            time.sleep(min(0.05 * (2 ** attempt), 2.0))
+
+    return found
+
+
+def _existing_keys(table_name, keys, consistent=False):
+    return {(item['pk'], item['sk']) for item in _batch_get_items(table_name, keys, 'pk, sk', consistent=consistent)}
+
+
+def _prune_legacy_items(table_name, items, key_attribute):
+    # A legacy item is deleted only once its sharded copy is readable.
+    sharded = [{'pk': _partition_key(item[key_attribute]), 'sk': item['sk']} for item in items]
+    copied = _existing_keys(table_name, sharded)
+    deletes = [
+        {'DeleteRequest': {'Key': {'pk': LEGACY_PARTITION, 'sk': key['sk']}}}
+        for key in sharded if (key['pk'], key['sk']) in copied
+    ]
+
+    if table_name == LUNKER_TABLE:
+        # The marker reaches the action Lambda in the REMOVE image, so the SLD registry keeps the watcher.
+        for delete in deletes:
+            _LUNKER.update_item(
+                Key=delete['DeleteRequest']['Key'],
+                UpdateExpression='SET pruned = :pruned',
+                ExpressionAttributeValues={':pruned': int(time.time())}
+            )
+
+    for idx in range(0, len(deletes), BATCH_SIZE):
+        _batch_write(deletes[idx:idx + BATCH_SIZE], table_name)
+
+    return len(deletes)
+
+
+def _run_migration(migration, context):
+    table_name, table = {
+        'lunker': (LUNKER_TABLE, _LUNKER),
+        'permutation': (PERMUTATION_TABLE, _PERMUTATION)
+    }[migration['migrate']]
+    key_attribute = _MIGRATION_KEYS[migration['migrate']]
+
+    query_kwargs = {'KeyConditionExpression': Key('pk').eq(LEGACY_PARTITION)}
+    if migration['cursor']:
+        query_kwargs['ExclusiveStartKey'] = migration['cursor']
+
+    scanned = 0
+    copied = 0
+    skipped = 0
+    deleted = 0
+    complete = True
+
+    while True:
+        response = table.query(**query_kwargs)
+        items = response.get('Items', [])
+        scanned += len(items)
+        movable = [item for item in items if item.get(key_attribute)]
+        skipped += len(items) - len(movable)
+
+        if migration['action'] == 'prune':
+            deleted += _prune_legacy_items(table_name, movable, key_attribute)
+        else:
+            for item in movable:
+                if _copy_legacy_item(table_name, item, _partition_key(item[key_attribute])):
+                    copied += 1
+                else:
+                    skipped += 1
+
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            break
+        query_kwargs['ExclusiveStartKey'] = last_key
+
+        if context is not None and context.get_remaining_time_in_millis() < TIME_MARGIN_MS:
+            # Continue from the last page in a fresh invocation.
+            _invoke_shard(context, {**migration, 'cursor': last_key})
+            complete = False
+            break
+
+    return {
+        'mode': 'migrate',
+        'table': migration['migrate'],
+        'action': migration['action'],
+        'key_shards': KEY_SHARDS,
+        'items_scanned': scanned,
+        'items_copied': copied,
+        'items_skipped': skipped,
+        'items_deleted': deleted,
+        'complete': complete
+    }
+
+
+def handler(event, context):
+    migration = _requested_migration(event)
+    if migration:
+        if KEY_MODE not in ('dual', 'sharded'):
+            return {
+                'statusCode': 400,
+                'body': 'Set LUNKER_KEY_MODE to dual or sharded before migrating.'
+            }
+
+        body = _run_migration(migration, context)
+        print('MIGRATION_RUN ' + ' '.join(f'{key}={value}' for key, value in body.items()))
+        return {
+            'statusCode': 200,
+            'body': body
+        }
+
+    if isinstance(event, dict) and event.get('registry') == 'rebuild':
+        body = _rebuild_registry()
+        print('REGISTRY_RUN ' + ' '.join(f'{key}={value}' for key, value in body.items()))
+        return {
+            'statusCode': 200,
+            'body': body
+        }
+
+    collect = _requested_collection(event)
+    if collect:
+        collected = _collect_unwatched(collect)
+        print('Collected: ' + str(collected))
+        return {
+            'statusCode': 200,
+            'body': {
+                'mode': 'collect',
+                'sld_count': len(collect),
+                'items_collected': len(collected)
+            }
+        }
 
-def handler(event, _context):
     requested = _requested_slds(event)
-    slds = requested or _unique_slds_from_lunker_tk_index()
-    written = 0
 
-    for sld in slds:
-        perms = _recommended_permutations(sld)
-        _write_permutations(sld, perms)
-        written += 1
+    if requested:
+        written = _write_requested(requested)
+
+        return {
+            'statusCode': 200,
+            'body': {
+                'mode': 'single',
+                'sld_count': len(requested),
+                'items_written': written
+            }
+        }
+
+    shard = _requested_shard(event)
+    if shard:
+        body = _run_shard(shard, context)
+        print('PERMUTATION_RUN ' + ' '.join(f'{key}={value}' for key, value in body.items()))
+        return {
+            'statusCode': 200,
+            'body': body
+        }
+
+    if SHARDS > 1:
+        return {
+            'statusCode': 200,
+            'body': _dispatch_shards(context)
+        }
+
+    slds = _watched_slds()
+    summary = _full_run(slds)
+    print(f'PERMUTATION_RUN sld_count={len(slds)} ' + ' '.join(f'{key}={value}' for key, value in summary.items()))
 
     return {
         'statusCode': 200,
         'body': {
-            'mode': 'single' if requested else 'full',
+            'mode': 'full',
             'sld_count': len(slds),
-            'items_written': written
+            **summary
         }
     }
@@ -0,0 +1,155 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+# Prevent boto3 from attempting metadata lookups during import in test environments.
+os.environ.setdefault('AWS_EC2_METADATA_DISABLED', 'true')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from action import action
+from botocore.exceptions import ClientError
+
+
+def _record(sld, sequence, event_name='INSERT', email='user@example.com'):
+    sk = f'LUNKER#{email}#{sld}.com#'
+    image = {'sk': {'S': sk}, 'sld': {'S': sld}}
+    return {
+        'eventName': event_name,
+        'dynamodb': {
+            'Keys': {'pk': {'S': 'LUNKER#'}, 'sk': {'S': sk}},
+            'SequenceNumber': sequence,
+            **({'OldImage': image} if event_name == 'REMOVE' else {'NewImage': image}),
+        },
+    }
+
+
+class FakeRegistryTable:
+    def __init__(self, watchers=None):
+        self.watchers = {sld: set(values) for sld, values in (watchers or {}).items()}
+        self.deleted = []
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues, ReturnValues):
+        sld = Key['sk'].split('#')[1]
+        current = self.watchers.setdefault(sld, set())
+        if ':added' in ExpressionAttributeValues:
+            current.update(ExpressionAttributeValues[':added'])
+        else:
+            current.difference_update(ExpressionAttributeValues[':removed'])
+        return {'Attributes': {**Key, 'watchers': set(current)} if current else dict(Key)}
+
+    def delete_item(self, Key, ConditionExpression):
+        sld = Key['sk'].split('#')[1]
+        if self.watchers.get(sld):
+            raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'DeleteItem')
+        self.watchers.pop(sld, None)
+        self.deleted.append(sld)
+
+
+class ActionHandlerTests(unittest.TestCase):
+    def setUp(self):
+        os.environ['PERMUTATION_FUNCTION_NAME'] = 'permutation'
+        os.environ['FUNCTION_NAME'] = 'searchlist'
+        os.environ['PERMUTATION_TABLE'] = 'permutation'
+        self.registry = FakeRegistryTable({'gone': {action.watcher_id('LUNKER#user@example.com#gone.com#')}})
+        patcher = patch.object(action.dynamodb, 'Table', return_value=self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_dedupes_slds_within_a_batch(self):
+        records = [_record('example', '1'), _record('example', '2'), _record('test', '3'), _record('gone', '4', 'REMOVE')]
+
+        with patch.object(action.lambda_client, 'invoke') as invoke:
+            response = action.handler({'Records': records}, None)
+
+        self.assertEqual(response, {'batchItemFailures': []})
+        invoked = sorted((call.kwargs['FunctionName'], call.kwargs['Payload']) for call in invoke.call_args_list)
+        self.assertEqual(invoked, [
+            ('permutation', '{"collect": ["gone"]}'),
+            ('permutation', '{"slds": ["example", "test"]}'),
+            ('searchlist', '{"Status": "example"}'),
+            ('searchlist', '{"Status": "test"}'),
+        ])
+        self.assertEqual(self.registry.deleted, ['gone'])
+
+    def test_reports_only_records_of_failed_slds(self):
+        records = [_record('example', '1'), _record('test', '2'), _record('test', '3')]
+
+        def invoke(**kwargs):
+            if kwargs['Payload'] == '{"Status": "test"}' and kwargs['FunctionName'] == 'searchlist':
+                raise ClientError({'Error': {'Code': 'TooManyRequestsException'}}, 'Invoke')
+
+        with patch.object(action.lambda_client, 'invoke', side_effect=invoke):
+            response = action.handler({'Records': records}, None)
+
+        self.assertEqual(response, {'batchItemFailures': [{'itemIdentifier': '2'}, {'itemIdentifier': '3'}]})
+
+    def test_failed_permutation_request_fails_every_record(self):
+        records = [_record('example', '1'), _record('test', '2')]
+
+        def invoke(**kwargs):
+            if kwargs['FunctionName'] == 'permutation':
+                raise ClientError({'Error': {'Code': 'TooManyRequestsException'}}, 'Invoke')
+
+        with patch.object(action.lambda_client, 'invoke', side_effect=invoke):
+            response = action.handler({'Records': records}, None)
+
+        self.assertEqual(response, {'batchItemFailures': [{'itemIdentifier': '1'}, {'itemIdentifier': '2'}]})
+
+    def test_ignores_copies_made_by_the_partition_backfill(self):
+        migrated = _record('example', '2')
+        migrated['dynamodb']['NewImage']['migrated'] = {'N': '1792300000'}
+
+        with patch.object(action.lambda_client, 'invoke') as invoke:
+            response = action.handler({'Records': [_record('test', '1'), migrated]}, None)
+
+        self.assertEqual(response, {'batchItemFailures': []})
+        self.assertEqual(
+            sorted(call.kwargs['Payload'] for call in invoke.call_args_list),
+            ['{"Status": "test"}', '{"slds": ["test"]}']
+        )
+
+    def test_registry_counts_each_watcher_once(self):
+        records = [
+            _record('example', '1'),
+            _record('example', '2'),
+            _record('example', '3', email='other@example.com'),
+            _record('example', '4', 'REMOVE'),
+        ]
+
+        with patch.object(action.lambda_client, 'invoke'):
+            action.handler({'Records': records}, None)
+            action.handler({'Records': records}, None)
+
+        self.assertEqual(self.registry.watchers['example'], {action.watcher_id('LUNKER#other@example.com#example.com#')})
+
+    def test_pruned_legacy_copies_keep_their_watcher(self):
+        pruned = _record('gone', '1', 'REMOVE')
+        pruned['dynamodb']['OldImage']['pruned'] = {'N': '1792300000'}
+
+        with patch.object(action.lambda_client, 'invoke') as invoke:
+            action.handler({'Records': [pruned]}, None)
+
+        invoke.assert_not_called()
+        self.assertEqual(len(self.registry.watchers['gone']), 1)
+
+    def test_registry_failure_fails_the_sld_without_invoking(self):
+        self.registry.update_item = MagicMock(side_effect=ClientError({'Error': {'Code': 'ThrottlingException'}}, 'UpdateItem'))
+
+        with patch.object(action.lambda_client, 'invoke') as invoke:
+            response = action.handler({'Records': [_record('example', '1')]}, None)
+
+        invoke.assert_not_called()
+        self.assertEqual(response, {'batchItemFailures': [{'itemIdentifier': '1'}]})
+
+    def test_empty_batch_invokes_nothing(self):
+        with patch.object(action.lambda_client, 'invoke') as invoke:
+            response = action.handler({'Records': []}, None)
+
+        invoke.assert_not_called()
+        self.assertEqual(response, {'batchItemFailures': []})
+
+
+if __name__ == '__main__':
+    unittest.main()
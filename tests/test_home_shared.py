@@ -1,6 +1,15 @@
+import base64
+from boto3.dynamodb.types import TypeDeserializer
+import gzip
+import hashlib
+import math
 import os
+import random
+import re
+import tempfile
+import threading
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 import json
 import time
 
@@ -24,6 +33,8 @@ class WebUiHandlerTests(unittest.TestCase):
         home_shared.MATCHED_SLD_CACHE.clear()
         home_shared.SEARCH_FIELDS_CACHE.clear()
         home_shared.TABLE_CACHE.clear()
+        home_shared.TLD_CACHE.clear()
+        home_shared.SECTION_CACHE.clear()
 
     def test_get_request_renders_form(self):
         event = {
@@ -83,7 +94,9 @@ class WebUiHandlerTests(unittest.TestCase):
             'body': json.dumps({'action': 'GetDomainSections', 'entry': 'example.com'}),
         }
 
-        with patch.object(home_shared, '_get_domain_sections', side_effect=ValueError('boom')):
+        with patch.object(home_shared, '_get_domain_sections', side_effect=ValueError('boom')), \
+            patch.object(home_shared, '_get_permutation_count', side_effect=ValueError('boom')), \
+            patch.object(home_shared, '_get_possibility_count', side_effect=ValueError('boom')):
             response = home_shared._handle_request(event, None)
 
         payload = json.loads(response['body'])
@@ -91,6 +104,26 @@ class WebUiHandlerTests(unittest.TestCase):
         self.assertEqual(payload['permutations'], 0)
         self.assertEqual(payload['possibilities'], 0)
 
+    def test_post_get_domain_sections_keeps_counts_when_sections_fail(self):
+        event = {
+            'requestContext': {
+                'http': {
+                    'method': 'POST'
+                }
+            },
+            'body': json.dumps({'action': 'GetDomainSections', 'entry': 'example.com'}),
+        }
+
+        with patch.object(home_shared, '_get_domain_sections', side_effect=ValueError('boom')), \
+            patch.object(home_shared, '_get_permutation_count', return_value=7), \
+            patch.object(home_shared, '_get_possibility_count', return_value=5):
+            response = home_shared._handle_request(event, None)
+
+        payload = json.loads(response['body'])
+        self.assertEqual(payload['sections'], {})
+        self.assertEqual(payload['permutations'], 7)
+        self.assertEqual(payload['possibilities'], 5)
+
     def test_post_get_domain_sections_action_is_case_and_whitespace_insensitive(self):
         event = {
             'requestContext': {
@@ -112,9 +145,49 @@ class WebUiHandlerTests(unittest.TestCase):
         self.assertEqual(payload['sections'], expected_sections)
         self.assertEqual(payload['permutations'], 3)
         self.assertEqual(payload['possibilities'], 2)
-        get_sections.assert_called_once_with('example.com')
-        get_count.assert_called_once_with('example.com')
-        get_possibility_count.assert_called_once_with('example.com')
+        get_sections.assert_called_once_with('example.com', False, set())
+        get_count.assert_called_once_with('example.com', False)
+        get_possibility_count.assert_called_once_with('example.com', False)
+
+    def test_post_get_domain_sections_batch_success(self):
+        event = {
+            'requestContext': {
+                'http': {
+                    'method': 'POST'
+                }
+            },
+            'body': json.dumps({'action': 'GetDomainSectionsBatch', 'domains': ['example.com', 'test.com']}),
+        }
+
+        expected_details = {
+            'example.com': {'sections': {}, 'permutations': 3, 'possibilities': 1},
+            'test.com': {'sections': {}, 'permutations': 0, 'possibilities': 0},
+        }
+
+        with patch.object(home_shared, '_get_domain_details_batch', return_value=expected_details) as get_batch:
+            response = home_shared._handle_request(event, None)
+
+        payload = json.loads(response['body'])
+        self.assertEqual(response['headers']['Content-Type'], 'application/json; charset=utf-8')
+        self.assertEqual(payload['domains'], expected_details)
+        get_batch.assert_called_once_with(['example.com', 'test.com'])
+
+    def test_post_get_domain_sections_batch_with_non_list_domains(self):
+        event = {
+            'requestContext': {
+                'http': {
+                    'method': 'POST'
+                }
+            },
+            'body': json.dumps({'action': 'GetDomainSectionsBatch', 'domains': 'example.com'}),
+        }
+
+        with patch.object(home_shared, '_get_domain_details_batch', return_value={}) as get_batch:
+            response = home_shared._handle_request(event, None)
+
+        payload = json.loads(response['body'])
+        self.assertEqual(payload['domains'], {})
+        get_batch.assert_called_once_with([])
 
     def test_post_get_domain_possibilities_success(self):
         event = {
@@ -245,6 +318,75 @@ class WebUiHandlerTests(unittest.TestCase):
 
         self.assertEqual(possibilities, [])
 
+    def test_post_get_domain_possibilities_returns_page_and_cursor(self):
+        event = {
+            'requestContext': {
+                'http': {
+                    'method': 'POST'
+                }
+            },
+            'body': json.dumps({'action': 'GetDomainPossibilities', 'entry': 'example.com', 'limit': 2}),
+        }
+
+        with patch.object(home_shared, '_get_domain_possibilities_page', return_value=(['alpha.com'], 'cursor')) as get_page, \
+                patch.object(home_shared, '_get_domain_possibilities') as get_all:
+            response = home_shared._handle_request(event, None)
+
+        payload = json.loads(response['body'])
+        self.assertEqual(payload, {'possibilities': ['alpha.com'], 'next': 'cursor'})
+        get_page.assert_called_once_with('example.com', 2, None, bypass_cache=False)
+        get_all.assert_not_called()
+
+    def test_possibility_pages_resume_from_cursor(self):
+        responses = [
+            {
+                'Items': [{'sk': {'S': 'LUNKER#example#alpha.com'}}, {'sk': {'S': 'LUNKER#example#beta.com'}}],
+                'LastEvaluatedKey': {'pk': {'S': 'LUNKER#'}, 'sk': {'S': 'LUNKER#example#beta.com'}},
+            },
+            {
+                'Items': [{'sk': {'S': 'LUNKER#example#gamma.com'}}],
+            },
+        ]
+
+        with patch.object(home_shared, '_resolve_exact_table_identifier', return_value=['possibilities']), \
+                patch.object(home_shared.DYNAMODB_CLIENT, 'query', side_effect=responses) as query:
+            first_page, cursor = home_shared._get_domain_possibilities_page('example.com', 2)
+            second_page, last_cursor = home_shared._get_domain_possibilities_page('example.com', 2, cursor)
+
+        self.assertEqual(first_page, ['alpha.com', 'beta.com'])
+        self.assertEqual(second_page, ['gamma.com'])
+        self.assertIsNone(last_cursor)
+        self.assertEqual(query.call_args_list[0].kwargs['Limit'], 2)
+        self.assertEqual(query.call_args_list[1].kwargs['ExclusiveStartKey'], responses[0]['LastEvaluatedKey'])
+
+    def test_possibility_cursor_cannot_leave_the_sld(self):
+        cursor = home_shared._encode_possibility_cursor(
+            'possibilities',
+            {'pk': {'S': 'LUNKER#'}, 'sk': {'S': 'LUNKER#other#alpha.com'}},
+        )
+        event = {
+            'requestContext': {
+                'http': {
+                    'method': 'POST'
+                }
+            },
+            'body': json.dumps({'action': 'GetDomainPossibilities', 'entry': 'example.com', 'next': cursor}),
+        }
+
+        with patch.object(home_shared, '_resolve_exact_table_identifier', return_value=['possibilities']), \
+                patch.object(home_shared.DYNAMODB_CLIENT, 'query') as query:
+            response = home_shared._handle_request(event, None)
+            malformed = home_shared._handle_request({**event, 'body': json.dumps({'action': 'GetDomainPossibilities', 'entry': 'example.com', 'next': '!!'})}, None)
+
+        self.assertEqual(response['statusCode'], 400)
+        self.assertEqual(malformed['statusCode'], 400)
+        query.assert_not_called()
+
+    def test_possibility_page_limit_is_clamped(self):
+        self.assertEqual(home_shared._possibility_page_limit('bad'), home_shared.POSSIBILITIES_PAGE_DEFAULT_LIMIT)
+        self.assertEqual(home_shared._possibility_page_limit(0), 1)
+        self.assertEqual(home_shared._possibility_page_limit(10 ** 6), home_shared.POSSIBILITIES_PAGE_MAX_LIMIT)
+
     def test_resolve_exact_table_identifier_uses_raw_arn_only(self):
         with patch.dict(os.environ, {'POSSIBILITIES_TABLE': 'arn:aws:dynamodb:us-east-2:123456789012:table/possibilities'}):
             identifiers = home_shared._resolve_exact_table_identifier('POSSIBILITIES_TABLE', 'possibilities')
@@ -497,7 +639,20 @@ class CreateHandlerTests(unittest.TestCase):
         self.assertEqual(home_shared.USER_INFO_ENDPOINT, old_user_info)
 
 
+def _section_loader(results_by_env_key, delays_by_env_key=None):
+    def load_sections(_client, _sld, *env_keys):
+        delay = (delays_by_env_key or {}).get(env_keys[0], 0)
+        if delay:
+            time.sleep(delay)
+        return results_by_env_key.get(env_keys[0], [])
+
+    return load_sections
+
+
 class DomainSectionsTests(unittest.TestCase):
+    def setUp(self):
+        home_shared.SECTION_CACHE.clear()
+
     def test_invalid_domain_returns_empty_sections(self):
         self.assertEqual(GET_DOMAIN_SECTIONS('invalid-domain'), {})
 
@@ -505,20 +660,10 @@ class DomainSectionsTests(unittest.TestCase):
         osint_domains = ['phreeesia.com']
         malware_domains = ['evil-phreeesia.net']
 
-        with patch.object(home_shared, '_load_section_domains') as load_sections:
-            load_sections.side_effect = [
-                osint_domains,
-                malware_domains,
-                [],
-                [],
-                [],
-                [],
-                [],
-                [],
-                [],
-                [],
-            ]
-
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({
+            'WM_OSINT': osint_domains,
+            'WM_MALWARE': malware_domains,
+        })):
             sections = GET_DOMAIN_SECTIONS('phreeesia.com')
 
         self.assertEqual(sections['suspect']['openSourceIntelligence'], osint_domains)
@@ -527,25 +672,595 @@ class DomainSectionsTests(unittest.TestCase):
     def test_domain_in_both_tables_appears_in_both_sections(self):
         overlap_domain = ['phreeesia.com']
 
-        with patch.object(home_shared, '_load_section_domains') as load_sections:
-            load_sections.side_effect = [
-                overlap_domain,
-                overlap_domain,
-                [],
-                [],
-                [],
-                [],
-                [],
-                [],
-                [],
-                [],
-            ]
-
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({
+            'WM_OSINT': overlap_domain,
+            'WM_MALWARE': overlap_domain,
+        })):
             sections = GET_DOMAIN_SECTIONS('phreeesia.com')
 
         self.assertEqual(sections['suspect']['openSourceIntelligence'], overlap_domain)
         self.assertEqual(sections['suspect']['domainsMonitorSubscription'], overlap_domain)
 
+    def test_all_section_tables_are_queried(self):
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({})) as load_sections:
+            sections = GET_DOMAIN_SECTIONS('example.com')
+
+        queried_env_keys = sorted(call.args[2:] for call in load_sections.call_args_list)
+        self.assertEqual(queried_env_keys, sorted(env_keys for _, _, env_keys in home_shared.DOMAIN_SECTION_LOOKUPS))
+        self.assertEqual(sections['newRegistrations'], {'daily': [], 'weekly': [], 'monthly': []})
+        self.assertEqual(sections['expiredRegistrations'], {'daily': [], 'weekly': [], 'monthly': []})
+
+    def test_slow_table_returns_partial_sections_within_deadline(self):
+        with patch.object(home_shared, 'DOMAIN_LOOKUP_TIMEOUT_SECONDS', 0.2), \
+                patch.object(home_shared, '_load_section_domains', side_effect=_section_loader(
+                    {'WM_OSINT': ['example-login.com'], 'WM_DAILYUPDATE': ['example-new.com']},
+                    {'WM_DAILYUPDATE': 1.0},
+                )):
+            started_at = time.monotonic()
+            sections = GET_DOMAIN_SECTIONS('example.com')
+            elapsed = time.monotonic() - started_at
+
+        self.assertLess(elapsed, 0.9)
+        self.assertEqual(sections['suspect']['openSourceIntelligence'], ['example-login.com'])
+        self.assertEqual(sections['newRegistrations']['daily'], [])
+
+    def test_section_lookup_errors_are_isolated(self):
+        def load_sections(_client, _sld, *env_keys):
+            if env_keys[0] == 'WM_MALWARE':
+                raise TypeError('boom')
+            return ['example-login.com']
+
+        with patch.object(home_shared, '_load_section_domains', side_effect=load_sections):
+            sections = GET_DOMAIN_SECTIONS('example.com')
+
+        self.assertEqual(sections['suspect']['domainsMonitorSubscription'], [])
+        self.assertEqual(sections['suspect']['openSourceIntelligence'], ['example-login.com'])
+
+
+class DomainDetailsBatchTests(unittest.TestCase):
+    def setUp(self):
+        home_shared.SECTION_CACHE.clear()
+
+    def test_batch_queries_each_table_once_per_distinct_sld(self):
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({
+            'WM_OSINT': ['example-login.com'],
+        })) as load_sections, \
+                patch.object(home_shared, '_get_permutation_count', return_value=4) as get_count, \
+                patch.object(home_shared, '_get_possibility_count', return_value=2) as get_possibility_count:
+            details = home_shared._get_domain_details_batch(['example.com', 'Example.NET', 'example.com', 'test.org'])
+
+        self.assertEqual(sorted(details), ['example.com', 'example.net', 'test.org'])
+        self.assertEqual(load_sections.call_count, 2 * len(home_shared.DOMAIN_SECTION_LOOKUPS))
+        self.assertEqual(sorted(call.args[1] for call in load_sections.call_args_list).count('example'), len(home_shared.DOMAIN_SECTION_LOOKUPS))
+        self.assertEqual(get_count.call_count, 2)
+        self.assertEqual(get_possibility_count.call_count, 2)
+        self.assertEqual(details['example.com'], details['example.net'])
+        self.assertEqual(details['example.com']['sections']['suspect']['openSourceIntelligence'], ['example-login.com'])
+        self.assertEqual(details['test.org']['permutations'], 4)
+        self.assertEqual(details['test.org']['possibilities'], 2)
+
+    def test_batch_flags_slds_with_timed_out_lookups_as_partial(self):
+        with patch.object(home_shared, 'DOMAIN_LOOKUP_TIMEOUT_SECONDS', 0.2), \
+                patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({}, {'WM_OSINT': 1.0})), \
+                patch.object(home_shared, '_get_permutation_count', return_value=1), \
+                patch.object(home_shared, '_get_possibility_count', return_value=1):
+            details = home_shared._get_domain_details_batch(['slow.com'])
+
+        self.assertTrue(details['slow.com']['partial'])
+        self.assertEqual(home_shared._get_cached_sections('slow').get(('suspect', 'openSourceIntelligence')), None)
+
+    def test_batch_marks_complete_slds_as_not_partial(self):
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({})), \
+                patch.object(home_shared, '_get_permutation_count', return_value=0), \
+                patch.object(home_shared, '_get_possibility_count', side_effect=ValueError('boom')):
+            failed = home_shared._get_domain_details_batch(['example.com'])
+
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({})), \
+                patch.object(home_shared, '_get_permutation_count', return_value=0), \
+                patch.object(home_shared, '_get_possibility_count', return_value=0):
+            complete = home_shared._get_domain_details_batch(['other.com'])
+
+        self.assertTrue(failed['example.com']['partial'])
+        self.assertFalse(complete['other.com']['partial'])
+
+    def test_single_lookup_reports_partial_results(self):
+        event = {
+            'requestContext': {'http': {'method': 'POST'}},
+            'body': json.dumps({'action': 'GetDomainSections', 'entry': 'example.com'}),
+        }
+
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({})), \
+                patch.object(home_shared, '_get_permutation_count', side_effect=TypeError('boom')), \
+                patch.object(home_shared, '_get_possibility_count', return_value=0):
+            response = home_shared._handle_request(event, None)
+
+        self.assertTrue(json.loads(response['body'])['partial'])
+
+    def test_batch_skips_invalid_domains(self):
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({})) as load_sections:
+            details = home_shared._get_domain_details_batch(['invalid', 'sub.example.com', None])
+
+        self.assertEqual(details, {})
+        load_sections.assert_not_called()
+
+    def test_batch_limits_distinct_slds(self):
+        domains = [f'site{idx}.com' for idx in range(5)]
+
+        with patch.object(home_shared, 'DOMAIN_SECTIONS_BATCH_MAX_SLDS', 2), \
+                patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({})), \
+                patch.object(home_shared, '_get_permutation_count', return_value=0), \
+                patch.object(home_shared, '_get_possibility_count', return_value=0):
+            details = home_shared._get_domain_details_batch(domains)
+
+        self.assertEqual(sorted(details), ['site0.com', 'site1.com'])
+
+
+class LruTtlCacheTests(unittest.TestCase):
+    def test_get_refreshes_recency_before_eviction(self):
+        cache = home_shared.LruTtlCache('test', 60, 2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+
+        self.assertEqual(list(cache), ['a', 'c'])
+        self.assertEqual(cache.snapshot()['evictions'], 1)
+
+    def test_expired_entries_miss_and_are_removed(self):
+        cache = home_shared.LruTtlCache('test', 60, 4)
+        cache.set('stale', 'value', ttl_seconds=-1)
+
+        self.assertIsNone(cache.get('stale'))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.snapshot()['misses'], 1)
+        self.assertEqual(cache.snapshot()['expirations'], 1)
+
+    def test_writes_sweep_expired_entries_proactively(self):
+        cache = home_shared.LruTtlCache('test', 60, 10)
+        cache.set('stale-a', 'value', ttl_seconds=-1)
+        cache.set('stale-b', 'value', ttl_seconds=-1)
+        cache._next_sweep_at = 0.0
+        cache.set('fresh', 'value')
+
+        self.assertEqual(list(cache), ['fresh'])
+        self.assertEqual(cache.snapshot()['expirations'], 2)
+
+    def test_byte_limit_evicts_oldest_entries(self):
+        cache = home_shared.LruTtlCache('test', 60, 10, max_bytes=10)
+        cache.set('a', 'x' * 6)
+        cache.set('b', 'y' * 6)
+
+        self.assertEqual(list(cache), ['b'])
+        self.assertEqual(cache.snapshot()['bytes'], 6)
+
+    def test_values_larger_than_byte_limit_are_not_cached(self):
+        cache = home_shared.LruTtlCache('test', 60, 10, max_bytes=4)
+        cache.set('a', 'x' * 5)
+
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.snapshot()['bytes'], 0)
+
+    def test_bypass_is_counted_and_skips_lookup(self):
+        cache = home_shared.LruTtlCache('test', 60, 10)
+        cache.set('a', 1)
+
+        self.assertIsNone(cache.get('a', bypass=True))
+        self.assertEqual(cache.snapshot()['bypasses'], 1)
+        self.assertEqual(cache.snapshot()['hits'], 0)
+
+    def test_cache_stats_cover_every_shared_cache(self):
+        self.assertEqual(sorted(home_shared._cache_stats()), ['identity', 'matchedSlds', 'searchFieldMembership', 'searchFields', 'sections', 'subjects'])
+
+    def test_matched_slds_cache_is_bounded(self):
+        home_shared.MATCHED_SLD_CACHE.clear()
+
+        with patch.object(home_shared.MATCHED_SLD_CACHE, 'max_entries', 2):
+            for index in range(3):
+                home_shared._cache_matched_slds((f'site{index}.com',), {f'site{index}'})
+
+        self.assertIsNone(home_shared._get_cached_matched_slds(('site0.com',)))
+        self.assertEqual(home_shared._get_cached_matched_slds(('site2.com',)), {'site2'})
+        home_shared.MATCHED_SLD_CACHE.clear()
+
+
+class SearchFieldMatchTests(unittest.TestCase):
+    def setUp(self):
+        home_shared.SEARCH_FIELDS_CACHE.clear()
+        home_shared.SEARCH_FIELD_MEMBERSHIP_CACHE.clear()
+        home_shared.SEARCH_FIELD_SCAN_COSTS.clear()
+        for env_key in home_shared.SEARCH_FIELD_TABLE_ENV_KEYS:
+            self.addCleanup(os.environ.pop, env_key, None)
+        os.environ['WM_OSINT'] = 'osint'
+        patcher = patch.object(home_shared, '_load_search_field_snapshot', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _query(self, search_fields):
+        def query(**kwargs):
+            prefix = kwargs['ExpressionAttributeValues'][':sk']['S']
+            items = [
+                {'sk': {'S': f'LUNKER#{field}#{field}-login.com#'}, 'search': {'S': field}}
+                for field in sorted(search_fields)
+                if f'LUNKER#{field}#{field}-login.com#'.startswith(prefix)
+            ]
+            return {'Items': items[:kwargs.get('Limit', len(items))], 'ConsumedCapacity': {'CapacityUnits': 80.0}}
+
+        return query
+
+    def test_small_domain_lists_use_keyed_lookups(self):
+        with patch.object(home_shared.DYNAMODB_CLIENT, 'query', side_effect=self._query({'example', 'examples'})) as query:
+            matched = home_shared._get_search_field_matches(['example.com', 'other.com'])
+
+        self.assertEqual(matched, {'example'})
+        prefixes = sorted(call.kwargs['ExpressionAttributeValues'][':sk']['S'] for call in query.call_args_list)
+        # A hit stops at the first prefix; a miss checks both disjoint prefixes and never pages.
+        self.assertEqual(prefixes, ['LUNKER#example#', 'LUNKER#other#', 'LUNKER#other.'])
+        self.assertTrue(all(call.kwargs['Limit'] == 1 for call in query.call_args_list))
+        self.assertNotIn('osint', home_shared.SEARCH_FIELDS_CACHE)
+
+    def test_keyed_membership_is_cached(self):
+        with patch.object(home_shared.DYNAMODB_CLIENT, 'query', side_effect=self._query({'example'})) as query:
+            home_shared._get_search_field_matches(['example.com'])
+            matched = home_shared._get_search_field_matches(['example.net'])
+
+        self.assertEqual(matched, {'example'})
+        self.assertEqual(query.call_count, 1)
+
+    def test_large_domain_lists_switch_to_full_partition_read(self):
+        domains = [f'site{index}.com' for index in range(4)]
+
+        with patch.object(home_shared, 'SEARCH_FIELD_DEFAULT_SCAN_RCU', 1.0), \
+                patch.object(home_shared.DYNAMODB_CLIENT, 'query', side_effect=self._query({'site1', 'site3'})) as query:
+            matched = home_shared._get_search_field_matches(domains)
+
+        self.assertEqual(matched, {'site1', 'site3'})
+        self.assertEqual(query.call_count, 1)
+        self.assertEqual(query.call_args.kwargs['ExpressionAttributeValues'][':sk']['S'], 'LUNKER#')
+        self.assertEqual(home_shared.SEARCH_FIELD_SCAN_COSTS['osint'], 80.0)
+        self.assertEqual(home_shared.SEARCH_FIELDS_CACHE.get('osint'), frozenset({'site1', 'site3'}))
+
+    def test_observed_scan_cost_drives_the_choice(self):
+        home_shared.SEARCH_FIELD_SCAN_COSTS['osint'] = 100.0
+        domains = [f'site{index}.com' for index in range(20)]
+
+        with patch.object(home_shared, 'SEARCH_FIELD_DEFAULT_SCAN_RCU', 1.0), \
+                patch.object(home_shared.DYNAMODB_CLIENT, 'query', side_effect=self._query({'site7'})) as query:
+            matched = home_shared._get_search_field_matches(domains)
+
+        self.assertEqual(matched, {'site7'})
+        self.assertEqual(query.call_count, 39)
+
+    def test_fresh_full_snapshot_answers_without_queries(self):
+        home_shared._cache_search_fields('osint', {'example'})
+
+        with patch.object(home_shared.DYNAMODB_CLIENT, 'query') as query:
+            matched = home_shared._get_search_field_matches(['example.com', 'other.com'])
+
+        self.assertEqual(matched, {'example'})
+        query.assert_not_called()
+
+    def test_failed_keyed_lookups_are_not_cached(self):
+        with patch.object(home_shared.DYNAMODB_CLIENT, 'query', side_effect=TypeError('boom')):
+            matched = home_shared._get_search_field_matches(['example.com'])
+
+        self.assertEqual(matched, set())
+        self.assertNotIn(('osint', 'example'), home_shared.SEARCH_FIELD_MEMBERSHIP_CACHE)
+
+
+class FakeSnapshotTable:
+    def __init__(self):
+        self.items = {}
+        self.get_calls = []
+
+    def get_item(self, Key, ProjectionExpression=None, ExpressionAttributeNames=None):
+        self.get_calls.append(ProjectionExpression)
+        item = self.items.get(Key['sk'])
+        if item is None:
+            return {}
+        if ProjectionExpression:
+            item = {name: item[name] for name in ExpressionAttributeNames.values() if name in item}
+        return {'Item': dict(item)}
+
+    def put_item(self, Item):
+        self.items[Item['sk']] = Item
+
+
+class SearchFieldSnapshotTests(unittest.TestCase):
+    def setUp(self):
+        home_shared.SEARCH_FIELDS_CACHE.clear()
+        home_shared.SEARCH_FIELD_MEMBERSHIP_CACHE.clear()
+        home_shared.SEARCH_FIELD_SNAPSHOTS.clear()
+        self.addCleanup(home_shared.SEARCH_FIELD_SNAPSHOTS.clear)
+        for env_key in home_shared.SEARCH_FIELD_TABLE_ENV_KEYS:
+            self.addCleanup(os.environ.pop, env_key, None)
+        os.environ['WM_OSINT'] = 'osint'
+        self.table = FakeSnapshotTable()
+        patcher = patch.object(home_shared, '_get_env_table', return_value=self.table)
+        self.get_env_table = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _publish(self, search_fields):
+        with patch.object(home_shared, '_query_search_fields', return_value=sorted(search_fields)):
+            return home_shared.search_field_snapshot_handler({}, None)
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        values = [f'site{index}' for index in range(2000)]
+        bits, bit_count, hash_count = home_shared._build_bloom_filter(values)
+        snapshot = {'bits': bits, 'bitCount': bit_count, 'hashCount': hash_count}
+
+        self.assertTrue(all(home_shared._bloom_contains(snapshot, value) for value in values))
+        false_positives = sum(home_shared._bloom_contains(snapshot, f'other{index}') for index in range(2000))
+        self.assertLess(false_positives, 20)
+
+    def test_job_writes_one_item_per_table(self):
+        response = self._publish({'example', 'sample'})
+
+        self.assertEqual(json.loads(response['body']), {'WM_OSINT': 'updated'})
+        item = self.table.items['SEARCHFIELDS#WM_OSINT#']
+        self.assertEqual(item['pk'], 'SNAPSHOT#')
+        self.get_env_table.assert_called_with('SEARCH_FIELD_SNAPSHOT_TABLE', 'searchfields')
+        self.assertEqual(item['count'], 2)
+        self.assertEqual(len(item['bits']) * 8, item['size'])
+
+    def test_unchanged_fields_are_not_written(self):
+        self._publish({'example'})
+        stored = dict(self.table.items['SEARCHFIELDS#WM_OSINT#'])
+        with patch.object(self.table, 'put_item') as put_item:
+            response = self._publish({'example'})
+
+        put_item.assert_not_called()
+        self.assertEqual(json.loads(response['body']), {'WM_OSINT': 'unchanged'})
+        self.assertEqual(self.table.items['SEARCHFIELDS#WM_OSINT#'], stored)
+
+    def test_matches_come_from_snapshot_without_queries(self):
+        self._publish({'example'})
+
+        with patch.object(home_shared.DYNAMODB_CLIENT, 'query') as query:
+            matched = home_shared._get_search_field_matches(['example.com', 'other.com'])
+
+        self.assertEqual(matched, {'example'})
+        query.assert_not_called()
+
+    def test_filter_is_downloaded_only_when_version_changes(self):
+        self._publish({'example'})
+        home_shared._load_search_field_snapshot('WM_OSINT')
+        home_shared.SEARCH_FIELD_SNAPSHOTS['WM_OSINT']['checkedAt'] = 0
+        home_shared._load_search_field_snapshot('WM_OSINT')
+
+        self.assertEqual([call is None for call in self.table.get_calls], [False, False, True, False])
+
+        self._publish({'example', 'sample'})
+        home_shared.SEARCH_FIELD_SNAPSHOTS['WM_OSINT']['checkedAt'] = 0
+        snapshot = home_shared._load_search_field_snapshot('WM_OSINT')
+
+        self.assertTrue(home_shared._bloom_contains(snapshot, 'sample'))
+
+    def test_missing_snapshot_falls_back_to_queries(self):
+        with patch.object(home_shared, '_match_search_fields', return_value={'example'}) as match:
+            matched = home_shared._get_search_field_matches(['example.com'])
+
+        self.assertEqual(matched, {'example'})
+        match.assert_called_once_with('osint', {'example'})
+
+
+class SectionCacheTests(unittest.TestCase):
+    def setUp(self):
+        home_shared.SECTION_CACHE.clear()
+
+    def test_repeat_lookup_is_served_from_cache(self):
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({'WM_OSINT': ['example-login.com']})) as load_sections:
+            first = GET_DOMAIN_SECTIONS('example.com')
+            second = GET_DOMAIN_SECTIONS('example.net')
+
+        self.assertEqual(first, second)
+        self.assertEqual(load_sections.call_count, len(home_shared.DOMAIN_SECTION_LOOKUPS))
+        self.assertEqual(home_shared.SECTION_CACHE.stats['hits'], len(home_shared.DOMAIN_SECTION_LOOKUPS))
+        self.assertIn(('example', 'WM_OSINT'), home_shared.SECTION_CACHE)
+
+    def test_bypass_forces_fresh_lookup_and_refreshes_cache(self):
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({'WM_OSINT': ['old.com']})):
+            GET_DOMAIN_SECTIONS('example.com')
+
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({'WM_OSINT': ['new.com']})) as load_sections:
+            refreshed = GET_DOMAIN_SECTIONS('example.com', bypass_cache=True)
+            cached = GET_DOMAIN_SECTIONS('example.com')
+
+        self.assertEqual(load_sections.call_count, len(home_shared.DOMAIN_SECTION_LOOKUPS))
+        self.assertEqual(refreshed['suspect']['openSourceIntelligence'], ['new.com'])
+        self.assertEqual(cached['suspect']['openSourceIntelligence'], ['new.com'])
+        self.assertEqual(home_shared.SECTION_CACHE.stats['bypasses'], len(home_shared.DOMAIN_SECTION_LOOKUPS))
+
+    def test_expired_tables_are_reloaded_individually(self):
+        with patch.dict(home_shared.SECTION_CACHE_TTL_SECONDS, {'suspect': -1}), \
+                patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({})) as load_sections:
+            GET_DOMAIN_SECTIONS('example.com')
+            GET_DOMAIN_SECTIONS('example.com')
+
+        reloaded = [call.args[2] for call in load_sections.call_args_list[len(home_shared.DOMAIN_SECTION_LOOKUPS):]]
+        self.assertEqual(sorted(reloaded), ['WM_MALWARE', 'WM_OSINT'])
+
+    def test_failed_tables_are_not_cached(self):
+        def load_sections(_client, _sld, *env_keys):
+            if env_keys[0] == 'WM_MALWARE':
+                raise TypeError('boom')
+            return []
+
+        with patch.object(home_shared, '_load_section_domains', side_effect=load_sections):
+            GET_DOMAIN_SECTIONS('example.com')
+
+        self.assertNotIn(('example', 'WM_MALWARE'), home_shared.SECTION_CACHE)
+        self.assertIn(('example', 'WM_OSINT'), home_shared.SECTION_CACHE)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        with patch.object(home_shared.SECTION_CACHE, 'max_entries', 2):
+            home_shared._section_cache_put(('a', 'WM_OSINT'), ['a.com'], 60)
+            home_shared._section_cache_put(('b', 'WM_OSINT'), ['b.com'], 60)
+            home_shared._section_cache_get(('a', 'WM_OSINT'))
+            home_shared._section_cache_put(('c', 'WM_OSINT'), ['c.com'], 60)
+
+        self.assertEqual(list(home_shared.SECTION_CACHE), [('a', 'WM_OSINT'), ('c', 'WM_OSINT')])
+        self.assertEqual(home_shared.SECTION_CACHE.stats['evictions'], 1)
+
+    def test_permutations_are_cached_per_sld(self):
+        table = MagicMock()
+        table.get_item.return_value = {'Item': {'perm': ['exampel', 'examp1e']}}
+
+        with patch.object(home_shared, '_get_env_table', return_value=table):
+            first = home_shared._get_domain_permutations('example.com')
+            second = home_shared._get_domain_permutations('example.org')
+            refreshed = home_shared._get_domain_permutations('example.com', bypass_cache=True)
+
+        self.assertEqual(first, ['exampel', 'examp1e'])
+        self.assertEqual(second, first)
+        self.assertEqual(refreshed, first)
+        self.assertEqual(table.get_item.call_count, 2)
+
+    def test_refresh_flag_bypasses_cache_in_handler(self):
+        event = {
+            'requestContext': {'http': {'method': 'POST'}},
+            'body': json.dumps({'action': 'GetDomainSections', 'entry': 'example.com', 'refresh': True}),
+        }
+
+        with patch.object(home_shared, '_get_domain_details', return_value=({}, 0, 0)) as get_details:
+            home_shared._handle_request(event, None)
+
+        get_details.assert_called_once_with('example.com', bypass_cache=True, failed=set())
+
+    def test_refresh_button_requests_fresh_data(self):
+        script = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], set()))
+        self.assertIn("body: JSON.stringify({ action: 'GetDomainSections', entry: domain, refresh: refreshRequested })", script)
+        self.assertIn("body: JSON.stringify({ action: 'GetDomainPermutations', entry: domain, refresh: refreshRequested })", script)
+        self.assertIn("body: JSON.stringify({ action: 'GetDomainPossibilities', entry: domain, limit: possibilitiesPageLimit, next, refresh })", script)
+        self.assertIn('refresh: refreshRequested,', script)
+        self.assertIn('refreshRequested = true;', script)
+
+    def test_possibilities_pages_load_on_demand_and_append(self):
+        script = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], set()))
+        self.assertIn('onclick="loadMorePossibilities(); return false;">Load more</a>', script)
+        self.assertIn("list.insertAdjacentHTML('beforeend', renderNumberedRows(items, true, extractSld(view.domain), view.permutationTerms));", script)
+        self.assertIn('appendPossibilities(view, fresh);', script)
+        self.assertNotIn('while (next)', script)
+
+
+class SectionMaterializationTests(unittest.TestCase):
+    def setUp(self):
+        home_shared.SECTION_CACHE.clear()
+        self.addCleanup(home_shared.SECTION_CACHE.clear)
+
+    def test_details_requests_never_write_to_the_permutation_table(self):
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({'WM_OSINT': ['example-login.com']})), \
+                patch.object(home_shared, '_get_permutation_count', return_value=0), \
+                patch.object(home_shared, '_get_possibility_count', return_value=0), \
+                patch.object(home_shared, 'DYNAMODB_RESOURCE') as resource:
+            sections = GET_DOMAIN_SECTIONS('example.com')
+            details = home_shared._get_domain_details_batch(['example.com', 'test.org'])
+
+        resource.assert_not_called()
+        self.assertEqual(resource.mock_calls, [])
+        self.assertEqual(sections['suspect']['openSourceIntelligence'], ['example-login.com'])
+        self.assertEqual(details['example.com']['sections'], sections)
+
+    def test_cached_sections_keep_their_cadence_ttl(self):
+        with patch.object(home_shared, '_load_section_domains', side_effect=_section_loader({})), \
+                patch.object(home_shared.SECTION_CACHE, 'set', wraps=home_shared.SECTION_CACHE.set) as cache_set:
+            GET_DOMAIN_SECTIONS('example.com')
+            GET_DOMAIN_SECTIONS('example.com')
+
+        ttls = {call.args[0][1]: call.args[2] for call in cache_set.call_args_list}
+        self.assertEqual(len(cache_set.call_args_list), len(home_shared.DOMAIN_SECTION_LOOKUPS))
+        self.assertEqual(ttls['WM_OSINT'], home_shared.SECTION_CACHE_TTL_SECONDS['suspect'])
+        self.assertEqual(ttls['WM_MONTHLY'], home_shared.SECTION_CACHE_TTL_SECONDS['monthly'])
+
+
+def _possibility_page(item_count):
+    return [
+        {
+            'pk': {'S': 'LUNKER#'},
+            'sk': {'S': f'LUNKER#example#{index}'},
+            'poss': {'L': [{'S': f'example{index}-{suffix}.com'} for suffix in range(10)]},
+            'possibilities': {'SS': [f'login{index}.example.com', f'secure{index}.example.com']},
+            'domain': {'S': f'example{index}.net'},
+            'count': {'N': str(index)},
+        }
+        for index in range(item_count)
+    ]
+
+
+def _type_deserialized(item):
+    deserializer = TypeDeserializer()
+    return {key: deserializer.deserialize(value) for key, value in item.items()}
+
+
+class AttributeDecodingTests(unittest.TestCase):
+    def test_decodes_strings_string_sets_and_string_lists(self):
+        decoded = home_shared._decode_string_attributes({
+            'sk': {'S': 'LUNKER#example#'},
+            'poss': {'L': [{'S': 'a.com'}, {'N': '1'}, {'S': 'b.com'}]},
+            'values': {'SS': ['c.com']},
+            'domain': {'N': '5'},
+            'ignored': {'S': 'x'},
+        }, home_shared.POSSIBILITY_ATTRIBUTES)
+
+        self.assertEqual(decoded, {'sk': 'LUNKER#example#', 'poss': ['a.com', 'b.com'], 'values': ['c.com']})
+
+    def test_matches_type_deserializer_on_domain_bearing_attributes(self):
+        for item in _possibility_page(50):
+            self.assertEqual(
+                sorted(home_shared._extract_possibility_domains(home_shared._decode_string_attributes(item, home_shared.POSSIBILITY_ATTRIBUTES))),
+                sorted(home_shared._extract_possibility_domains(_type_deserialized(item))),
+            )
+
+    def test_projection_names_every_decoded_attribute(self):
+        projection = home_shared._attribute_projection(home_shared.POSSIBILITY_ATTRIBUTES)
+
+        self.assertEqual(sorted(projection['ExpressionAttributeNames'].values()), sorted(home_shared.POSSIBILITY_ATTRIBUTES))
+        self.assertEqual(projection['ProjectionExpression'].count('#'), len(home_shared.POSSIBILITY_ATTRIBUTES))
+
+    @unittest.skipUnless(os.getenv('LUNKER_BENCHMARKS'), 'set LUNKER_BENCHMARKS=1 to run timing benchmarks')
+    def test_benchmark_against_type_deserializer(self):
+        items = _possibility_page(2000)
+
+        started = time.perf_counter()
+        for item in items:
+            _type_deserialized(item)
+        baseline = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for item in items:
+            home_shared._decode_string_attributes(item, home_shared.POSSIBILITY_ATTRIBUTES)
+        fast_path = time.perf_counter() - started
+
+        self.assertLess(fast_path, baseline, f'TypeDeserializer {baseline * 1000:.1f} ms, fast path {fast_path * 1000:.1f} ms')
+
+
+class SectionQueryTests(unittest.TestCase):
+    def test_disjoint_prefixes_never_read_longer_slds(self):
+        def query(**kwargs):
+            prefix = kwargs['ExpressionAttributeValues'][':sk']['S']
+            items = [
+                {'sk': {'S': 'LUNKER#example#example-login.com#'}, 'domain': {'S': 'example-login.com'}},
+                {'sk': {'S': 'LUNKER#example.net#'}},
+                {'sk': {'S': 'LUNKER#examples#examples-shop.com#'}, 'domain': {'S': 'examples-shop.com'}},
+            ]
+            return {'Items': [item for item in items if item['sk']['S'].startswith(prefix)]}
+
+        with patch.object(home_shared.DYNAMODB_CLIENT, 'query', side_effect=query) as query_mock:
+            domains = home_shared._query_paginated_domains(home_shared.DYNAMODB_CLIENT, 'osint', 'example')
+
+        self.assertEqual(domains, ['example-login.com', 'example.net'])
+        prefixes = [call.kwargs['ExpressionAttributeValues'][':sk']['S'] for call in query_mock.call_args_list]
+        self.assertEqual(prefixes, ['LUNKER#example#', 'LUNKER#example.'])
+
+    def test_load_section_domains_raises_when_every_table_fails(self):
+        os.environ['WM_OSINT'] = 'arn:aws:dynamodb:us-east-1:123456789012:table/osint'
+        self.addCleanup(os.environ.pop, 'WM_OSINT', None)
+
+        with patch.object(home_shared.DYNAMODB_CLIENT, 'query', side_effect=TypeError('boom')) as query:
+            with self.assertRaises(TypeError):
+                home_shared._load_section_domains(home_shared.DYNAMODB_CLIENT, 'example', 'WM_OSINT')
+
+        self.assertEqual(query.call_count, 2)
+
 
 class DomainNormalizationTests(unittest.TestCase):
     def test_normalize_domain_strips_whitespace(self):
@@ -741,52 +1456,192 @@ class ProcessSubmissionTests(unittest.TestCase):
         delete_domain.assert_called_once_with(mock_lunker_table, 'user@example.com', 'example.com')
 
 
+class LunkerPartitionTests(unittest.TestCase):
+    def setUp(self):
+        home_shared.SECTION_CACHE.clear()
+        patcher = patch.multiple(home_shared, LUNKER_KEY_MODE='dual', LUNKER_KEY_SHARDS=4)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_partition_matches_the_permutation_lambda(self):
+        from permutation import permutation
+
+        with patch.object(permutation, 'KEY_MODE', 'dual'), patch.object(permutation, 'KEY_SHARDS', 4):
+            for value in ('example', 'user@example.com', 'internationalbusinessmachines'):
+                self.assertEqual(home_shared._lunker_partition(value), permutation._partition_key(value))
+
+    def test_legacy_mode_uses_the_single_partition(self):
+        with patch.object(home_shared, 'LUNKER_KEY_MODE', 'legacy'):
+            self.assertEqual(home_shared._lunker_partitions('user@example.com'), ['LUNKER#'])
+
+    def test_put_uses_the_email_shard_and_delete_clears_both_keys(self):
+        table = MagicMock()
+        shard = home_shared._lunker_partition('user@example.com')
+
+        home_shared._put_lunker_domain(table, 'user@example.com', 'example.com')
+        home_shared._delete_lunker_domain(table, 'user@example.com', 'example.com')
+
+        self.assertNotEqual(shard, 'LUNKER#')
+        self.assertEqual(table.put_item.call_args.kwargs['Item']['pk'], shard)
+        self.assertEqual(
+            [call.kwargs['Key']['pk'] for call in table.delete_item.call_args_list],
+            [shard, 'LUNKER#']
+        )
+
+    def test_permutation_lookup_falls_back_to_the_legacy_partition(self):
+        table = MagicMock()
+        table.get_item.side_effect = [{}, {'Item': {'perm': ['exampel']}}]
+
+        with patch.object(home_shared, '_get_env_table', return_value=table):
+            permutations = home_shared._get_domain_permutations('example.com')
+
+        self.assertEqual(permutations, ['exampel'])
+        self.assertEqual(
+            [call.kwargs['Key']['pk'] for call in table.get_item.call_args_list],
+            [home_shared._lunker_partition('example'), 'LUNKER#']
+        )
+
+    def test_permutation_count_stops_at_the_sharded_item(self):
+        table = MagicMock()
+        table.get_item.return_value = {'Item': {'count': 12}}
+
+        with patch.object(home_shared, '_get_env_table', return_value=table):
+            count = home_shared._get_permutation_count('example.com')
+
+        self.assertEqual(count, 12)
+        table.get_item.assert_called_once()
+
+
+class FakeTldTable:
+    def __init__(self, tlds, fail_query=False):
+        self.name = 'tld-table'
+        self.tlds = list(tlds)
+        self.fail_query = fail_query
+        self.query_calls = 0
+        self.get_item_calls = 0
+
+    def query(self, **kwargs):
+        self.query_calls += 1
+        if self.fail_query:
+            raise home_shared.ClientError({'Error': {'Code': 'ThrottlingException'}}, 'Query')
+        return {'Items': [{'pk': 'TLD#', 'sk': tld} for tld in self.tlds]}
+
+    def get_item(self, **kwargs):
+        self.get_item_calls += 1
+        if kwargs['Key']['sk'] in self.tlds:
+            return {'Item': {'sk': kwargs['Key']['sk']}}
+        return {}
+
+
+class TldCacheTests(unittest.TestCase):
+    def setUp(self):
+        home_shared.TLD_CACHE.clear()
+        home_shared.TLD_CACHE_REFRESHING.clear()
+
+    def test_tld_set_is_loaded_once_per_container(self):
+        table = FakeTldTable(['com', 'net'])
+
+        self.assertTrue(home_shared._tld_exists(table, 'com'))
+        self.assertTrue(home_shared._tld_exists(table, 'net'))
+        self.assertFalse(home_shared._tld_exists(table, 'invalid'))
+
+        self.assertEqual(table.query_calls, 1)
+        self.assertEqual(table.get_item_calls, 0)
+        self.assertIsInstance(home_shared.TLD_CACHE['tld-table'][1], frozenset)
+
+    def test_expired_tld_set_serves_stale_entries_while_revalidating(self):
+        table = FakeTldTable(['com', 'org'])
+        expired_at = time.time() - (home_shared.TLD_CACHE_TTL_SECONDS + 10)
+        home_shared.TLD_CACHE['tld-table'] = (expired_at, frozenset({'com'}))
+
+        with patch.object(home_shared.DOMAIN_LOOKUP_EXECUTOR, 'submit') as submit:
+            self.assertTrue(home_shared._tld_exists(table, 'com'))
+            self.assertTrue(home_shared._tld_exists(table, 'com'))
+
+        submit.assert_called_once_with(home_shared._revalidate_tld_cache, table)
+        self.assertEqual(table.query_calls, 0)
+
+    def test_stale_miss_is_confirmed_with_get_item(self):
+        table = FakeTldTable(['com', 'org'])
+        expired_at = time.time() - (home_shared.TLD_CACHE_TTL_SECONDS + 10)
+        home_shared.TLD_CACHE['tld-table'] = (expired_at, frozenset({'com'}))
+
+        with patch.object(home_shared.DOMAIN_LOOKUP_EXECUTOR, 'submit'):
+            self.assertTrue(home_shared._tld_exists(table, 'org'))
+
+        self.assertEqual(table.get_item_calls, 1)
+
+    def test_failed_revalidation_keeps_stale_entries(self):
+        table = FakeTldTable(['com'], fail_query=True)
+        expired_at = time.time() - (home_shared.TLD_CACHE_TTL_SECONDS + 10)
+        home_shared.TLD_CACHE['tld-table'] = (expired_at, frozenset({'com'}))
+        home_shared.TLD_CACHE_REFRESHING.add('tld-table')
+
+        home_shared._revalidate_tld_cache(table)
+
+        self.assertEqual(home_shared.TLD_CACHE['tld-table'], (expired_at, frozenset({'com'})))
+        self.assertNotIn('tld-table', home_shared.TLD_CACHE_REFRESHING)
+
+    def test_cold_load_failure_falls_back_to_get_item(self):
+        table = FakeTldTable(['com'], fail_query=True)
+
+        self.assertTrue(home_shared._tld_exists(table, 'com'))
+        self.assertEqual(table.get_item_calls, 1)
+        self.assertNotIn('tld-table', home_shared.TLD_CACHE)
+
+
+def _with_static_assets(page):
+    bodies = home_shared._get_static_assets()['bodies']
+    linked = re.findall(r'\?asset=(\w+\.(?:css|js))', page)
+    return page + ''.join(bodies[asset_name] for asset_name in linked)
+
+
 class RenderFormTests(unittest.TestCase):
     def test_render_form_with_empty_domains(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, [], set())
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, [], set()))
         self.assertIn('Gone Fishing!', html)
         self.assertIn('user@example.com', html)
         self.assertIn('us-east-1', html)
         self.assertIn('Empty!', html)
 
     def test_render_form_with_domains(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], set())
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], set()))
         self.assertIn('example.com', html)
 
     def test_render_form_with_matched_slds_highlights(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com', 'test.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com', 'test.com'], {'example'}))
         self.assertIn('matched-domain', html)
 
     def test_render_form_html_escaping(self):
-        html = home_shared._render_form('token', {'email': '<script>alert("xss")</script>', 'region': 'us-east-1'}, [], set())
+        html = _with_static_assets(home_shared._render_form('token', {'email': '<script>alert("xss")</script>', 'region': 'us-east-1'}, [], set()))
         # Check that malicious script is properly escaped in the identity div
         self.assertIn('<strong>Email:</strong> &lt;script&gt;', html)
         # Verify the escaped version exists
         self.assertIn('&lt;script&gt;alert(&quot;xss&quot;)&lt;/script&gt;', html)
 
     def test_render_form_none_domains_defaults_to_empty(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, None, None)
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, None, None))
         self.assertIn('Gone Fishing!', html)
         self.assertIn('Empty!', html)
 
     def test_render_form_uses_contains_for_sld_matches(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
         self.assertIn('function containsSldMatch(item, matchSld)', html)
         self.assertIn('return normalizedItem.includes(normalizedMatch);', html)
 
     def test_render_form_includes_refresh_button(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
         self.assertIn('<button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>', html)
 
     def test_render_form_toolbar_button_order_help_refresh_logoff(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
         help_index = html.index('<button class="help-button" type="button" title="Lunker Help" onclick="toggleHelp()">?</button>')
         refresh_index = html.index('<button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>')
         logoff_index = html.index('<button class="logoff-button" type="button" title="Cognito Log Off" onclick="logOff()">X</button>')
         self.assertTrue(help_index < refresh_index < logoff_index)
 
     def test_render_form_includes_refresh_current_view_logic(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
         self.assertIn('async function refreshCurrentView(event) {', html)
         self.assertIn('event.preventDefault();', html)
         self.assertIn('event.stopPropagation();', html)
@@ -806,40 +1661,42 @@ class RenderFormTests(unittest.TestCase):
         self.assertIn('goHome();', html)
 
     def test_render_form_refresh_error_banner_is_present(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
         self.assertIn('function showRefreshError(message) {', html)
         self.assertIn("banner.id = 'refresh-error-banner';", html)
         self.assertIn("banner.textContent = message || 'Refresh failed. Please try again.';", html)
 
     def test_render_form_fetch_uses_abort_controller(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
         self.assertIn('domainSectionsAbortController = new AbortController();', html)
         self.assertIn('domainPermutationsAbortController = new AbortController();', html)
         self.assertIn('signal: requestController.signal,', html)
         self.assertIn("if (err && err.name === 'AbortError') {", html)
 
     def test_render_form_fetch_ignores_stale_response(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
         self.assertIn('if (domainSectionsAbortController !== requestController) {', html)
         self.assertIn('if (domainPermutationsAbortController !== requestController) {', html)
 
     def test_render_form_gohome_does_not_force_api_navigation_on_failure(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
         self.assertIn('async function goHome() {', html)
         self.assertIn("activeView = {", html)
         self.assertIn("name: 'home',", html)
         self.assertIn("domain: ''", html)
         self.assertIn("console.error('Failed to refresh home view.'", html)
         self.assertIn("showRefreshError('Failed to refresh home view. Please try again.');", html)
-        self.assertIn("const authHeader = \"token\" || '';", html)
-        self.assertIn("headers: authHeader ? { 'Authorization': authHeader } : {}", html)
-        self.assertIn("credentials: 'include'", html)
+        self.assertIn('var lunkerAuthHeader = "token";', html)
+        self.assertIn("const authHeader = lunkerAuthHeader || '';", html)
+        self.assertIn("headers['If-None-Match'] = homeDomainsETag;", html)
+        self.assertIn("body: JSON.stringify({ action: 'ListDomains' })", html)
         self.assertIn("cache: 'no-store'", html)
-        self.assertIn('if (!r.ok || r.redirected) {', html)
+        self.assertIn('if (r.status === 304) {', html)
+        self.assertIn('if (!r.ok) {', html)
         self.assertNotIn("window.location.href = 'https://", html)
 
     def test_render_form_refresh_keeps_domain_view_active(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
         domain_branch_index = html.index("if (activeView.name === 'domain' && activeView.domain) {")
         show_domain_index = html.index('await showDomain(activeView.domain);')
         permutations_branch_index = html.index("if (activeView.name === 'permutations' && activeView.domain) {")
@@ -849,7 +1706,7 @@ class RenderFormTests(unittest.TestCase):
         self.assertIn('return;', html[show_domain_index:permutations_branch_index])
 
     def test_render_form_refresh_keeps_permutations_view_active(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
         permutations_branch_index = html.index("if (activeView.name === 'permutations' && activeView.domain) {")
         show_permutations_index = html.index('await showPermutations(activeView.domain);')
         go_home_index = html.index('await goHome();')
@@ -858,11 +1715,11 @@ class RenderFormTests(unittest.TestCase):
         self.assertIn('return;', html[show_permutations_index:go_home_index])
 
     def test_render_form_dynamic_views_include_refresh_button(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
         self.assertEqual(html.count('<button class="refresh-button"'), 4)
 
     def test_render_form_header_highlight_checks_sld_before_permutations(self):
-        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
         self.assertIn('const hasExactSldMatch = safeItems.some(item => containsSldMatch(item, matchSld));', html)
         self.assertIn('if (hasExactSldMatch) {', html)
         self.assertIn("return 'alert';", html)
@@ -873,52 +1730,430 @@ class RenderFormTests(unittest.TestCase):
             html.index('const hasPermutationMatch = safeItems.some(item => containsPermutationMatch(item, permutationTerms));')
         )
 
+    def test_render_form_prefetches_domain_details_in_bounded_chunks(self):
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'}))
+        self.assertIn("body: JSON.stringify({ action: 'GetDomainSectionsBatch', domains: domains })", html)
+        self.assertIn(f'var domainDetailsChunkSize = {home_shared.DOMAIN_DETAILS_PREFETCH_CHUNK_SIZE};', html)
+        self.assertIn('domainDetailsPrefetch = prefetchDomainDetails(initialDomains);', html)
+        # A click waits only for the chunk holding its domain, never for the whole prefetch.
+        self.assertNotIn('await domainDetailsPrefetch;', html)
+        self.assertIn('await domainDetailsInFlight.get(domain);', html)
+
+    def test_render_form_never_caches_partial_domain_details(self):
+        html = _with_static_assets(home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], set()))
+        self.assertIn('if (!entry.partial && !domainDetailsCache.has(domain)) {', html)
+        self.assertIn('if (!domainDetails?.partial) {', html)
+        self.assertIn('partial: Boolean(payload.partial)', html)
+
+    def test_render_form_builds_static_shell_once_per_endpoint_configuration(self):
+        home_shared.FORM_SHELL_CACHE.clear()
+
+        with patch.object(home_shared, 'API_ENDPOINT', 'https://api-one'), \
+                patch.object(home_shared, '_build_form_shell', wraps=home_shared._build_form_shell) as build_shell:
+            first = home_shared._render_form('token-a', {'email': 'a@example.com', 'region': 'us-east-1'}, ['example.com'], set())
+            second = home_shared._render_form('token-b', {'email': 'b@example.com', 'region': 'us-west-2'}, [], set())
+
+        with patch.object(home_shared, 'API_ENDPOINT', 'https://api-two'):
+            third = home_shared._render_form('token-c', {'email': 'c@example.com', 'region': 'us-east-1'}, [], set())
+
+        self.assertEqual(build_shell.call_count, 1)
+        self.assertIn('<script src="https://api-one?asset=', first)
+        self.assertIn('var lunkerAuthHeader = "token-a";', first)
+        self.assertIn('<strong>Email:</strong> b@example.com<br>', second)
+        self.assertNotIn('token-a', second)
+        self.assertIn('<script src="https://api-two?asset=', third)
+        self.assertNotIn('\x00', first + second + third)
+
+    def test_render_form_keeps_only_dynamic_values_inline(self):
+        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], set())
+        self.assertIn('var lunkerAuthHeader = "token";', html)
+        self.assertIn('var initialDomains = ["example.com"];', html)
+        self.assertNotIn('<style>', html)
+        self.assertNotIn('function showDomain', html)
+        self.assertEqual(html.count('?asset='), 2)
+
+        script = _with_static_assets(html)[len(html):]
+        self.assertEqual(script.count('const authHeader = lunkerAuthHeader'), 7)
+        self.assertNotIn('"token"', script)
+
+
+class DeferredHighlightTests(unittest.TestCase):
+    def setUp(self):
+        home_shared.MATCHED_SLD_CACHE.clear()
+        self.addCleanup(home_shared.MATCHED_SLD_CACHE.clear)
+
+    def _get_event(self):
+        return {
+            'requestContext': {'http': {'method': 'GET'}},
+            'headers': {'Authorization': 'test-token'},
+        }
+
+    def _handle_get(self, get_matched_slds, budget_seconds):
+        with patch.object(home_shared, '_fetch_user_identity', return_value={'email': 'user@example.com', 'region': 'use1'}), \
+                patch.object(home_shared, '_get_table', return_value=object()), \
+                patch.object(home_shared, '_list_lunker_domains', return_value=['example.com', 'other.com']), \
+                patch.object(home_shared, '_get_matched_slds', side_effect=get_matched_slds), \
+                patch.object(home_shared, 'MATCHED_SLD_RENDER_BUDGET_SECONDS', budget_seconds), \
+                patch.object(home_shared, 'RESPONSE_COMPRESSION_ENABLED', False):
+            return home_shared._handle_request(self._get_event(), None)
+
+    def test_fast_scan_highlights_inline(self):
+        response = self._handle_get(lambda domains: {'example'}, 1.0)
+
+        self.assertIn('class="matched-domain"', response['body'])
+        self.assertIn('var highlightsPending = false;', response['body'])
+
+    def test_slow_scan_renders_without_highlights(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow_scan(domains):
+            release.wait(5)
+            return {'example'}
+
+        started = time.monotonic()
+        response = self._handle_get(slow_scan, 0.05)
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(response['statusCode'], 200)
+        self.assertIn('example.com', response['body'])
+        self.assertNotIn('class="matched-domain"', response['body'])
+        self.assertIn('var highlightsPending = true;', response['body'])
+
+    def test_zero_budget_always_defers(self):
+        response = self._handle_get(lambda domains: {'example'}, 0)
+
+        self.assertNotIn('class="matched-domain"', response['body'])
+        self.assertIn('var highlightsPending = true;', response['body'])
+
+    def test_cached_match_renders_inline_without_scan(self):
+        home_shared._cache_matched_slds(('example.com', 'other.com'), {'other'})
+        scan = MagicMock(return_value=set())
+
+        response = self._handle_get(scan, 0)
+
+        scan.assert_not_called()
+        self.assertIn('<a data-domain="other.com" class="matched-domain"', response['body'])
+        self.assertIn('var highlightsPending = false;', response['body'])
+
+    def test_deferred_request_joins_in_flight_scan(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        scan = MagicMock(side_effect=lambda domains: release.wait(5) and {'example'})
+
+        with patch.object(home_shared, '_get_matched_slds', scan):
+            matched, pending = home_shared._get_matched_slds_within_budget(['example.com'], 0.01)
+            joined = home_shared._matched_slds_future(['Example.com'])
+            release.set()
+            result = joined.result(timeout=5)
+
+        self.assertEqual((matched, pending), (set(), True))
+        self.assertEqual(result, {'example'})
+        scan.assert_called_once_with(['example.com'])
+
+    def test_scan_runs_outside_the_domain_lookup_pool(self):
+        thread_names = []
+        scan = MagicMock(side_effect=lambda domains: thread_names.append(threading.current_thread().name) or {'example'})
+
+        with patch.object(home_shared, '_get_matched_slds', scan):
+            result = home_shared._matched_slds_future(['example.com']).result(timeout=5)
+
+        self.assertEqual(result, {'example'})
+        self.assertTrue(thread_names[0].startswith('matched-slds'))
+
+    def test_form_script_loads_highlights_when_pending(self):
+        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], set(), True)
+        script = _with_static_assets(html)[len(html):]
+
+        self.assertIn('var highlightsPending = true;', html)
+        self.assertIn("action: 'GetMatchedSlds'", script)
+        self.assertIn('if (highlightsPending) {\n    loadMatchedSlds(initialDomains);', script)
+
+    def test_empty_watchlist_is_never_pending(self):
+        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, [], set(), True)
+
+        self.assertIn('var highlightsPending = false;', html)
+
+
+class DomainListTests(unittest.TestCase):
+    def setUp(self):
+        home_shared.MATCHED_SLD_CACHE.clear()
+        self.addCleanup(home_shared.MATCHED_SLD_CACHE.clear)
+
+    def _list_domains(self, domains, matched_slds, headers=None):
+        event = {
+            'requestContext': {'http': {'method': 'POST'}},
+            'headers': {'Authorization': 'test-token', **(headers or {})},
+            'body': json.dumps({'action': 'ListDomains'}),
+        }
+        with patch.object(home_shared, '_fetch_user_identity', return_value={'email': 'user@example.com', 'region': 'use1'}), \
+                patch.object(home_shared, '_get_table', return_value=object()), \
+                patch.object(home_shared, '_list_lunker_domains', return_value=domains), \
+                patch.object(home_shared, '_get_matched_slds', return_value=matched_slds), \
+                patch.object(home_shared, '_render_form') as render_form:
+            response = home_shared._handle_request(event, None)
+
+        render_form.assert_not_called()
+        return response
+
+    def test_list_domains_returns_json_with_strong_etag(self):
+        response = self._list_domains(['example.com', 'other.com'], {'example'})
+
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(response['headers']['Content-Type'], 'application/json; charset=utf-8')
+        self.assertEqual(response['headers']['Cache-Control'], 'private, no-cache')
+        self.assertRegex(response['headers']['ETag'], r'^"[0-9a-f]{20}"$')
+        self.assertEqual(json.loads(response['body']), {
+            'domains': ['example.com', 'other.com'],
+            'matchedSlds': ['example'],
+            'highlightsPending': False,
+        })
+
+    def test_matching_if_none_match_returns_empty_304(self):
+        etag = self._list_domains(['example.com'], {'example'})['headers']['ETag']
+
+        response = self._list_domains(['example.com'], {'example'}, {'If-None-Match': etag})
+
+        self.assertEqual(response['statusCode'], 304)
+        self.assertEqual(response['body'], '')
+        self.assertEqual(response['headers']['ETag'], etag)
+
+    def test_changed_watchlist_or_highlights_change_the_etag(self):
+        etag = self._list_domains(['example.com'], set())['headers']['ETag']
+
+        added = self._list_domains(['example.com', 'other.com'], set(), {'If-None-Match': etag})
+        home_shared.MATCHED_SLD_CACHE.clear()
+        highlighted = self._list_domains(['example.com'], {'example'}, {'If-None-Match': etag})
+
+        self.assertEqual(added['statusCode'], 200)
+        self.assertEqual(highlighted['statusCode'], 200)
+        self.assertEqual(len({etag, added['headers']['ETag'], highlighted['headers']['ETag']}), 3)
+
+    def test_compressed_etag_revalidates(self):
+        domains = [f'site{index}.com' for index in range(100)]
+        with patch.object(home_shared, 'RESPONSE_COMPRESSION_ENABLED', True):
+            response = self._list_domains(domains, set(), {'Accept-Encoding': 'gzip'})
+            self.assertEqual(response['headers']['Content-Encoding'], 'gzip')
+            self.assertTrue(response['headers']['ETag'].endswith('-gzip"'))
+
+            revalidated = self._list_domains(domains, set(), {'If-None-Match': response['headers']['ETag']})
+
+        self.assertEqual(revalidated['statusCode'], 304)
+
+    def test_rendered_page_carries_the_list_etag(self):
+        etag = self._list_domains(['example.com'], {'example'})['headers']['ETag']
+
+        html = home_shared._render_form('token', {'email': 'user@example.com', 'region': 'us-east-1'}, ['example.com'], {'example'})
+
+        self.assertIn('var initialDomainsETag = ' + json.dumps(etag) + ';', html)
+        self.assertIn('var initialMatchedSlds = ["example"];', html)
+
+
+class StaticAssetTests(unittest.TestCase):
+    def setUp(self):
+        home_shared.STATIC_ASSET_CACHE.clear()
+
+    def _event(self, asset_name, headers=None):
+        return {
+            'requestContext': {'http': {'method': 'GET'}},
+            'queryStringParameters': {'asset': asset_name},
+            'headers': headers or {},
+        }
+
+    def test_asset_names_are_content_hashes(self):
+        names = home_shared._get_static_assets()['names']
+        bodies = home_shared._get_static_assets()['bodies']
+
+        self.assertTrue(names['form_css'].endswith('.css'))
+        self.assertTrue(names['form_script'].endswith('.js'))
+        self.assertIn('function showDomain(domain)', bodies[names['form_script']])
+        self.assertEqual(len(set(names.values())), 4)
+
+    def test_asset_names_change_with_endpoint_configuration(self):
+        with patch.object(home_shared, 'API_ENDPOINT', 'https://api-one'):
+            first = home_shared._get_static_assets()['names']['form_script']
+
+        with patch.object(home_shared, 'API_ENDPOINT', 'https://api-two'):
+            second = home_shared._get_static_assets()['names']['form_script']
+
+        self.assertNotEqual(first, second)
+
+    def test_asset_route_serves_immutable_asset_without_identity_lookup(self):
+        asset_name = home_shared._get_static_assets()['names']['form_css']
+
+        with patch.object(home_shared, '_fetch_user_identity') as fetch_identity:
+            response = home_shared._handle_request(self._event(asset_name), None)
+
+        fetch_identity.assert_not_called()
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(response['headers']['Content-Type'], 'text/css; charset=utf-8')
+        self.assertEqual(response['headers']['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(response['headers']['ETag'], '"' + asset_name.split('.')[0] + '"')
+        self.assertIn('.refresh-button {', response['body'])
+
+    def test_every_asset_is_served_without_a_token(self):
+        names = home_shared._get_static_assets()['names']
+
+        with patch.object(home_shared, '_fetch_user_identity') as fetch_identity, \
+                patch.object(home_shared, '_verify_jwt') as verify_jwt:
+            responses = [
+                home_shared._handle_request({'requestContext': {'http': {'method': 'GET'}}, 'queryStringParameters': {'asset': asset_name}}, None)
+                for asset_name in names.values()
+            ]
+
+        fetch_identity.assert_not_called()
+        verify_jwt.assert_not_called()
+        self.assertEqual([response['statusCode'] for response in responses], [200] * len(names))
+
+    def test_asset_route_returns_not_modified_for_matching_etag(self):
+        asset_name = home_shared._get_static_assets()['names']['result_script']
+        digest = asset_name.split('.')[0]
+
+        for if_none_match in (f'"{digest}"', f'W/"{digest}-gzip"', f'"other", "{digest}"'):
+            response = home_shared._handle_request(self._event(asset_name, {'If-None-Match': if_none_match}), None)
+            self.assertEqual(response['statusCode'], 304)
+            self.assertEqual(response['body'], '')
+
+        response = home_shared._handle_request(self._event(asset_name, {'If-None-Match': '"other"'}), None)
+        self.assertEqual(response['statusCode'], 200)
+
+    def test_compressed_asset_uses_encoding_specific_etag(self):
+        asset_name = home_shared._get_static_assets()['names']['form_script']
+
+        with patch.object(home_shared, 'brotli', None), \
+                patch.object(home_shared, 'RESPONSE_COMPRESSION_ENABLED', True):
+            response = home_shared._handle_request(self._event(asset_name, {'Accept-Encoding': 'gzip'}), None)
+
+        self.assertEqual(response['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(response['headers']['ETag'], '"' + asset_name.split('.')[0] + '-gzip"')
+        self.assertIn('function showDomain(domain)', gzip.decompress(base64.b64decode(response['body'])).decode('utf-8'))
+
+    def test_unknown_asset_returns_not_found(self):
+        response = home_shared._handle_request(self._event('0000.js'), None)
+        self.assertEqual(response['statusCode'], 404)
+        self.assertEqual(response['headers']['Cache-Control'], 'no-store')
+
+
+class ResponseCompressionTests(unittest.TestCase):
+    def setUp(self):
+        self.default_enabled = home_shared.RESPONSE_COMPRESSION_ENABLED
+        patcher = patch.object(home_shared, 'RESPONSE_COMPRESSION_ENABLED', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @unittest.skipIf('RESPONSE_COMPRESSION' in os.environ, 'RESPONSE_COMPRESSION is set in the environment')
+    def test_compression_is_off_by_default(self):
+        self.assertFalse(self.default_enabled)
+
+    def _event(self, accept_encoding=None):
+        headers = {'Authorization': 'token'}
+        if accept_encoding is not None:
+            headers['Accept-Encoding'] = accept_encoding
+        return {'requestContext': {'http': {'method': 'GET'}}, 'headers': headers}
+
+    def _response(self, body='x' * 4096):
+        return {'statusCode': 200, 'body': body, 'headers': {'Content-Type': 'text/html; charset=utf-8'}}
+
+    def test_gzip_is_used_when_accepted(self):
+        with patch.object(home_shared, 'brotli', None):
+            response = home_shared._compress_response(self._event('gzip, deflate'), self._response())
+
+        self.assertTrue(response['isBase64Encoded'])
+        self.assertEqual(response['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(response['headers']['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(base64.b64decode(response['body'])).decode('utf-8'), 'x' * 4096)
+
+    def test_brotli_is_preferred_when_available(self):
+        fake_brotli = type('FakeBrotli', (), {'compress': staticmethod(lambda data, quality: b'br:' + data[:4])})
+
+        with patch.object(home_shared, 'brotli', fake_brotli):
+            response = home_shared._compress_response(self._event('gzip, br'), self._response())
+
+        self.assertEqual(response['headers']['Content-Encoding'], 'br')
+        self.assertEqual(base64.b64decode(response['body']), b'br:xxxx')
+
+    def test_uncompressed_without_accept_encoding(self):
+        response = home_shared._compress_response(self._event(), self._response())
+        self.assertNotIn('isBase64Encoded', response)
+        self.assertEqual(response['body'], 'x' * 4096)
+
+    def test_rejected_encoding_is_not_used(self):
+        with patch.object(home_shared, 'brotli', None):
+            response = home_shared._compress_response(self._event('gzip;q=0'), self._response())
+
+        self.assertNotIn('Content-Encoding', response['headers'])
+
+    def test_small_bodies_are_not_compressed(self):
+        response = home_shared._compress_response(self._event('gzip'), self._response('small'))
+        self.assertEqual(response['body'], 'small')
+
+    def test_compression_can_be_disabled(self):
+        with patch.object(home_shared, 'RESPONSE_COMPRESSION_ENABLED', False):
+            response = home_shared._compress_response(self._event('gzip'), self._response())
+
+        self.assertEqual(response['body'], 'x' * 4096)
+
+    def test_get_request_returns_gzip_body_when_accepted(self):
+        event = self._event('gzip')
+
+        with patch.object(home_shared, 'brotli', None), \
+                patch.object(home_shared, '_fetch_user_identity', return_value={'email': 'user@example.com', 'region': 'use1'}), \
+                patch.object(home_shared, '_get_table', return_value=object()), \
+                patch.object(home_shared, '_list_lunker_domains', return_value=['example.com']), \
+                patch.object(home_shared, '_get_matched_slds', return_value=set()):
+            os.environ['LUNKER_TABLE'] = 'lunker-table'
+            response = home_shared._handle_request(event, None)
+
+        body = gzip.decompress(base64.b64decode(response['body'])).decode('utf-8')
+        self.assertIn('Gone Fishing!', body)
+        self.assertEqual(response['headers']['Content-Type'], 'text/html; charset=utf-8')
+
 
 class RenderResultTests(unittest.TestCase):
     def test_render_result_success_submission(self):
-        html = home_shared._render_result('Domain saved', success=True, authorization_header='token', operation='submission')
+        html = _with_static_assets(home_shared._render_result('Domain saved', success=True, authorization_header='token', operation='submission'))
         self.assertIn('Submission Successful', html)
         self.assertIn('Domain saved', html)
         self.assertIn('#166534', html)  # green color
 
     def test_render_result_failure_submission(self):
-        html = home_shared._render_result('Invalid domain', success=False, authorization_header='token', operation='submission')
+        html = _with_static_assets(home_shared._render_result('Invalid domain', success=False, authorization_header='token', operation='submission'))
         self.assertIn('Submission Failed', html)
         self.assertIn('Invalid domain', html)
         self.assertIn('#b42318', html)  # red color
 
     def test_render_result_success_deletion(self):
-        html = home_shared._render_result('example.com', success=True, authorization_header='token', operation='deletion')
+        html = _with_static_assets(home_shared._render_result('example.com', success=True, authorization_header='token', operation='deletion'))
         self.assertIn('Deletion Successful', html)
 
     def test_render_result_failure_deletion(self):
-        html = home_shared._render_result('Error', success=False, authorization_header='token', operation='deletion')
+        html = _with_static_assets(home_shared._render_result('Error', success=False, authorization_header='token', operation='deletion'))
         self.assertIn('Deletion Failed', html)
 
     def test_render_result_html_escaping(self):
-        html = home_shared._render_result('<script>alert("xss")</script>', success=True, authorization_header='token')
+        html = _with_static_assets(home_shared._render_result('<script>alert("xss")</script>', success=True, authorization_header='token'))
         # Check that the malicious script in the message content is properly escaped
         self.assertIn('&lt;script&gt;alert(&quot;xss&quot;)&lt;/script&gt;', html)
 
     def test_render_result_success_submission_hides_refresh_button(self):
-        html = home_shared._render_result('Domain saved', success=True, authorization_header='token')
+        html = _with_static_assets(home_shared._render_result('Domain saved', success=True, authorization_header='token'))
         self.assertNotIn('<button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>', html)
 
     def test_render_result_success_deletion_hides_refresh_button(self):
-        html = home_shared._render_result('example.com', success=True, authorization_header='token', operation='deletion')
+        html = _with_static_assets(home_shared._render_result('example.com', success=True, authorization_header='token', operation='deletion'))
         self.assertNotIn('<button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>', html)
 
     def test_render_result_failure_includes_refresh_button(self):
-        html = home_shared._render_result('Invalid domain', success=False, authorization_header='token')
+        html = _with_static_assets(home_shared._render_result('Invalid domain', success=False, authorization_header='token'))
         self.assertIn('<button class="refresh-button" type="button" title="Refresh Data" onclick="refreshCurrentView(event)">↺</button>', html)
 
     def test_render_result_includes_refresh_button_styles(self):
-        html = home_shared._render_result('Domain saved', success=True, authorization_header='token')
+        html = _with_static_assets(home_shared._render_result('Domain saved', success=True, authorization_header='token'))
         self.assertIn('.refresh-button {', html)
         self.assertIn('.refresh-button:hover {', html)
 
     def test_render_result_refresh_stays_on_failure_result_view(self):
-        html = home_shared._render_result('Invalid domain', success=False, authorization_header='token')
+        html = _with_static_assets(home_shared._render_result('Invalid domain', success=False, authorization_header='token'))
         self.assertIn('function refreshCurrentView(event) {', html)
         self.assertIn('event.preventDefault();', html)
         self.assertIn('event.stopPropagation();', html)
@@ -926,7 +2161,7 @@ class RenderResultTests(unittest.TestCase):
         self.assertNotIn('window.location.reload();', html)
 
     def test_render_result_refresh_reuses_gohome_flow(self):
-        html = home_shared._render_result('Invalid domain', success=False, authorization_header='token')
+        html = _with_static_assets(home_shared._render_result('Invalid domain', success=False, authorization_header='token'))
         refresh_index = html.index('function refreshCurrentView(event) {')
         go_home_index = html.index('goHome();', refresh_index)
 
@@ -934,11 +2169,12 @@ class RenderResultTests(unittest.TestCase):
         self.assertNotIn('window.location.reload();', html[refresh_index:go_home_index])
 
     def test_render_result_gohome_does_not_force_api_navigation_on_failure(self):
-        html = home_shared._render_result('Invalid domain', success=False, authorization_header='token')
+        html = _with_static_assets(home_shared._render_result('Invalid domain', success=False, authorization_header='token'))
         self.assertIn("console.error('Failed to load home view.'", html)
         self.assertIn('function showRefreshError(message) {', html)
         self.assertIn("showRefreshError('Failed to load home view. Please try again.');", html)
-        self.assertIn("const authHeader = \"token\" || '';", html)
+        self.assertIn('var lunkerAuthHeader = "token";', html)
+        self.assertIn("const authHeader = lunkerAuthHeader || '';", html)
         self.assertIn("headers: authHeader ? { 'Authorization': authHeader } : {}", html)
         self.assertIn("credentials: 'include'", html)
         self.assertIn("cache: 'no-store'", html)
@@ -959,7 +2195,7 @@ class FetchUserIdentityTests(unittest.TestCase):
     def test_fetch_user_identity_cached_entry(self):
         token = 'Bearer test-token'
         cached_identity = {'email': 'cached@example.com', 'region': 'us-west-2'}
-        home_shared.IDENTITY_CACHE['Bearer Bearer test-token'] = (time.time(), cached_identity)
+        home_shared.IDENTITY_CACHE.set('Bearer Bearer test-token', cached_identity)
 
         with patch.object(home_shared, '_normalize_authorization', return_value='Bearer Bearer test-token'):
             identity = home_shared._fetch_user_identity(token)
@@ -968,8 +2204,7 @@ class FetchUserIdentityTests(unittest.TestCase):
 
     def test_fetch_user_identity_expired_cache(self):
         token = 'Bearer test-token'
-        old_time = time.time() - (home_shared.IDENTITY_CACHE_TTL_SECONDS + 10)
-        home_shared.IDENTITY_CACHE['Bearer Bearer test-token'] = (old_time, {'email': 'old@example.com'})
+        home_shared.IDENTITY_CACHE.set('Bearer Bearer test-token', {'email': 'old@example.com'}, ttl_seconds=-10)
 
         with patch.object(home_shared, '_normalize_authorization', return_value='Bearer Bearer test-token'), \
                 patch.object(home_shared, '_decode_jwt_payload', return_value={}):
@@ -1009,6 +2244,207 @@ class FetchUserIdentityTests(unittest.TestCase):
         self.assertEqual(identity['region'], 'ap-south-1')
 
 
+def _b64url(raw):
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _rsa_keypair(seed, bits=1024):
+    rng = random.Random(seed)
+
+    def prime(size):
+        while True:
+            candidate = rng.getrandbits(size) | (1 << (size - 1)) | 1
+            if all(pow(rng.randrange(2, candidate - 1), candidate - 1, candidate) == 1 for _ in range(16)):
+                return candidate
+
+    while True:
+        p, q = prime(bits // 2), prime(bits // 2)
+        phi = (p - 1) * (q - 1)
+        if p != q and math.gcd(65537, phi) == 1:
+            return p * q, 65537, pow(65537, -1, phi)
+
+
+def _jwk(key, kid):
+    modulus, exponent, _ = key
+    return {
+        'kty': 'RSA',
+        'kid': kid,
+        'alg': 'RS256',
+        'use': 'sig',
+        'n': _b64url(modulus.to_bytes((modulus.bit_length() + 7) // 8, 'big')),
+        'e': _b64url(exponent.to_bytes(3, 'big')),
+    }
+
+
+def _sign_jwt(key, claims, kid='key-1', alg='RS256'):
+    modulus, _, private_exponent = key
+    signing_input = f"{_b64url(json.dumps({'alg': alg, 'kid': kid}).encode())}.{_b64url(json.dumps(claims).encode())}"
+    size = (modulus.bit_length() + 7) // 8
+    digest = bytes.fromhex('3031300d060960864801650304020105000420') + hashlib.sha256(signing_input.encode('ascii')).digest()
+    encoded = b'\x00\x01' + b'\xff' * (size - len(digest) - 3) + b'\x00' + digest
+    signature = pow(int.from_bytes(encoded, 'big'), private_exponent, modulus).to_bytes(size, 'big')
+    return f'{signing_input}.{_b64url(signature)}'
+
+
+class LocalJwtVerificationTests(unittest.TestCase):
+    ISSUER = 'https://cognito-idp.us-east-1.amazonaws.com/us-east-1_example'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.key = _rsa_keypair(1)
+        cls.rotated_key = _rsa_keypair(2)
+
+    def setUp(self):
+        os.environ['AWS_REGION'] = 'us-east-1'
+        home_shared.IDENTITY_CACHE.clear()
+        home_shared.SUBJECT_IDENTITY_CACHE.clear()
+        home_shared.JWKS_CACHE.clear()
+        home_shared.USER_INFO_ENDPOINT = 'https://userinfo'
+        patcher = patch.multiple(home_shared, JWT_ISSUERS={self.ISSUER}, JWT_AUDIENCES=set())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(home_shared.JWKS_CACHE.clear)
+
+    def _claims(self, **overrides):
+        return {
+            'iss': self.ISSUER,
+            'sub': 'subject-1',
+            'token_use': 'id',
+            'aud': 'client-1',
+            'email': 'local@example.com',
+            'exp': int(time.time()) + 300,
+            **overrides,
+        }
+
+    def _userinfo(self, payload):
+        return type('Response', (), {'json': lambda self: payload, 'raise_for_status': lambda self: None})()
+
+    def test_verified_id_token_needs_no_userinfo_call(self):
+        home_shared._load_jwks(self.ISSUER, {'keys': [_jwk(self.key, 'key-1')]})
+        token = _sign_jwt(self.key, self._claims())
+
+        with patch.object(home_shared.HTTP_SESSION, 'get') as get:
+            identity = home_shared._fetch_user_identity(f'Bearer {token}')
+
+        get.assert_not_called()
+        self.assertEqual(identity['email'], 'local@example.com')
+
+    def test_invalid_tokens_from_a_trusted_issuer_are_rejected_without_userinfo(self):
+        home_shared._load_jwks(self.ISSUER, {'keys': [_jwk(self.key, 'key-1')]})
+        header, payload, _ = _sign_jwt(self.key, self._claims()).split('.')
+        forged = f'{header}.{payload}.{_sign_jwt(self.rotated_key, self._claims()).split(".")[2]}'
+        expired = _sign_jwt(self.key, self._claims(exp=int(time.time()) - 600))
+        unsigned = _sign_jwt(self.key, self._claims(), alg='none')
+
+        with patch.object(home_shared.HTTP_SESSION, 'get') as get, patch('builtins.print'):
+            identities = [home_shared._fetch_user_identity(f'Bearer {token}') for token in (forged, expired, unsigned)]
+
+        get.assert_not_called()
+        self.assertEqual([identity['email'] for identity in identities], ['unknown'] * 3)
+
+    def test_malformed_kid_is_rejected_before_the_jwks_lookup(self):
+        home_shared._load_jwks(self.ISSUER, {'keys': [_jwk(self.key, 'key-1')]})
+        tokens = [_sign_jwt(self.key, self._claims(), kid=kid) for kid in (['key-1'], {'k': 1}, '', None, 7)]
+
+        with patch.object(home_shared, '_jwks_key') as jwks_key, \
+                patch.object(home_shared.HTTP_SESSION, 'get') as get, patch('builtins.print'):
+            for token in tokens:
+                with self.assertRaises(ValueError):
+                    home_shared._verify_jwt(token)
+            identities = [home_shared._fetch_user_identity(f'Bearer {token}') for token in tokens]
+
+        jwks_key.assert_not_called()
+        get.assert_not_called()
+        self.assertEqual([identity['email'] for identity in identities], ['unknown'] * 5)
+
+    def test_audience_is_checked_when_configured(self):
+        home_shared._load_jwks(self.ISSUER, {'keys': [_jwk(self.key, 'key-1')]})
+        home_shared.JWT_AUDIENCES.add('client-2')
+
+        with self.assertRaises(ValueError):
+            home_shared._verify_jwt(_sign_jwt(self.key, self._claims()))
+
+        access = self._claims(token_use='access', client_id='client-2')
+        self.assertEqual(home_shared._verify_jwt(_sign_jwt(self.key, access))['client_id'], 'client-2')
+
+    def test_unknown_kid_refetches_rotated_keys(self):
+        home_shared._load_jwks(self.ISSUER, {'keys': [_jwk(self.key, 'key-1')]}, ttl_seconds=3600)
+        home_shared.JWKS_CACHE[self.ISSUER]['fetched'] -= home_shared.JWKS_REFRESH_MIN_SECONDS + 1
+        token = _sign_jwt(self.rotated_key, self._claims(), kid='key-2')
+        rotated = self._userinfo({'keys': [_jwk(self.key, 'key-1'), _jwk(self.rotated_key, 'key-2')]})
+
+        with patch.object(home_shared.HTTP_SESSION, 'get', return_value=rotated) as get:
+            first = home_shared._verify_jwt(token)
+            second = home_shared._verify_jwt(token)
+
+        self.assertEqual(first['sub'], 'subject-1')
+        self.assertEqual(second, first)
+        get.assert_called_once_with(f'{self.ISSUER}/.well-known/jwks.json', timeout=home_shared.JWKS_FETCH_TIMEOUT_SECONDS)
+
+    def test_userinfo_answer_is_reused_per_subject_for_access_tokens(self):
+        jwks = self._userinfo({'keys': [_jwk(self.key, 'key-1')]})
+        userinfo = self._userinfo({'email': 'remote@example.com'})
+        first = _sign_jwt(self.key, self._claims(token_use='access', email=None, iat=1))
+        refreshed = _sign_jwt(self.key, self._claims(token_use='access', email=None, iat=2))
+
+        with patch.object(home_shared.HTTP_SESSION, 'get', side_effect=[jwks, userinfo]) as get:
+            before = home_shared._fetch_user_identity(f'Bearer {first}')
+            after = home_shared._fetch_user_identity(f'Bearer {refreshed}')
+
+        self.assertEqual(before['email'], 'remote@example.com')
+        self.assertEqual(after['email'], 'remote@example.com')
+        self.assertEqual([call.args[0] for call in get.call_args_list], [f'{self.ISSUER}/.well-known/jwks.json', 'https://userinfo'])
+        self.assertEqual(home_shared.SUBJECT_IDENTITY_CACHE.ttl_seconds, home_shared.IDENTITY_CACHE_TTL_SECONDS)
+
+    def test_userinfo_never_teaches_an_issuer(self):
+        issuer = 'https://cognito-idp.us-east-1.amazonaws.com/us-east-1_other'
+        token = _sign_jwt(self.key, self._claims(iss=issuer, token_use='access', email=None))
+
+        with patch.object(home_shared.HTTP_SESSION, 'get', return_value=self._userinfo({'email': 'remote@example.com'})):
+            identity = home_shared._fetch_user_identity(f'Bearer {token}')
+
+        self.assertEqual(identity['email'], 'remote@example.com')
+        self.assertNotIn(issuer, home_shared.JWT_ISSUERS)
+        self.assertNotIn((issuer, 'subject-1'), home_shared.SUBJECT_IDENTITY_CACHE)
+
+    def test_rejected_token_returns_401(self):
+        home_shared._load_jwks(self.ISSUER, {'keys': [_jwk(self.key, 'key-1')]})
+        token = _sign_jwt(self.key, self._claims(), kid=['key-1'])
+        get_event = {'requestContext': {'http': {'method': 'GET'}}, 'headers': {'Authorization': f'Bearer {token}'}}
+        post_event = {**get_event, 'requestContext': {'http': {'method': 'POST'}}, 'body': json.dumps({'action': 'PutItem', 'entry': 'example.com'})}
+        list_event = {**post_event, 'body': json.dumps({'action': 'ListDomains'})}
+
+        with patch.object(home_shared, '_get_table') as get_table, patch('builtins.print'):
+            responses = [home_shared._handle_request(event, None) for event in (get_event, post_event, list_event)]
+
+        get_table.assert_not_called()
+        self.assertEqual([response['statusCode'] for response in responses], [401] * 3)
+        self.assertEqual(responses[0]['headers']['WWW-Authenticate'], 'Bearer error="invalid_token"')
+
+    def test_untrusted_issuer_falls_back_to_userinfo(self):
+        token = _sign_jwt(self.key, self._claims(iss='https://issuer.example'))
+
+        with patch.object(home_shared.HTTP_SESSION, 'get', return_value=self._userinfo({'email': 'remote@example.com'})) as get:
+            identity = home_shared._fetch_user_identity(token)
+
+        get.assert_called_once()
+        self.assertEqual(identity['email'], 'remote@example.com')
+        self.assertNotIn('https://issuer.example', home_shared.JWT_ISSUERS)
+
+    def test_offline_jwks_file_is_loaded_once(self):
+        home_shared.JWT_ISSUERS.clear()
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as handle:
+            json.dump({f'{self.ISSUER}/': {'keys': [_jwk(self.key, 'key-1')]}}, handle)
+        self.addCleanup(os.remove, handle.name)
+
+        with patch.object(home_shared, 'JWKS_PATH', handle.name), \
+                patch.object(home_shared.HTTP_SESSION, 'get') as get:
+            claims = home_shared._verify_jwt(_sign_jwt(self.key, self._claims()))
+
+        get.assert_not_called()
+        self.assertEqual(claims['email'], 'local@example.com')
+
+
 class TableNameResolutionTests(unittest.TestCase):
     def test_table_name_from_env_arn_format(self):
         result = home_shared._table_name_from_env('arn:aws:dynamodb:us-east-1:123456789012:table/my-table')
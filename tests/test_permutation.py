@@ -0,0 +1,721 @@
+import json
+import os
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+
+# Prevent boto3 from attempting metadata lookups during import in test environments.
+os.environ.setdefault('AWS_EC2_METADATA_DISABLED', 'true')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from permutation import permutation
+
+
+def _reference_permutations(sld):
+    # The string-slicing generator this module used before the table-driven engine.
+    swaps = {
+        'o': ['0'], '0': ['o'], 'i': ['1', 'l'], '1': ['i', 'l'], 'l': ['1', 'i'],
+        's': ['5'], '5': ['s'], 'a': ['4'], '4': ['a'], 'e': ['3'], '3': ['e'], 'g': ['9'], '9': ['g']
+    }
+    neighbors = permutation._QWERTY_NEIGHBORS
+    out = set()
+    for idx, ch in enumerate(sld):
+        for rep in swaps.get(ch, []):
+            out.add(sld[:idx] + rep + sld[idx + 1:])
+    for idx in range(len(sld) - 1):
+        if sld[idx] != sld[idx + 1]:
+            out.add(sld[:idx] + sld[idx + 1] + sld[idx] + sld[idx + 2:])
+    if len(sld) == 5:
+        for idx, ch in enumerate(sld):
+            for neighbor in neighbors.get(ch, ''):
+                out.add(sld[:idx] + neighbor + sld[idx + 1:])
+    if len(sld) > 5:
+        for idx, ch in enumerate(sld):
+            out.add(sld[:idx] + sld[idx + 1:])
+            out.add(sld[:idx] + ch + sld[idx:])
+            if idx:
+                out.add(sld[:idx] + '-' + sld[idx:])
+            for neighbor in neighbors.get(ch, ''):
+                out.add(sld[:idx] + neighbor + sld[idx + 1:])
+                out.add(sld[:idx] + neighbor + sld[idx:])
+                out.add(sld[:idx + 1] + neighbor + sld[idx + 1:])
+            for mask in (1, 2, 4, 8, 16, 32, 64):
+                flipped = chr(ord(ch) ^ mask)
+                if flipped.isalnum() or flipped == '-':
+                    out.add(sld[:idx] + flipped + sld[idx + 1:])
+            if ch in 'aeiou':
+                for rep in 'aeiou':
+                    if rep != ch:
+                        out.add(sld[:idx] + rep + sld[idx + 1:])
+        for ch in 'abcdefghijklmnopqrstuvwxyz0123456789':
+            out.add(ch + sld)
+            out.add(sld + ch)
+
+    normalized = set()
+    for candidate in out:
+        lowered = candidate.lower()
+        if len(lowered) >= 2 and sld not in lowered and all(ch.isalnum() or ch == '-' for ch in lowered):
+            normalized.add(lowered)
+    return sorted(normalized)
+
+
+def _best_of(runs, func, values):
+    timings = []
+    for _ in range(runs):
+        permutation._positions.cache_clear()
+        started = time.perf_counter()
+        for value in values:
+            func(value)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+class BatchWriteTests(unittest.TestCase):
+    def test_batch_write_retries_unprocessed_items_and_sums_capacity(self):
+        unprocessed = {permutation.PERMUTATION_TABLE: [{'PutRequest': {'Item': {'sk': 'b'}}}]}
+        responses = [
+            {'UnprocessedItems': unprocessed, 'ConsumedCapacity': [{'CapacityUnits': 2.0}]},
+            {'UnprocessedItems': {}, 'ConsumedCapacity': [{'CapacityUnits': 1.0}]},
+        ]
+
+        with patch.object(permutation._PERMUTATION.meta.client, 'batch_write_item', side_effect=responses) as batch_write, \
+                patch.object(permutation.time, 'sleep') as sleep:
+            consumed = permutation._batch_write([{'PutRequest': {'Item': {'sk': 'a'}}}, {'PutRequest': {'Item': {'sk': 'b'}}}])
+
+        self.assertEqual(consumed, 3.0)
+        self.assertEqual(batch_write.call_count, 2)
+        self.assertEqual(batch_write.call_args_list[1].kwargs['RequestItems'], unprocessed)
+        self.assertEqual(batch_write.call_args_list[0].kwargs['ReturnConsumedCapacity'], 'TOTAL')
+        sleep.assert_called_once()
+
+    def test_batch_write_gives_up_after_max_attempts(self):
+        unprocessed = {permutation.PERMUTATION_TABLE: [{'PutRequest': {'Item': {'sk': 'a'}}}]}
+
+        with patch.object(permutation._PERMUTATION.meta.client, 'batch_write_item', return_value={'UnprocessedItems': unprocessed}), \
+                patch.object(permutation.time, 'sleep'):
+            with self.assertRaises(RuntimeError):
+                permutation._batch_write(unprocessed[permutation.PERMUTATION_TABLE])
+
+
+class FullRunTests(unittest.TestCase):
+    def test_full_run_writes_in_batches_of_25(self):
+        slds = [f'brand{idx:02d}' for idx in range(60)]
+
+        with patch.object(permutation, '_existing_permutation_state', return_value={}), \
+                patch.object(permutation, '_batch_write', return_value=25.0) as batch_write:
+            summary = permutation._full_run(slds)
+
+        self.assertEqual([len(call.args[0]) for call in batch_write.call_args_list], [25, 25, 10])
+        self.assertEqual(summary['items_written'], 60)
+        self.assertEqual(summary['wcu_consumed'], 75.0)
+        self.assertGreater(summary['slds_per_second'], 0)
+        item = batch_write.call_args_list[0].args[0][0]['PutRequest']['Item']
+        self.assertEqual(item['sk'], 'LUNKER#brand00#')
+        self.assertEqual(item['count'], len(item['perm']))
+        self.assertEqual(item['hash'], permutation._permutation_hash(item['perm']))
+        self.assertEqual(item['version'], permutation.STRATEGY_VERSION)
+
+    def test_full_run_reads_stored_state_for_each_chunk_only(self):
+        slds = [f'brand{idx:02d}' for idx in range(30)]
+
+        with patch.object(permutation, '_existing_permutation_state', return_value={}) as existing_state, \
+                patch.object(permutation, '_batch_write', return_value=1.0):
+            permutation._full_run(slds, should_stop=lambda: True)
+
+        existing_state.assert_called_once_with(slds[:25])
+
+    def test_full_run_skips_unchanged_items(self):
+        perms = permutation._recommended_permutations('example')
+        far_ttl = int(time.time()) + (permutation.TTL_REFRESH_DAYS + 5) * 24 * 60 * 60
+        existing = {'LUNKER#example#': (permutation._permutation_hash(perms), permutation.STRATEGY_VERSION, far_ttl)}
+
+        with patch.object(permutation, '_existing_permutation_state', return_value=existing), \
+                patch.object(permutation, '_extend_ttl') as extend_ttl, \
+                patch.object(permutation, '_batch_write') as batch_write:
+            summary = permutation._full_run(['example'])
+
+        batch_write.assert_not_called()
+        extend_ttl.assert_not_called()
+        self.assertEqual(summary['items_skipped'], 1)
+        self.assertEqual(summary['items_written'], 0)
+
+    def test_full_run_extends_ttl_for_unchanged_items_near_expiry(self):
+        perms = permutation._recommended_permutations('example')
+        near_ttl = int(time.time()) + 60
+        existing = {'LUNKER#example#': (permutation._permutation_hash(perms), permutation.STRATEGY_VERSION, near_ttl)}
+
+        with patch.object(permutation, '_existing_permutation_state', return_value=existing), \
+                patch.object(permutation, '_extend_ttl', return_value=1.0) as extend_ttl, \
+                patch.object(permutation, '_batch_write') as batch_write:
+            summary = permutation._full_run(['example'])
+
+        batch_write.assert_not_called()
+        self.assertEqual(extend_ttl.call_args.args[0], 'example')
+        self.assertEqual(summary['ttl_extended'], 1)
+        self.assertEqual(summary['wcu_consumed'], 1.0)
+
+    def test_full_run_rewrites_items_from_older_strategy_version(self):
+        perms = permutation._recommended_permutations('example')
+        far_ttl = int(time.time()) + (permutation.TTL_REFRESH_DAYS + 5) * 24 * 60 * 60
+        existing = {'LUNKER#example#': (permutation._permutation_hash(perms), 'old', far_ttl)}
+
+        with patch.object(permutation, '_existing_permutation_state', return_value=existing), \
+                patch.object(permutation, '_batch_write', return_value=1.0) as batch_write:
+            summary = permutation._full_run(['example'])
+
+        batch_write.assert_called_once()
+        self.assertEqual(summary['items_written'], 1)
+
+    def test_generated_chunks_are_lazy_and_ordered(self):
+        slds = [f'brand{idx:02d}' for idx in range(30)]
+
+        with patch.object(permutation, '_generate_chunk', side_effect=permutation._generate_chunk) as generate_chunk:
+            chunks = permutation._generated_chunks(slds)
+            first = next(chunks)
+            generate_chunk.assert_called_once_with(slds[:25])
+            generated = first + [entry for chunk in chunks for entry in chunk]
+
+        self.assertEqual([sld for sld, _ in generated], slds)
+
+    def test_handler_reports_throughput_for_full_mode(self):
+        summary = {'items_written': 2, 'duration_seconds': 0.1, 'slds_per_second': 20.0, 'wcu_consumed': 4.0}
+
+        with patch.object(permutation, '_watched_slds', return_value=['alpha', 'bravo']), \
+                patch.object(permutation, '_full_run', return_value=summary):
+            response = permutation.handler({}, None)
+
+        self.assertEqual(response['body']['mode'], 'full')
+        self.assertEqual(response['body']['sld_count'], 2)
+        self.assertEqual(response['body']['wcu_consumed'], 4.0)
+        self.assertEqual(response['body']['slds_per_second'], 20.0)
+
+    def test_handler_single_mode_writes_requested_sld(self):
+        with patch.object(permutation, '_write_permutations') as write_permutations:
+            response = permutation.handler({'sld': ' Example '}, None)
+
+        self.assertEqual(response['body'], {'mode': 'single', 'sld_count': 1, 'items_written': 1})
+        self.assertEqual(write_permutations.call_args.args[0], 'example')
+
+
+class GeneratorTests(unittest.TestCase):
+    SLDS = ['ab', 'mail', 'paypal', 'example', 'go0gle-1', 'aaaaaa', 'internationalbusinessmachines', 'ex_ample', 'exämple']
+    LONG_SLDS = [
+        f'{word}{idx}'
+        for idx in range(20)
+        for word in ('internationalbusinessmachinescorporationholdings', 'thequickbrownfoxjumpsoverthelazydogtwiceagain')
+    ]
+
+    def test_table_driven_output_matches_reference_generator(self):
+        with patch('builtins.print'):
+            for sld in self.SLDS:
+                self.assertEqual(permutation._recommended_permutations(sld), _reference_permutations(sld), sld)
+
+    def test_bitsquat_table_matches_on_demand_flips(self):
+        for code in range(128):
+            self.assertEqual(permutation._BITSQUAT_TABLE[chr(code)], permutation._bitsquat_flips(chr(code)))
+
+    def test_long_slds_match_reference_generator(self):
+        with patch.object(permutation, '_log_permutation_stats'):
+            for sld in self.LONG_SLDS[:2]:
+                self.assertEqual(permutation._recommended_permutations(sld), _reference_permutations(sld), sld)
+
+    @unittest.skipUnless(os.getenv('LUNKER_BENCHMARKS'), 'set LUNKER_BENCHMARKS=1 to run timing benchmarks')
+    def test_benchmark_long_slds(self):
+        with patch.object(permutation, '_log_permutation_stats'):
+            baseline = _best_of(5, _reference_permutations, self.LONG_SLDS)
+            table_driven = _best_of(5, permutation._recommended_permutations, self.LONG_SLDS)
+
+        speedup = baseline / table_driven
+        self.assertGreaterEqual(speedup, 5, f'reference {baseline * 1000:.1f} ms, table-driven {table_driven * 1000:.1f} ms')
+
+
+class StrategyRegistryTests(unittest.TestCase):
+    def _planned(self, length):
+        planned, skipped = permutation._plan_strategies(length)
+        return {strategy['name'] for strategy in planned}, skipped
+
+    def test_default_plan_keeps_length_tiers(self):
+        self.assertEqual(self._planned(4), ({'homoglyph', 'transposition'}, []))
+        self.assertEqual(self._planned(5), ({'homoglyph', 'transposition', 'replacement'}, []))
+        self.assertEqual(len(self._planned(63)[0]), 10)
+        self.assertEqual(self._planned(63)[1], [])
+
+    def test_strategies_are_ordered_by_yield(self):
+        yields = [strategy['yield'] for strategy in permutation.STRATEGIES]
+        self.assertEqual(yields, sorted(yields, reverse=True))
+
+    def test_candidate_budget_skips_low_yield_strategies(self):
+        with patch.object(permutation, 'MAX_CANDIDATES', 100):
+            planned, skipped = self._planned(20)
+
+        self.assertIn('homoglyph', planned)
+        self.assertIn('insertion', skipped)
+        self.assertNotIn('insertion', planned)
+
+    def test_budget_truncation_is_reported(self):
+        with patch.object(permutation, 'MAX_CANDIDATES', 10), \
+                patch('builtins.print') as log:
+            perms = permutation._recommended_permutations('example')
+
+        self.assertEqual(len(perms), 10)
+        self.assertEqual(perms, sorted(perms))
+        stats = log.call_args.args[0]
+        self.assertIn('budget_truncated=true', stats)
+        self.assertIn('budget_dropped=', stats)
+        self.assertIn('insertion', stats.split('skipped_strategies=')[1])
+
+    def test_item_byte_budget_caps_the_perm_list(self):
+        with patch.object(permutation, 'MAX_ITEM_BYTES', 600), \
+                patch('builtins.print') as log:
+            perms = permutation._recommended_permutations('internationalbusinessmachines')
+
+        self.assertLessEqual(permutation._perm_bytes(len(perms), sum(map(len, perms))), 600)
+        self.assertTrue(perms)
+        self.assertNotIn('budget_dropped=0', log.call_args.args[0])
+
+    def test_length_bound_matches_the_summed_budget(self):
+        candidates = {f'brand{idx:03d}' for idx in range(400)}
+
+        with patch.object(permutation, 'MAX_ITEM_BYTES', 2000):
+            bounded = permutation._apply_budget(candidates, max_length=8)
+            summed = permutation._apply_budget(candidates)
+
+        self.assertEqual(bounded, summed)
+        self.assertGreater(bounded[1], 0)
+
+    def test_registered_strategy_runs_through_the_generic_filter(self):
+        strategy = {
+            'name': 'dictionary',
+            'generate': lambda sld: ['Mall-Box', 'mail-box', 'm@il'],
+            'min_length': 1,
+            'estimate': lambda length: 3,
+            'yield': 0.5,
+            'single_edit': False
+        }
+
+        with patch.object(permutation, 'STRATEGIES', permutation.STRATEGIES + [strategy]), \
+                patch('builtins.print') as log:
+            perms = permutation._recommended_permutations('mail')
+
+        self.assertIn('mall-box', perms)
+        self.assertNotIn('mail-box', perms)
+        self.assertNotIn('m@il', perms)
+        self.assertIn('dictionary:3', log.call_args.args[0])
+        self.assertIn('budget_truncated=false', log.call_args.args[0])
+
+
+class RequestedSldTests(unittest.TestCase):
+    def test_requested_slds_accepts_legacy_single_keys(self):
+        self.assertEqual(permutation._requested_slds({'Status': ' Example '}), ['example'])
+        self.assertEqual(permutation._requested_slds({'sld': 'test'}), ['test'])
+        self.assertEqual(permutation._requested_slds({}), [])
+
+    def test_requested_slds_dedupes_lists(self):
+        event = {'slds': ['Example', 'test', 'example ', '', None]}
+        self.assertEqual(permutation._requested_slds(event), ['example', 'test'])
+
+    def test_handler_batches_multiple_requested_slds(self):
+        with patch.object(permutation, '_batch_write', return_value=2.0) as batch_write, \
+                patch.object(permutation, '_write_permutations') as write_permutations:
+            response = permutation.handler({'slds': ['alpha', 'bravo', 'alpha']}, None)
+
+        write_permutations.assert_not_called()
+        batch_write.assert_called_once()
+        written = [entry['PutRequest']['Item']['sld'] for entry in batch_write.call_args.args[0]]
+        self.assertEqual(written, ['alpha', 'bravo'])
+        self.assertEqual(response['body'], {'mode': 'single', 'sld_count': 2, 'items_written': 2})
+
+
+class ShardedRunTests(unittest.TestCase):
+    def _context(self, remaining_ms):
+        context = MagicMock()
+        context.invoked_function_arn = 'arn:aws:lambda:us-east-2:123456789012:function:permutation'
+        context.get_remaining_time_in_millis.side_effect = remaining_ms
+        return context
+
+    def test_shard_assignment_is_stable_and_covers_every_sld(self):
+        slds = [f'brand{idx:03d}' for idx in range(200)]
+        assignments = [permutation._shard_of(sld, 4) for sld in slds]
+
+        self.assertEqual(assignments, [permutation._shard_of(sld, 4) for sld in slds])
+        self.assertEqual(set(assignments), {0, 1, 2, 3})
+
+    def test_requested_shard_validates_event(self):
+        self.assertIsNone(permutation._requested_shard({}))
+        self.assertIsNone(permutation._requested_shard({'shard': 4, 'shards': 4}))
+        self.assertIsNone(permutation._requested_shard({'shard': 'x', 'shards': 4}))
+        self.assertEqual(
+            permutation._requested_shard({'shard': 1, 'shards': 4, 'run': '2026-10-18'}),
+            {'shard': 1, 'shards': 4, 'run': '2026-10-18'}
+        )
+
+    def test_coordinator_invokes_one_async_shard_each(self):
+        context = self._context([900000])
+
+        with patch.object(permutation, 'SHARDS', 3), \
+                patch.object(permutation, '_registry_seeded', return_value=True), \
+                patch.object(permutation._LAMBDA, 'invoke') as invoke:
+            response = permutation.handler({'source': 'aws.events'}, context)
+
+        self.assertEqual(response['body']['mode'], 'dispatch')
+        self.assertEqual(invoke.call_count, 3)
+        payloads = [json.loads(call.kwargs['Payload']) for call in invoke.call_args_list]
+        self.assertEqual([payload['shard'] for payload in payloads], [0, 1, 2])
+        self.assertTrue(all(call.kwargs['InvocationType'] == 'Event' for call in invoke.call_args_list))
+
+    def test_shard_resumes_after_checkpoint(self):
+        shard = {'shard': 0, 'shards': 1, 'run': '2026-10-18'}
+        slds = ['alpha', 'bravo', 'charlie']
+
+        with patch.object(permutation, '_watched_slds', return_value=slds), \
+                patch.object(permutation, '_load_checkpoint', return_value={'last_sld': 'alpha', 'status': 'running'}), \
+                patch.object(permutation, '_save_checkpoint') as save_checkpoint, \
+                patch.object(permutation, '_full_run', return_value={'complete': True}) as full_run:
+            body = permutation._run_shard(shard, self._context([900000]))
+
+        self.assertEqual(full_run.call_args.args[0], ['bravo', 'charlie'])
+        self.assertEqual(body['resumed_from'], 'alpha')
+        save_checkpoint.assert_called_once_with(shard, 'charlie', 'complete')
+
+    def test_completed_shard_is_not_rerun(self):
+        shard = {'shard': 0, 'shards': 1, 'run': '2026-10-18'}
+
+        with patch.object(permutation, '_load_checkpoint', return_value={'last_sld': 'zulu', 'status': 'complete'}), \
+                patch.object(permutation, '_full_run') as full_run:
+            body = permutation._run_shard(shard, self._context([900000]))
+
+        full_run.assert_not_called()
+        self.assertTrue(body['complete'])
+
+    def test_shard_checkpoints_and_reinvokes_when_time_runs_short(self):
+        shard = {'shard': 0, 'shards': 1, 'run': '2026-10-18'}
+        slds = [f'brand{idx:02d}' for idx in range(60)]
+        context = self._context([permutation.TIME_MARGIN_MS - 1])
+
+        with patch.object(permutation, '_watched_slds', return_value=slds), \
+                patch.object(permutation, '_load_checkpoint', return_value={}), \
+                patch.object(permutation, '_existing_permutation_state', return_value={}), \
+                patch.object(permutation, '_batch_write', return_value=0.0), \
+                patch.object(permutation, '_save_checkpoint') as save_checkpoint, \
+                patch.object(permutation._LAMBDA, 'invoke') as invoke:
+            body = permutation._run_shard(shard, context)
+
+        self.assertFalse(body['complete'])
+        self.assertEqual(body['slds_processed'], permutation.BATCH_SIZE)
+        save_checkpoint.assert_called_once_with(shard, slds[permutation.BATCH_SIZE - 1], 'running')
+        self.assertEqual(json.loads(invoke.call_args.kwargs['Payload']), shard)
+
+    def test_local_fan_out_runs_every_shard_in_process(self):
+        with patch.object(permutation, 'SHARDS', 2), \
+                patch.object(permutation, '_registry_seeded', return_value=True), \
+                patch.object(permutation, '_run_shard', return_value={'sld_count': 3, 'items_written': 2}) as run_shard:
+            response = permutation.handler({}, None)
+
+        self.assertEqual(run_shard.call_count, 2)
+        self.assertEqual(response['body']['mode'], 'sharded')
+        self.assertEqual(response['body']['sld_count'], 6)
+
+
+
+class PartitionKeyTests(unittest.TestCase):
+    def _query(self, pages):
+        def query(**kwargs):
+            condition = kwargs['KeyConditionExpression'].get_expression()
+            if condition['operator'] == 'AND':
+                condition = condition['values'][0].get_expression()
+            partition = condition['values'][1]
+            if 'ExclusiveStartKey' in kwargs:
+                return {'Items': pages[partition][1]}
+            items = pages.get(partition, [[]])
+            if len(items) > 1:
+                return {'Items': items[0], 'LastEvaluatedKey': {'pk': partition, 'sk': 'next'}}
+            return {'Items': items[0]}
+        return query
+
+    def test_legacy_mode_keeps_the_single_partition(self):
+        with patch.object(permutation, 'KEY_MODE', 'legacy'), patch.object(permutation, 'KEY_SHARDS', 8):
+            self.assertEqual(permutation._partition_key('example'), 'LUNKER#')
+            self.assertEqual(permutation._read_partitions(), ['LUNKER#'])
+            self.assertEqual(permutation._permutation_item('example', [], 0)['pk'], 'LUNKER#')
+
+    def test_dual_mode_writes_shards_and_reads_the_legacy_partition_too(self):
+        with patch.object(permutation, 'KEY_MODE', 'dual'), patch.object(permutation, 'KEY_SHARDS', 4):
+            self.assertEqual(permutation._partition_key('example'), f'LUNKER#{permutation._shard_of("example", 4)}')
+            self.assertEqual(permutation._write_partitions(), ['LUNKER#0', 'LUNKER#1', 'LUNKER#2', 'LUNKER#3'])
+            self.assertEqual(permutation._read_partitions(), ['LUNKER#0', 'LUNKER#1', 'LUNKER#2', 'LUNKER#3', 'LUNKER#'])
+
+    def test_sld_scan_gathers_every_shard_and_the_legacy_partition(self):
+        pages = {
+            'LUNKER#0': [[{'tk': 'LUNKER#alpha#a@x.com#alpha.com#'}], [{'tk': 'LUNKER#bravo#b@x.com#bravo.com#'}]],
+            'LUNKER#1': [[{'tk': 'LUNKER#charlie#c@x.com#charlie.com#'}]],
+            'LUNKER#': [[{'tk': 'LUNKER#alpha#a@x.com#alpha.com#'}, {'tk': 'LUNKER#delta#d@x.com#delta.com#'}]],
+        }
+
+        with patch.object(permutation, 'KEY_MODE', 'dual'), patch.object(permutation, 'KEY_SHARDS', 2), \
+                patch.object(permutation._LUNKER, 'query', side_effect=self._query(pages)) as query:
+            slds = permutation._unique_slds_from_lunker_tk_index()
+
+        self.assertEqual(slds, ['alpha', 'bravo', 'charlie', 'delta'])
+        self.assertEqual(query.call_count, 4)
+        self.assertTrue(all(call.kwargs['IndexName'] == permutation.LUNKER_INDEX for call in query.call_args_list))
+
+    def test_existing_state_reads_only_the_requested_keys(self):
+        response = {'Responses': {permutation.PERMUTATION_TABLE: [{'sk': 'LUNKER#alpha#', 'hash': 'h', 'version': '1', 'ttl': 5}]}}
+
+        with patch.object(permutation, 'KEY_MODE', 'dual'), patch.object(permutation, 'KEY_SHARDS', 2), \
+                patch.object(permutation._DYNAMODB.meta.client, 'batch_get_item', return_value=response) as batch_get_item, \
+                patch.object(permutation._PERMUTATION, 'query') as query:
+            state = permutation._existing_permutation_state(['alpha', 'bravo'])
+            partitions = [permutation._partition_key('alpha'), permutation._partition_key('bravo')]
+
+        query.assert_not_called()
+        request = batch_get_item.call_args.kwargs['RequestItems'][permutation.PERMUTATION_TABLE]
+        # The keys sit in the shard partitions, so items still under the legacy LUNKER# partition are not read.
+        self.assertEqual(request['Keys'], [
+            {'pk': partitions[0], 'sk': 'LUNKER#alpha#'},
+            {'pk': partitions[1], 'sk': 'LUNKER#bravo#'},
+        ])
+        self.assertNotIn(permutation.LEGACY_PARTITION, [key['pk'] for key in request['Keys']])
+        self.assertEqual(state, {'LUNKER#alpha#': ('h', '1', 5)})
+
+
+class MigrationTests(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.multiple(permutation, KEY_MODE='dual', KEY_SHARDS=4)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_migration_requires_a_sharded_key_mode(self):
+        with patch.object(permutation, 'KEY_MODE', 'legacy'), \
+                patch.object(permutation, '_run_migration') as run_migration:
+            response = permutation.handler({'migrate': 'lunker'}, None)
+
+        run_migration.assert_not_called()
+        self.assertEqual(response['statusCode'], 400)
+
+    def test_requested_migration_validates_event(self):
+        self.assertIsNone(permutation._requested_migration({'migrate': 'tld'}))
+        self.assertIsNone(permutation._requested_migration({'migrate': 'lunker', 'action': 'drop'}))
+        self.assertEqual(
+            permutation._requested_migration({'migrate': 'permutation'}),
+            {'migrate': 'permutation', 'action': 'backfill', 'cursor': None}
+        )
+
+    def test_backfill_copies_legacy_items_once(self):
+        items = [
+            {'pk': 'LUNKER#', 'sk': 'LUNKER#a@x.com#alpha.com#', 'email': 'a@x.com', 'sld': 'alpha'},
+            {'pk': 'LUNKER#', 'sk': 'LUNKER#b@x.com#bravo.com#', 'email': 'b@x.com', 'sld': 'bravo'},
+            {'pk': 'LUNKER#', 'sk': 'LUNKER#broken#'},
+        ]
+        cancelled = ClientError({'Error': {'Code': 'TransactionCanceledException'}}, 'TransactWriteItems')
+
+        with patch.object(permutation._LUNKER, 'query', return_value={'Items': items}), \
+                patch.object(permutation, '_DYNAMODB') as dynamodb:
+            dynamodb.meta.client.transact_write_items.side_effect = [None, cancelled]
+            response = permutation.handler({'migrate': 'lunker'}, None)
+
+        body = response['body']
+        self.assertEqual((body['items_scanned'], body['items_copied'], body['items_skipped']), (3, 1, 2))
+        self.assertTrue(body['complete'])
+        check, put = dynamodb.meta.client.transact_write_items.call_args_list[0].kwargs['TransactItems']
+        self.assertEqual(check['ConditionCheck']['Key'], {'pk': 'LUNKER#', 'sk': 'LUNKER#a@x.com#alpha.com#'})
+        self.assertEqual(put['Put']['Item']['pk'], permutation._partition_key('a@x.com'))
+        self.assertEqual(put['Put']['ConditionExpression'], 'attribute_not_exists(sk)')
+        self.assertIn('migrated', put['Put']['Item'])
+
+    def test_prune_deletes_only_legacy_items_with_a_sharded_copy(self):
+        items = [
+            {'pk': 'LUNKER#', 'sk': 'LUNKER#alpha#', 'sld': 'alpha'},
+            {'pk': 'LUNKER#', 'sk': 'LUNKER#bravo#', 'sld': 'bravo'},
+        ]
+        copied = {(permutation._partition_key('alpha'), 'LUNKER#alpha#')}
+
+        with patch.object(permutation._PERMUTATION, 'query', return_value={'Items': items}), \
+                patch.object(permutation, '_existing_keys', return_value=copied), \
+                patch.object(permutation, '_batch_write', return_value=1.0) as batch_write:
+            response = permutation.handler({'migrate': 'permutation', 'action': 'prune'}, None)
+
+        self.assertEqual(response['body']['items_deleted'], 1)
+        batch_write.assert_called_once_with(
+            [{'DeleteRequest': {'Key': {'pk': 'LUNKER#', 'sk': 'LUNKER#alpha#'}}}],
+            permutation.PERMUTATION_TABLE
+        )
+
+    def test_lunker_prune_marks_items_before_deleting(self):
+        items = [{'pk': 'LUNKER#', 'sk': 'LUNKER#a@x.com#alpha.com#', 'email': 'a@x.com'}]
+        copied = {(permutation._partition_key('a@x.com'), 'LUNKER#a@x.com#alpha.com#')}
+        calls = []
+
+        with patch.object(permutation._LUNKER, 'query', return_value={'Items': items}), \
+                patch.object(permutation, '_existing_keys', return_value=copied), \
+                patch.object(permutation._LUNKER, 'update_item', side_effect=lambda **kwargs: calls.append('mark')), \
+                patch.object(permutation, '_batch_write', side_effect=lambda *args: calls.append('delete')), \
+                patch('builtins.print'):
+            response = permutation.handler({'migrate': 'lunker', 'action': 'prune'}, None)
+
+        self.assertEqual(response['body']['items_deleted'], 1)
+        self.assertEqual(calls, ['mark', 'delete'])
+
+    def test_migration_reinvokes_with_cursor_when_time_runs_short(self):
+        context = MagicMock()
+        context.invoked_function_arn = 'arn:aws:lambda:us-east-2:123456789012:function:permutation'
+        context.get_remaining_time_in_millis.return_value = permutation.TIME_MARGIN_MS - 1
+        page = {'Items': [], 'LastEvaluatedKey': {'pk': 'LUNKER#', 'sk': 'LUNKER#m#'}}
+
+        with patch.object(permutation._LUNKER, 'query', return_value=page) as query, \
+                patch.object(permutation._LAMBDA, 'invoke') as invoke:
+            response = permutation.handler({'migrate': 'lunker', 'cursor': {'pk': 'LUNKER#', 'sk': 'LUNKER#a#'}}, context)
+
+        self.assertFalse(response['body']['complete'])
+        self.assertEqual(query.call_args.kwargs['ExclusiveStartKey'], {'pk': 'LUNKER#', 'sk': 'LUNKER#a#'})
+        self.assertEqual(
+            json.loads(invoke.call_args.kwargs['Payload']),
+            {'migrate': 'lunker', 'action': 'backfill', 'cursor': {'pk': 'LUNKER#', 'sk': 'LUNKER#m#'}}
+        )
+
+
+class RegistryTests(unittest.TestCase):
+    def test_full_run_reads_only_the_registry(self):
+        page = {'Items': [{'sld': 'bravo'}, {'sld': 'alpha'}, {}]}
+
+        with patch.object(permutation._PERMUTATION, 'get_item', return_value={'Item': permutation.REGISTRY_SEEDED_KEY}), \
+                patch.object(permutation._PERMUTATION, 'query', return_value=page) as query, \
+                patch.object(permutation._LUNKER, 'query') as lunker_query:
+            slds = permutation._watched_slds()
+
+        self.assertEqual(slds, ['alpha', 'bravo'])
+        self.assertEqual(query.call_args.kwargs['ProjectionExpression'], 'sld')
+        lunker_query.assert_not_called()
+
+    def test_unseeded_registry_is_seeded_from_the_lunker_index(self):
+        # A stream insert already created one registry item; the older watcher must still be found.
+        items = [
+            {'pk': 'LUNKER#', 'tk': 'LUNKER#alpha#a@x.com#alpha.com#', 'sk': 'LUNKER#a@x.com#alpha.com#'},
+            {'pk': 'LUNKER#', 'tk': 'LUNKER#bravo#b@x.com#bravo.com#', 'sk': 'LUNKER#b@x.com#bravo.com#'},
+        ]
+        present = {('LUNKER#', item['sk']) for item in items}
+
+        with patch.object(permutation._PERMUTATION, 'get_item', return_value={}), \
+                patch.object(permutation._PERMUTATION, 'query', return_value={'Items': [{'sld': 'bravo'}]}) as registry_query, \
+                patch.object(permutation._LUNKER, 'query', return_value={'Items': items}), \
+                patch.object(permutation, '_existing_keys', return_value=present), \
+                patch.object(permutation._PERMUTATION, 'update_item') as update_item, \
+                patch.object(permutation._PERMUTATION, 'put_item') as put_item, \
+                patch('builtins.print'):
+            slds = permutation._watched_slds()
+
+        self.assertEqual(slds, ['alpha', 'bravo'])
+        registry_query.assert_not_called()
+        self.assertEqual(update_item.call_count, 2)
+        marker = put_item.call_args.kwargs['Item']
+        self.assertEqual((marker['pk'], marker['sk'], marker['sld_count']), ('SYNC#', 'REGISTRY#', 2))
+
+    def test_coordinator_seeds_the_registry_once_before_dispatch(self):
+        with patch.object(permutation, 'SHARDS', 3), \
+                patch.object(permutation, '_registry_seeded', return_value=False), \
+                patch.object(permutation, '_seed_registry', return_value={}) as seed_registry, \
+                patch.object(permutation._LAMBDA, 'invoke') as invoke:
+            permutation.handler({}, MagicMock())
+
+        seed_registry.assert_called_once_with()
+        self.assertEqual(invoke.call_count, 3)
+
+    def test_watcher_ids_match_the_action_lambda(self):
+        from action import action
+
+        sk = 'LUNKER#user@example.com#example.com#'
+        self.assertEqual(permutation._watcher_id(sk), action.watcher_id(sk))
+        self.assertEqual(permutation._registry_key('example'), action.registry_key('example'))
+
+    def test_rebuild_merges_one_watcher_per_user_and_domain(self):
+        items = [
+            {'pk': 'LUNKER#', 'tk': 'LUNKER#example#a@x.com#example.com#', 'sk': 'LUNKER#a@x.com#example.com#'},
+            {'pk': 'LUNKER#', 'tk': 'LUNKER#example#a@x.com#example.net#', 'sk': 'LUNKER#a@x.com#example.net#'},
+            {'pk': 'LUNKER#', 'tk': 'LUNKER#other#b@x.com#other.com#', 'sk': 'LUNKER#b@x.com#other.com#'},
+        ]
+        present = {('LUNKER#', item['sk']) for item in items}
+
+        with patch.object(permutation._LUNKER, 'query', return_value={'Items': items}), \
+                patch.object(permutation, '_existing_keys', return_value=present), \
+                patch.object(permutation._PERMUTATION, 'update_item') as update_item, \
+                patch.object(permutation._PERMUTATION, 'put_item') as put_item, \
+                patch('builtins.print'):
+            response = permutation.handler({'registry': 'rebuild'}, None)
+
+        self.assertEqual(response['body'], {'mode': 'registry', 'sld_count': 2, 'watcher_count': 3})
+        self.assertEqual(put_item.call_args.kwargs['Item']['sk'], 'REGISTRY#')
+        first = update_item.call_args_list[0].kwargs
+        self.assertEqual(first['Key'], {'pk': 'REGISTRY#', 'sk': 'REGISTRY#example#'})
+        self.assertEqual(len(first['ExpressionAttributeValues'][':watchers']), 2)
+
+    def test_collect_deletes_only_unwatched_permutations(self):
+        def get_item(Key, **kwargs):
+            return {'Item': {'watchers': {'abc'}}} if Key['sk'] == 'REGISTRY#alpha#' else {}
+
+        with patch.multiple(permutation, KEY_MODE='dual', KEY_SHARDS=4), \
+                patch.object(permutation._PERMUTATION, 'get_item', side_effect=get_item), \
+                patch.object(permutation._LUNKER, 'query', return_value={'Items': []}), \
+                patch.object(permutation._PERMUTATION, 'delete_item') as delete_item, \
+                patch('builtins.print'):
+            response = permutation.handler({'collect': ['alpha', ' Bravo ']}, None)
+            shard = permutation._partition_key('bravo')
+
+        self.assertEqual(response['body'], {'mode': 'collect', 'sld_count': 2, 'items_collected': 1})
+        self.assertEqual(
+            sorted(call.kwargs['Key']['pk'] for call in delete_item.call_args_list),
+            sorted([shard, 'LUNKER#'])
+        )
+        self.assertTrue(all(call.kwargs['Key']['sk'] == 'LUNKER#bravo#' for call in delete_item.call_args_list))
+
+    def test_collect_keeps_slds_still_in_the_lunker_index(self):
+        with patch.object(permutation._PERMUTATION, 'get_item', return_value={}), \
+                patch.object(permutation._LUNKER, 'query', return_value={'Items': [{'tk': 'LUNKER#alpha#a@x.com#alpha.com#'}]}), \
+                patch.object(permutation._PERMUTATION, 'delete_item') as delete_item:
+            self.assertEqual(permutation._collect_unwatched(['alpha']), [])
+
+        delete_item.assert_not_called()
+
+    def test_seed_does_not_restore_a_watcher_removed_during_the_seed(self):
+        # The index still lists alpha, but the stream already removed it and deleted its registry item.
+        items = [
+            {'pk': 'LUNKER#', 'tk': 'LUNKER#alpha#a@x.com#alpha.com#', 'sk': 'LUNKER#a@x.com#alpha.com#'},
+            {'pk': 'LUNKER#', 'tk': 'LUNKER#bravo#b@x.com#bravo.com#', 'sk': 'LUNKER#b@x.com#bravo.com#'},
+        ]
+        registry = {}
+
+        def update_item(Key, UpdateExpression, ExpressionAttributeValues, **kwargs):
+            watchers = registry.setdefault(Key['sk'], set())
+            if UpdateExpression.startswith('DELETE'):
+                watchers -= ExpressionAttributeValues[':watchers']
+            else:
+                watchers |= ExpressionAttributeValues[':watchers']
+            return {'Attributes': {'watchers': set(watchers)} if watchers else {}}
+
+        def delete_item(Key, **kwargs):
+            if Key['pk'] == 'REGISTRY#':
+                registry.pop(Key['sk'])
+
+        with patch.object(permutation._LUNKER, 'query', return_value={'Items': items}), \
+                patch.object(permutation, '_existing_keys', return_value={('LUNKER#', 'LUNKER#b@x.com#bravo.com#')}) as existing_keys, \
+                patch.object(permutation, '_still_watched', return_value=False), \
+                patch.object(permutation._PERMUTATION, 'update_item', side_effect=update_item), \
+                patch.object(permutation._PERMUTATION, 'delete_item', side_effect=delete_item) as permutation_delete, \
+                patch.object(permutation._PERMUTATION, 'put_item') as put_item, \
+                patch('builtins.print'):
+            watchers = permutation._seed_registry()
+
+        self.assertEqual(sorted(watchers), ['bravo'])
+        self.assertEqual(sorted(registry), ['REGISTRY#bravo#'])
+        self.assertTrue(existing_keys.call_args.kwargs['consistent'])
+        self.assertIn(
+            {'pk': 'LUNKER#', 'sk': 'LUNKER#alpha#'},
+            [call.kwargs['Key'] for call in permutation_delete.call_args_list]
+        )
+        self.assertEqual(put_item.call_args.kwargs['Item']['sld_count'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+
+# Prevent boto3 from attempting metadata lookups during import in test environments.
+os.environ.setdefault('AWS_EC2_METADATA_DISABLED', 'true')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('AWS_REGION', 'us-east-1')
+
+from tld import tld
+
+
+IANA_TEXT = '# Version 2026101800, Last Updated Sun Oct 18 07:07:01 2026 UTC\nCOM\nNET\nORG\n'
+
+
+def _response(status_code=200, text=IANA_TEXT, etag='"abc"'):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = {'ETag': etag} if etag else {}
+    return response
+
+
+def _table(stored=None, state=None):
+    table = MagicMock()
+    table.get_item.return_value = {'Item': state} if state else {}
+    table.query.return_value = {'Items': [{'sk': entry} for entry in (stored or [])]}
+    batch = MagicMock()
+    table.batch_writer.return_value.__enter__.return_value = batch
+    return table, batch
+
+
+class TldSyncTests(unittest.TestCase):
+    def setUp(self):
+        os.environ['TLD_TABLE'] = 'tld-table'
+
+    def _run(self, table, response):
+        resource = MagicMock()
+        resource.Table.return_value = table
+        with patch.object(tld.boto3, 'resource', return_value=resource), \
+                patch.object(tld.requests, 'get', return_value=response) as get:
+            tld.handler({}, None)
+        return get
+
+    def test_parse_returns_version_and_lowercase_set(self):
+        version, tlds = tld.parse(IANA_TEXT)
+        self.assertEqual(version, 'Version 2026101800, Last Updated Sun Oct 18 07:07:01 2026 UTC')
+        self.assertEqual(tlds, {'com', 'net', 'org'})
+
+    def test_writes_only_real_additions_and_removals(self):
+        table, batch = _table(stored=['com', 'net', 'old'])
+
+        self._run(table, _response())
+
+        batch.put_item.assert_called_once_with(Item={'pk': 'TLD#', 'sk': 'org'})
+        batch.delete_item.assert_called_once_with(Key={'pk': 'TLD#', 'sk': 'old'})
+        table.put_item.assert_called_once_with(Item={
+            'pk': 'SYNC#',
+            'sk': 'IANA#',
+            'version': 'Version 2026101800, Last Updated Sun Oct 18 07:07:01 2026 UTC',
+            'etag': '"abc"',
+        })
+
+    def test_unchanged_list_writes_nothing(self):
+        table, batch = _table(stored=['com', 'net', 'org'])
+
+        self._run(table, _response())
+
+        batch.put_item.assert_not_called()
+        batch.delete_item.assert_not_called()
+
+    def test_not_modified_short_circuits(self):
+        table, batch = _table(state={'pk': 'SYNC#', 'sk': 'IANA#', 'version': 'v1', 'etag': '"abc"'})
+
+        get = self._run(table, _response(status_code=304, text=''))
+
+        self.assertEqual(get.call_args.kwargs['headers']['If-None-Match'], '"abc"')
+        table.query.assert_not_called()
+        table.batch_writer.assert_not_called()
+        table.put_item.assert_not_called()
+
+    def test_unchanged_version_header_short_circuits(self):
+        version, _ = tld.parse(IANA_TEXT)
+        table, batch = _table(state={'pk': 'SYNC#', 'sk': 'IANA#', 'version': version, 'etag': '"abc"'})
+
+        self._run(table, _response())
+
+        table.query.assert_not_called()
+        table.batch_writer.assert_not_called()
+
+    def test_empty_download_never_deletes(self):
+        table, batch = _table(stored=['com'])
+
+        self._run(table, _response(text='# Version 1\n'))
+
+        table.batch_writer.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
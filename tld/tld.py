@@ -4,61 +4,121 @@ import os
 import requests
 from boto3.dynamodb.conditions import Key
 
-def handler(event, context):
+IANA_URL = 'https://data.iana.org/TLD/tlds-alpha-by-domain.txt'
+SYNC_KEY = {
+    'pk': 'SYNC#',
+    'sk': 'IANA#'
+}
 
-    headers = {'User-Agent': 'Lunker - https://github.com/jblukach/lunker'}
-    response = requests.get('https://data.iana.org/TLD/tlds-alpha-by-domain.txt', headers=headers, timeout=10)
-    data = response.text
+def parse(data):
 
-    tlds = []
+    version = ''
+    tlds = set()
 
     for line in data.splitlines():
-        if line.startswith('#'):
+        line = line.strip()
+        if not line:
+            continue
+        elif line.startswith('#'):
+            if not version:
+                version = line.lstrip('#').strip()
             continue
         else:
-            tlds.append(line.lower())
-    
-    print('TLDs: '+str(len(tlds)))
+            tlds.add(line.lower())
 
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table(os.environ['TLD_TABLE'])
+    return version, tlds
+
+def existing(table):
 
     response = table.query(
-        KeyConditionExpression = Key('pk').eq('TLD#')
+        KeyConditionExpression = Key('pk').eq('TLD#'),
+        ProjectionExpression = 'sk'
     )
     responsedata = response['Items']
     while 'LastEvaluatedKey' in response:
         response = table.query(
             KeyConditionExpression = Key('pk').eq('TLD#'),
+            ProjectionExpression = 'sk',
             ExclusiveStartKey = response['LastEvaluatedKey']
         )
         responsedata.extend(response['Items'])
 
-    print('DynamoDB: '+str(len(responsedata)))
+    return {entry['sk'] for entry in responsedata}
+
+def handler(event, context):
+
+    dynamodb = boto3.resource('dynamodb')
+    table = dynamodb.Table(os.environ['TLD_TABLE'])
+
+    state = table.get_item(Key = SYNC_KEY).get('Item', {})
+
+    headers = {'User-Agent': 'Lunker - https://github.com/jblukach/lunker'}
+    if state.get('etag'):
+        headers['If-None-Match'] = state['etag']
 
-    for entry in tlds:
+    response = requests.get(IANA_URL, headers=headers, timeout=10)
 
-        if entry not in responsedata:
+    if response.status_code == 304:
+        print('IANA: Not Modified')
+        return {
+            'statusCode': 200,
+            'body': json.dumps('Check List of Top-Level Domains')
+        }
 
-            table.put_item(
+    response.raise_for_status()
+    version, tlds = parse(response.text)
+    etag = response.headers.get('ETag', '')
+
+    print('Version: '+version)
+    print('TLDs: '+str(len(tlds)))
+
+    if not tlds:
+        print('IANA: Empty List')
+        return {
+            'statusCode': 200,
+            'body': json.dumps('Check List of Top-Level Domains')
+        }
+
+    if version and version == state.get('version'):
+        print('IANA: Version Unchanged')
+        if etag != state.get('etag', ''):
+            table.put_item(Item = {**SYNC_KEY, 'version': version, 'etag': etag})
+        return {
+            'statusCode': 200,
+            'body': json.dumps('Check List of Top-Level Domains')
+        }
+
+    stored = existing(table)
+
+    print('DynamoDB: '+str(len(stored)))
+
+    additions = tlds - stored
+    removals = stored - tlds
+
+    print('Additions: '+str(len(additions)))
+    print('Removals: '+str(len(removals)))
+
+    with table.batch_writer() as batch:
+
+        for entry in sorted(additions):
+            batch.put_item(
                 Item = {
                     'pk': 'TLD#',
                     'sk': entry
                 }
             )
 
-    for entry in responsedata:
-
-        if entry['sk'] not in tlds:
-
-            table.delete_item(
+        for entry in sorted(removals):
+            batch.delete_item(
                 Key = {
                     'pk': 'TLD#',
-                    'sk': entry['sk']
+                    'sk': entry
                 }
             )
 
+    table.put_item(Item = {**SYNC_KEY, 'version': version, 'etag': etag})
+
     return {
         'statusCode': 200,
         'body': json.dumps('Check List of Top-Level Domains')
-    }
\ No newline at end of file
+    }